@@ -0,0 +1,188 @@
+"""Per-frame allocations of dict records vs. pooled slotted records, and of the engine itself.
+
+The first part simulates the bullet and notification churn of a busy frame
+(a few shots, a few notifications, a bullet list that keeps about 40 alive)
+and reports, once the steady state is reached, how many records are
+allocated per frame, the peak bytes tracemalloc sees allocated within a
+frame and the number of blocks allocated within a frame that are still
+alive when it ends. Temporaries freed inside the frame do not show in
+that block count, only in the peak bytes; objects CPython parks on its
+free lists (floats, for one) do. Also prints the size of a
+single record.
+
+The second part drives a real GameEngine through a scripted scene (enemies
+topped up, a shot every other tick, a fixed clock and random seed) and
+reports the same peak bytes and block counts for `update` and
+`render_game_only`, per tick. Only long-standing engine methods are used,
+so the same script can be run on an older checkout to compare. Run from
+the repository root:
+    python -m benchmarks.bench_allocations
+"""
+import contextlib
+import os
+import random
+import sys
+import tracemalloc
+import numpy as np
+from utils.records import Bullet, Notification, RecordPool
+
+FRAMES = 2000
+SHOTS_PER_FRAME = 4
+NOTIFICATIONS_PER_FRAME = 2
+BULLET_LIFE = 10
+NOTIFICATION_DURATION = 20
+
+def dict_frame(state, frame):
+    bullets, notifications = state
+    for k in range(SHOTS_PER_FRAME):
+        bullets.append({'x': frame + k, 'y': k, 'radius': 50, 'life': BULLET_LIFE,
+                        'color': (0, 255, 255), 'is_superpower': False})
+    for k in range(NOTIFICATIONS_PER_FRAME):
+        notifications.append({'text': "Shoot!", 'color': (255, 255, 255), 'timer': 0,
+                              'duration': NOTIFICATION_DURATION, 'category': 'default', 'animation': 0})
+
+    remaining = []
+    for bullet in bullets:
+        if bullet['life'] > 0:
+            bullet['life'] -= 1
+            remaining.append(bullet)
+    bullets[:] = remaining
+
+    remaining = []
+    for notification in notifications:
+        notification['timer'] += 1
+        if notification['timer'] < notification['duration']:
+            remaining.append(notification)
+    notifications[:] = remaining
+
+def pooled_frame(state, frame):
+    bullets, notifications, bullet_pool, notification_pool = state
+    for k in range(SHOTS_PER_FRAME):
+        bullets.append(bullet_pool.acquire(frame + k, k, 50, BULLET_LIFE, (0, 255, 255)))
+    for k in range(NOTIFICATIONS_PER_FRAME):
+        notifications.append(notification_pool.acquire("Shoot!", (255, 255, 255), NOTIFICATION_DURATION))
+
+    kept = 0
+    for bullet in bullets:
+        if bullet.life > 0:
+            bullet.life -= 1
+            bullets[kept] = bullet
+            kept += 1
+        else:
+            bullet_pool.release(bullet)
+    del bullets[kept:]
+
+    kept = 0
+    for notification in notifications:
+        notification.timer += 1
+        if notification.timer < notification.duration:
+            notifications[kept] = notification
+            kept += 1
+        else:
+            notification_pool.release(notification)
+    del notifications[kept:]
+
+def traced(fn, *args):
+    """Peak bytes allocated while `fn(*args)` runs and blocks it leaves allocated.
+
+    tracemalloc must already be tracing; its traces are cleared first.
+    """
+    tracemalloc.clear_traces()
+    fn(*args)
+    return tracemalloc.get_traced_memory()[1], len(tracemalloc.take_snapshot().traces)
+
+def measure(frame_fn, state, created):
+    """Average new records, peak traced bytes and new live blocks per frame, after a warm-up.
+
+    `created()` returns how many records have been allocated so far.
+    """
+    # Warm up so lists and pools reach their steady-state size first
+    for frame in range(100):
+        frame_fn(state, frame)
+
+    records = created()
+    peak_bytes = blocks = 0
+    tracemalloc.start()
+    for frame in range(FRAMES):
+        frame_bytes, frame_blocks = traced(frame_fn, state, frame)
+        peak_bytes += frame_bytes
+        blocks += frame_blocks
+    tracemalloc.stop()
+    return (created() - records) / FRAMES, peak_bytes / FRAMES, blocks / FRAMES
+
+ENGINE_TICKS = 600
+ENGINE_ENEMIES = 20
+
+def engine_scene(seed=0):
+    from utils.game_engine import GameEngine
+    random.seed(seed)
+    np.random.seed(seed)
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        engine = GameEngine(assets_path='assets', game_duration=10 ** 6)
+    engine.max_enemies = ENGINE_ENEMIES
+    for crop in engine.crops:
+        crop.max_health = crop.health = 10 ** 9
+    return engine
+
+def engine_tick(engine, tick):
+    while len(engine.enemies) < ENGINE_ENEMIES:
+        engine.spawn_enemy(force=True)
+    if tick % 2 == 0:
+        enemy = engine.enemies[tick % len(engine.enemies)]
+        # shoot() takes 640x480 camera coordinates
+        engine.shoot((enemy.x + enemy.width / 2) * 640 / engine.width,
+                     (enemy.y + enemy.height / 2) * 480 / engine.height)
+    engine.update(now=tick / 30)
+
+def measure_engine(ticks=ENGINE_TICKS):
+    """Mean peak bytes and new live blocks for update and for render, per tick."""
+    engine = engine_scene()
+    totals = np.zeros(4)
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        for tick in range(100):
+            engine_tick(engine, tick)
+            engine.render_game_only()
+
+        tracemalloc.start()
+        for tick in range(100, 100 + ticks):
+            totals += traced(engine_tick, engine, tick) + traced(engine.render_game_only)
+        tracemalloc.stop()
+    update_bytes, update_blocks, render_bytes, render_blocks = totals / ticks
+    return update_bytes, update_blocks, render_bytes, render_blocks
+
+def main():
+    legacy_bullet = {'x': 0, 'y': 0, 'radius': 50, 'life': BULLET_LIFE, 'color': (0, 255, 255),
+                     'is_superpower': False}
+    legacy_notification = {'text': "", 'color': (255, 255, 255), 'timer': 0, 'duration': 90,
+                           'category': 'default', 'animation': 0}
+    print(f"{'record':>14} {'dict bytes':>11} {'slotted bytes':>14}")
+    print(f"{'bullet':>14} {sys.getsizeof(legacy_bullet):>11} "
+          f"{sys.getsizeof(Bullet().reset(0, 0, 50, BULLET_LIFE, (0, 255, 255))):>14}")
+    print(f"{'notification':>14} {sys.getsizeof(legacy_notification):>11} "
+          f"{sys.getsizeof(Notification().reset('', (255, 255, 255))):>14}")
+    print()
+
+    dict_records = [0]
+    def counted_dict_frame(state, frame):
+        dict_frame(state, frame)
+        dict_records[0] += SHOTS_PER_FRAME + NOTIFICATIONS_PER_FRAME
+
+    pooled = ([], [], RecordPool(Bullet), RecordPool(Notification))
+    variants = (
+        ("dict", counted_dict_frame, ([], []), lambda: dict_records[0]),
+        ("pooled slots", pooled_frame, pooled, lambda: pooled[2].created + pooled[3].created),
+    )
+    print(f"{'variant':>14} {'new records/frame':>18} {'peak bytes/frame':>17} {'new blocks/frame':>17}")
+    for label, frame_fn, state, created in variants:
+        records, peak_bytes, blocks = measure(frame_fn, state, created)
+        print(f"{label:>14} {records:>18.2f} {peak_bytes:>17.1f} {blocks:>17.2f}")
+    print()
+
+    update_bytes, update_blocks, render_bytes, render_blocks = measure_engine()
+    print(f"GameEngine, {ENGINE_TICKS} scripted ticks with {ENGINE_ENEMIES} enemies and a shot every other tick")
+    print(f"{'stage':>14} {'peak KiB/tick':>14} {'new blocks/tick':>16}")
+    print(f"{'update':>14} {update_bytes / 1024:>14.1f} {update_blocks:>16.1f}")
+    print(f"{'render':>14} {render_bytes / 1024:>14.1f} {render_blocks:>16.1f}")
+
+if __name__ == "__main__":
+    main()
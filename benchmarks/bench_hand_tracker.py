@@ -0,0 +1,59 @@
+"""Throughput of HandTracker.process on frames from a file-based frame source.
+
+Frames are read directly from the source, without ThreadedCapture and
+without pacing, so a memory-mapped .npy dump measures inference and
+post-processing alone: no camera, no decode, no copy. Needs MediaPipe.
+Run from the repository root:
+    python -m utils.frame_sources dump synthetic frames.npy --frames 300
+    python -m benchmarks.bench_hand_tracker frames.npy
+"""
+import argparse
+import importlib.util
+import time
+import numpy as np
+from utils.frame_sources import open_frame_source
+
+def main():
+    parser = argparse.ArgumentParser(description="HandTracker throughput on a frame source.")
+    parser.add_argument('source', nargs='?', default='synthetic',
+                        help="video file, image directory, .npy dump or 'synthetic'")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--inference-width', type=int, default=640)
+    parser.add_argument('--roi-tracking', action='store_true')
+    args = parser.parse_args()
+
+    if importlib.util.find_spec('mediapipe') is None:
+        print("MediaPipe is not installed; nothing to benchmark.")
+        return
+
+    from utils.hand_tracker import HandTracker
+    tracker = HandTracker(min_detection_confidence=0.7, inference_width=args.inference_width,
+                          roi_tracking=args.roi_tracking)
+    source = open_frame_source(args.source, realtime=False, loop=True)
+
+    read_ms, process_ms, detected = [], [], 0
+    try:
+        for _ in range(args.frames):
+            start = time.perf_counter()
+            success, frame = source.read()
+            middle = time.perf_counter()
+            if not success:
+                break
+            detected += tracker.process(frame).hand_detected
+            read_ms.append((middle - start) * 1e3)
+            process_ms.append((time.perf_counter() - middle) * 1e3)
+    finally:
+        source.release()
+        tracker.close()
+
+    if not process_ms:
+        print(f"No frames could be read from {args.source}")
+        return
+    process = np.array(process_ms)
+    print(f"{len(process)} frames from {args.source}, hand detected in {detected}")
+    print(f"read     mean {np.mean(read_ms):7.3f} ms")
+    print(f"process  mean {process.mean():7.3f} ms  p50 {np.percentile(process, 50):7.3f}  "
+          f"p95 {np.percentile(process, 95):7.3f}  ({1000 / process.mean():.1f} frames/s)")
+
+if __name__ == "__main__":
+    main()
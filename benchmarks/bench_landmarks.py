@@ -0,0 +1,64 @@
+"""Micro-benchmark: hand landmark post-processing, per-landmark lists vs. NumPy arrays.
+
+Uses canned landmark data shaped like MediaPipe's output, so no camera or
+MediaPipe install is needed. Run from the repository root:
+    python -m benchmarks.bench_landmarks
+"""
+import math
+import time
+from types import SimpleNamespace
+import numpy as np
+from utils import gesture_math
+
+def make_hands(num_hands, rng):
+    hands = []
+    for _ in range(num_hands):
+        points = rng.uniform(0.2, 0.8, (21, 3))
+        hands.append(SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in points]))
+    return hands
+
+def legacy_post_process(hands, width, height):
+    results = []
+    for hand in hands:
+        lm_list = []
+        for id, lm in enumerate(hand.landmark):
+            lm_list.append([id, int(lm.x * width), int(lm.y * height)])
+
+        fingers = [1 if lm_list[4][1] < lm_list[3][1] else 0]
+        for tip_id in [8, 12, 16, 20]:
+            fingers.append(1 if lm_list[tip_id][2] < lm_list[tip_id - 2][2] else 0)
+
+        thumb_tip, index_tip = lm_list[4][1:3], lm_list[8][1:3]
+        distance = math.hypot(index_tip[0] - thumb_tip[0], index_tip[1] - thumb_tip[1])
+        results.append((sum(fingers), distance))
+    return results
+
+def array_post_process(hands, width, height):
+    landmarks = gesture_math.to_pixels(gesture_math.landmarks_to_array(hands), width, height)
+    return gesture_math.hand_metrics(landmarks)
+
+def time_it(fn, repeats):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def main(repeats=5000):
+    rng = np.random.default_rng(0)
+    width, height = 1280, 720
+
+    print(f"{'hands':>6} {'legacy us':>10} {'arrays us':>10} {'convert us':>11} {'metrics us':>11}")
+    for num_hands in (1, 2, 8):
+        hands = make_hands(num_hands, rng)
+        landmarks = gesture_math.to_pixels(gesture_math.landmarks_to_array(hands), width, height)
+
+        legacy_us = time_it(lambda: legacy_post_process(hands, width, height), repeats)
+        array_us = time_it(lambda: array_post_process(hands, width, height), repeats)
+        convert_us = time_it(lambda: gesture_math.landmarks_to_array(hands), repeats)
+        metrics_us = time_it(lambda: gesture_math.hand_metrics(landmarks), repeats)
+
+        print(f"{num_hands:>6} {legacy_us:>10.1f} {array_us:>10.1f} {convert_us:>11.1f} {metrics_us:>11.1f}")
+
+if __name__ == "__main__":
+    main()
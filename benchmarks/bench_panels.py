@@ -0,0 +1,102 @@
+"""Micro-benchmark: full-frame translucent panels vs. ROI-local blending and cached panel sprites.
+
+Draws the panels of a busy frame (the five HUD panels, three notifications,
+the superpower banner and the game-over panel with its instruction box)
+three ways and reports time per frame and the bytes each approach reads
+and writes per frame:
+
+    legacy   img.copy(), a filled rectangle, cv2.addWeighted over the frame
+    roi      blend_rect on the panel's pixels only
+    cached   blit of a pre-rendered panel sprite
+
+Bytes are counted from the array sizes each call touches, not measured.
+Run from the repository root:
+    python -m benchmarks.bench_panels
+"""
+import time
+import cv2
+import numpy as np
+from utils.compositor import blit
+from utils.render_layers import PanelCache, blend_rect
+
+WIDTH, HEIGHT = 1280, 720
+
+# (x, y, width, height, colour, alpha, border colour, border size)
+PANELS = [
+    (0, 0, 1280, 50, (40, 40, 60), 0.85, (60, 60, 100), 2),
+    (10, 8, 190, 35, (60, 60, 100), 0.7, (100, 100, 180), 1),
+    (230, 8, 200, 35, (70, 70, 100), 0.7, (100, 100, 180), 1),
+    (480, 8, 180, 35, (50, 80, 50), 0.7, (80, 160, 80), 1),
+    (960, 8, 300, 35, (20, 120, 20), 0.7, (80, 255, 80), 2),
+    (560, 130, 160, 50, (30, 30, 40), 0.6, (255, 255, 255), 2),
+    (540, 185, 200, 50, (30, 30, 40), 0.4, (50, 255, 50), 2),
+    (520, 240, 240, 50, (30, 30, 40), 0.2, (255, 200, 50), 2),
+    (380, 50, 520, 60, (0, 0, 100), 0.7, (0, 0, 255), 3),
+    (340, 210, 600, 300, (0, 70, 0), 0.85, (0, 200, 0), 4),
+    (400, 440, 480, 40, (60, 60, 60), 0.7, (150, 150, 150), 1),
+]
+
+def legacy_panel(img, x, y, w, h, color, alpha, border_color, border_size):
+    overlay = img.copy()
+    cv2.rectangle(overlay, (x, y), (x + w, y + h), color, -1)
+    cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+    cv2.rectangle(img, (x, y), (x + w, y + h), border_color, border_size)
+
+def roi_panel(img, x, y, w, h, color, alpha, border_color, border_size):
+    blend_rect(img, x, y, x + w, y + h, color, alpha)
+    cv2.rectangle(img, (x, y), (x + w, y + h), border_color, border_size)
+
+def cached_panel(cache):
+    def draw(img, x, y, w, h, color, alpha, border_color, border_size):
+        blit(img, cache.get(w, h, color, alpha, border_color, border_size), x - border_size, y - border_size)
+    return draw
+
+def bytes_touched(kind, w, h, border_size):
+    frame = WIDTH * HEIGHT * 3
+    panel = min(w + 1, WIDTH) * min(h + 1, HEIGHT) * 3
+    if kind == 'legacy':
+        # copy reads and writes the frame, the fill writes the panel, addWeighted reads two frames and writes one
+        return 2 * frame + panel + 3 * frame
+    if kind == 'roi':
+        # fill writes the panel, addWeighted reads two panels and writes one
+        return 4 * panel
+    # multiply reads frame ROI and inverse alpha and writes the ROI, add does the same with the colour
+    sprite = (w + 2 * border_size + 1) * (h + 2 * border_size + 1) * 3
+    return 6 * sprite
+
+def draw_frame(frame, draw):
+    for panel in PANELS:
+        draw(frame, *panel)
+
+def time_it(fn, repeats):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e3
+
+def main(repeats=200):
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 256, (HEIGHT, WIDTH, 3), dtype=np.uint8)
+    cache = PanelCache()
+    methods = [('legacy', legacy_panel), ('roi', roi_panel), ('cached', cached_panel(cache))]
+
+    expected = background.copy()
+    draw_frame(expected, legacy_panel)
+
+    print(f"{len(PANELS)} panels per frame at {WIDTH}x{HEIGHT}")
+    print(f"{'method':>8} {'ms/frame':>10} {'MiB/frame':>10} {'max diff':>9}")
+    legacy_ms = None
+    for name, draw in methods:
+        frame = background.copy()
+        ms = time_it(lambda: draw_frame(frame, draw), repeats)
+        legacy_ms = legacy_ms or ms
+
+        actual = background.copy()
+        draw_frame(actual, draw)
+        max_diff = int(np.abs(expected.astype(np.int16) - actual.astype(np.int16)).max())
+        touched = sum(bytes_touched(name, w, h, border_size) for _, _, w, h, _, _, _, border_size in PANELS)
+        print(f"{name:>8} {ms:>10.3f} {touched / 2 ** 20:>10.2f} {max_diff:>9}   ({legacy_ms / ms:.1f}x)")
+
+if __name__ == "__main__":
+    main()
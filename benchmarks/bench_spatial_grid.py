@@ -0,0 +1,59 @@
+"""Micro-benchmark: brute-force distance tests vs. the uniform-grid broad phase.
+
+Items are spread over the 1280x720 play field. Two query sets are timed:
+20 bullets (radius 50) against every item, and every item against every
+other item (radius 60), which is the quadratic case for large swarms. Grid
+timings include rebuilding the grid, as the game does every tick. Run from
+the repository root:
+    python -m benchmarks.bench_spatial_grid
+"""
+import time
+import numpy as np
+from utils.collisions import SpatialGrid, within_radius, pairs_within
+
+WIDTH, HEIGHT = 1280, 720
+# Above this the brute-force all-pairs matrices no longer fit comfortably in memory
+MAX_BRUTE_FORCE_PAIRS = 4000 * 4000
+
+def time_it(fn, repeats):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def brute_force(item_x, item_y, qx, qy, radius):
+    return np.count_nonzero(within_radius(qx, qy, item_x, item_y, radius))
+
+def with_grid(grid, item_x, item_y, qx, qy, radius):
+    grid.build(item_x, item_y)
+    return len(pairs_within(grid, item_x, item_y, qx, qy, radius)[0])
+
+def main():
+    rng = np.random.default_rng(0)
+    grid = SpatialGrid(WIDTH, HEIGHT, cell_size=64)
+
+    print(f"{'entities':>9} {'queries':>8} {'brute us':>11} {'grid us':>10} {'speedup':>8} {'hits':>8}")
+    for count in (10, 100, 1000, 10000):
+        item_x = rng.uniform(0, WIDTH, count)
+        item_y = rng.uniform(0, HEIGHT, count)
+        bullet_x = rng.uniform(0, WIDTH, 20)
+        bullet_y = rng.uniform(0, HEIGHT, 20)
+        repeats = max(3, 20000 // count)
+
+        for label, qx, qy, radius in (("bullets", bullet_x, bullet_y, 50.0),
+                                      ("all", item_x, item_y, 60.0)):
+            grid_us = time_it(lambda: with_grid(grid, item_x, item_y, qx, qy, radius), repeats)
+            hits = with_grid(grid, item_x, item_y, qx, qy, radius)
+
+            if len(qx) * count <= MAX_BRUTE_FORCE_PAIRS:
+                brute_us = time_it(lambda: brute_force(item_x, item_y, qx, qy, radius), repeats)
+                assert brute_force(item_x, item_y, qx, qy, radius) == hits
+                brute_text, speedup_text = f"{brute_us:>11.1f}", f"{brute_us / grid_us:>7.1f}x"
+            else:
+                brute_text, speedup_text = f"{'-':>11}", f"{'-':>8}"
+
+            print(f"{count:>9} {label:>8} {brute_text} {grid_us:>10.1f} {speedup_text} {hits:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Frame-time benchmark suite for GameEngine and hand landmark post-processing.
+
+Drives `GameEngine.update` and `GameEngine.render_game_only` headless
+(seeded engine, manual clock, no camera or window) on synthetic scenes of
+increasing load, topping each scene back up to its enemy, particle, bullet
+and notification counts before every frame. Also times the landmark
+post-processing `HandTracker.process` does for each camera frame, on canned
+landmark data. Reports mean, p50, p95 and p99 times in milliseconds, the
+peak bytes allocated within a frame and the number of blocks allocated
+within a frame that are still alive when it ends (from tracemalloc, in a
+separate pass so tracing does not skew the timings).
+
+Results can be saved as JSON and compared with an earlier run; any stage
+whose mean or p95 got slower than the baseline by more than `--threshold`
+(a fraction) is reported and the script exits with status 1. Run from the
+repository root:
+    python -m benchmarks.bench_suite --save benchmarks/baseline.json
+    python -m benchmarks.bench_suite --baseline benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from utils import gesture_math
+from utils.headless import make_engine
+from benchmarks.bench_allocations import traced
+from benchmarks.bench_landmarks import make_hands
+
+# name: (enemies, particles, bullets, notifications)
+SCENES = {
+    'idle': (0, 0, 0, 0),
+    'light': (8, 100, 5, 2),
+    'medium': (50, 500, 20, 5),
+    'heavy': (200, 2000, 60, 10),
+    'extreme': (1000, 8000, 200, 20),
+}
+HAND_COUNTS = (1, 2)
+
+def summarize(samples):
+    samples = np.asarray(samples) * 1e3
+    return {'mean_ms': float(samples.mean()),
+            'p50_ms': float(np.percentile(samples, 50)),
+            'p95_ms': float(np.percentile(samples, 95)),
+            'p99_ms': float(np.percentile(samples, 99))}
+
+def make_scene(enemies, particles, seed=0):
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        engine = make_engine(seed, game_duration=10 ** 6, particle_budget=max(particles, 1))
+    engine.max_enemies = enemies
+    # Crops must survive the whole run or the game would end mid-benchmark
+    for crop in engine.crops:
+        crop.max_health = crop.health = 10 ** 9
+    return engine
+
+def top_up(engine, enemies, particles, bullets, notifications):
+    """Bring the scene back to its target load; called outside the timed region."""
+    while len(engine.enemies) < enemies:
+        engine.spawn_enemy(force=True)
+
+    rng = engine.rng
+    while len(engine.bullets) < bullets:
+        engine.bullets.append(engine.bullet_pool.acquire(rng.uniform(0, engine.width), rng.uniform(0, engine.height),
+                                                         50, 10 ** 6, (0, 255, 255)))
+
+    while len(engine.notifications) < notifications:
+        engine.notifications.append(engine.notification_pool.acquire("Benchmark", (255, 255, 255), 10 ** 6))
+
+    missing = particles - len(engine.smoke_particles)
+    while missing > 0:
+        count = min(missing, 15)
+        engine.create_smoke_particles(rng.uniform(0, engine.width), rng.uniform(0, engine.height), count)
+        missing -= count
+
+def run_frames(engine, load, frames, timed=True):
+    """Yield (update_seconds, render_seconds) per frame, or with `timed` off
+    (update_bytes, render_bytes, update_blocks, render_blocks) from `traced`."""
+    clock = engine.clock
+    for _ in range(frames):
+        top_up(engine, *load)
+        now = clock.advance(engine.tick_dt)
+
+        if timed:
+            start = time.perf_counter()
+            engine.update(now=now)
+            middle = time.perf_counter()
+            engine.render_game_only()
+            yield middle - start, time.perf_counter() - middle
+        else:
+            update_bytes, update_blocks = traced(engine.update, now)
+            render_bytes, render_blocks = traced(engine.render_game_only)
+            yield update_bytes, render_bytes, update_blocks, render_blocks
+
+def bench_scene(load, frames, warmup, alloc_frames, dirty_rect_mode):
+    enemies, particles = load[0], load[1]
+    engine = make_scene(enemies, particles)
+    engine.dirty_rect_mode = dirty_rect_mode
+
+    with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+        for _ in run_frames(engine, load, warmup):
+            pass
+        samples = list(run_frames(engine, load, frames))
+
+        tracemalloc.start()
+        allocations = list(run_frames(engine, load, alloc_frames, timed=False))
+        tracemalloc.stop()
+
+    results = {}
+    for k, stage in enumerate(('update', 'render')):
+        results[stage] = summarize([sample[k] for sample in samples])
+        results[stage]['peak_alloc_kib'] = float(np.mean([a[k] for a in allocations]) / 1024)
+        results[stage]['alloc_blocks'] = float(np.mean([a[k + 2] for a in allocations]))
+    return results
+
+def landmark_post_process(hands, width, height):
+    # The per-frame work HandTracker.process does after inference
+    landmarks = gesture_math.to_pixels(gesture_math.landmarks_to_array(hands), width, height)
+    return gesture_math.hand_metrics(landmarks)
+
+def bench_landmarks(num_hands, frames, alloc_frames):
+    hands = make_hands(num_hands, np.random.default_rng(num_hands))
+    width, height = 1280, 720
+    for _ in range(100):
+        landmark_post_process(hands, width, height)
+
+    samples = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        landmark_post_process(hands, width, height)
+        samples.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    allocations = [traced(landmark_post_process, hands, width, height) for _ in range(alloc_frames)]
+    tracemalloc.stop()
+
+    results = summarize(samples)
+    results['peak_alloc_kib'] = float(np.mean([a[0] for a in allocations]) / 1024)
+    results['alloc_blocks'] = float(np.mean([a[1] for a in allocations]))
+    return results
+
+def run_suite(frames, warmup, alloc_frames, dirty_rect_mode, scenes):
+    results = {}
+    for name in scenes:
+        scene = bench_scene(SCENES[name], frames, warmup, alloc_frames, dirty_rect_mode)
+        for stage, stats in scene.items():
+            results[f"{stage}/{name}"] = stats
+    for num_hands in HAND_COUNTS:
+        results[f"landmarks/{num_hands}_hands"] = bench_landmarks(num_hands, frames * 10, alloc_frames)
+    return results
+
+def compare(results, baseline, threshold):
+    """Names and ratios of benchmarks whose mean or p95 regressed past `threshold`."""
+    regressions = []
+    for name, stats in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for key in ('mean_ms', 'p95_ms'):
+            if old[key] > 0 and stats[key] > old[key] * (1 + threshold):
+                regressions.append((name, key, stats[key] / old[key]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="GameEngine and landmark frame-time benchmarks.")
+    parser.add_argument('--frames', type=int, default=300, help="timed frames per scene")
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--alloc-frames', type=int, default=30, help="frames traced for allocations")
+    parser.add_argument('--scenes', default=','.join(SCENES), help="comma-separated subset of scenes")
+    parser.add_argument('--dirty-rects', action='store_true', help="render with dirty-rectangle mode")
+    parser.add_argument('--save', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against results saved earlier with --save")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="allowed slowdown against the baseline, as a fraction")
+    args = parser.parse_args()
+
+    scenes = [name for name in args.scenes.split(',') if name]
+    for name in scenes:
+        if name not in SCENES:
+            parser.error(f"unknown scene {name!r}, choose from {', '.join(SCENES)}")
+
+    results = run_suite(args.frames, args.warmup, args.alloc_frames, args.dirty_rects, scenes)
+
+    print(f"{'benchmark':>24} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'alloc KiB':>10} "
+          f"{'blocks':>7}")
+    for name, stats in results.items():
+        print(f"{name:>24} {stats['mean_ms']:>9.3f} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} "
+              f"{stats['p99_ms']:>9.3f} {stats['peak_alloc_kib']:>10.1f} {stats['alloc_blocks']:>7.1f}")
+
+    if args.save:
+        report = {'machine': {'python': platform.python_version(), 'numpy': np.__version__,
+                              'platform': platform.platform(), 'processor': platform.processor()},
+                  'settings': {'frames': args.frames, 'dirty_rects': args.dirty_rects},
+                  'results': results}
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%} of {args.baseline}:")
+            for name, key, ratio in regressions:
+                print(f"  {name} {key}: {ratio:.2f}x")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+
+if __name__ == "__main__":
+    main()
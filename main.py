@@ -2,12 +2,33 @@ import cv2
 import numpy as np
 import time
 import os
+import random
 import sys
 import traceback
-from utils.hand_tracker import HandTracker
+from utils.hand_tracker import HandTracker, HandFrameResult
 from utils.game_engine import GameEngine
+from utils.camera_capture import ThreadedCapture
+from utils.frame_sources import open_frame_source
+from utils.profiler import FrameProfiler
+from utils.headless import ManualClock
+from utils.input_recording import InputRecorder, InputReplay, ReplayHandTracker
+
+def get_option(name, default=None):
+    """Value following `name` on the command line, e.g. --record session.vhin."""
+    if name in sys.argv:
+        index = sys.argv.index(name) + 1
+        if index < len(sys.argv):
+            return sys.argv[index]
+    return default
 
 def main():
+    capture = None
+    hand_tracker = None
+    recorder = None
+    cap = None
+    display = True
+    # Per-stage timings; with --profile they are kept, shown with 'p' and exported on exit
+    profiler = FrameProfiler(enabled='--profile' in sys.argv)
     try:
         print("Starting game initialization...")
         if not os.path.exists('assets'):
@@ -19,43 +40,73 @@ def main():
             if not os.path.exists(img_path):
                 print(f"Warning: '{img_path}' not found. Game will use placeholder graphics.")
         
-        print("Initializing camera...")
-        cap = cv2.VideoCapture(0)
-        
-        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-        
-        # Check for camera
-        if not cap.isOpened():
-            print("Error: Could not open camera.")
-            return
+        replay_path = get_option('--replay')
+        record_path = get_option('--record')
+        display = not (replay_path and '--no-display' in sys.argv)
         
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        print(f"Camera initialized with dimensions: {width}x{height}")
+        if replay_path:
+            # Recorded hand input stands in for the camera and MediaPipe
+            print(f"Replaying input from: {replay_path}")
+            capture = InputReplay(replay_path)
+            hand_tracker = ReplayHandTracker(capture)
+            seed = capture.seed
+        else:
+            # --source takes a camera index, video file, image directory, .npy frame dump or 'synthetic'
+            source = get_option('--source', '0')
+            print(f"Initializing frame source: {source}")
+            cap = open_frame_source(source, width=1280, height=720, realtime='--fast' not in sys.argv,
+                                    loop='--loop' in sys.argv)
+            
+            # Check for camera
+            if not cap.isOpened():
+                print(f"Error: Could not open frame source: {source}")
+                return
+            
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            print(f"Frame source initialized with dimensions: {width}x{height}")
+            
+            # Capture runs on its own thread; the loop always gets the newest frame
+            capture = ThreadedCapture(cap, buffer_size=3)
+            
+            #for hand tracker
+            print("Initializing hand tracker...")
+            async_inference = '--async-inference' in sys.argv
+            roi_tracking = '--roi-tracking' in sys.argv
+            hand_tracker = HandTracker(min_detection_confidence=0.7, async_inference=async_inference,
+                                       inference_width=640, roi_tracking=roi_tracking, mirror=True)
+            
+            # A recorded session needs a known seed so replays spawn the same enemies
+            seed = random.getrandbits(32) if record_path else None
+            if record_path:
+                recorder = InputRecorder(record_path, width, height, seed)
+                print(f"Recording input to: {record_path}")
         
-        #for hand tracker
-        print("Initializing hand tracker...")
-        hand_tracker = HandTracker(min_detection_confidence=0.7)
+        # The loop sets this once per frame, so update, cooldowns and effects share one time
+        clock = ManualClock(time.perf_counter())
+        restarts = 0
         
         #game engine 
         print("Initializing game engine...")
-        game_engine = GameEngine(assets_path='assets')
+        dirty_rect_mode = '--dirty-rects' in sys.argv
+        game_engine = GameEngine(assets_path='assets', dirty_rect_mode=dirty_rect_mode, profiler=profiler,
+                                 clock=clock, seed=seed)
         print("Game engine initialized successfully!")
         
-        cv2.namedWindow('Hand Tracking (Camera View)', cv2.WINDOW_NORMAL)
-        cv2.namedWindow('Vision Hero: Defenders of the Farm', cv2.WINDOW_NORMAL)
+        if display:
+            cv2.namedWindow('Hand Tracking (Camera View)', cv2.WINDOW_NORMAL)
+            cv2.namedWindow('Vision Hero: Defenders of the Farm', cv2.WINDOW_NORMAL)
+            
+            camera_width = 640
+            camera_height = 480
+            game_width = 1280
+            game_height = 720
         
-        camera_width = 640
-        camera_height = 480
-        game_width = 1280
-        game_height = 720
-    
-        cv2.resizeWindow('Hand Tracking (Camera View)', camera_width, camera_height)
-        cv2.resizeWindow('Vision Hero: Defenders of the Farm', game_width, game_height)
-        cv2.moveWindow('Hand Tracking (Camera View)', 50, 100)
-        cv2.moveWindow('Vision Hero: Defenders of the Farm', camera_width + 100, 100)
-        last_shoot_time = time.time()
+            cv2.resizeWindow('Hand Tracking (Camera View)', camera_width, camera_height)
+            cv2.resizeWindow('Vision Hero: Defenders of the Farm', game_width, game_height)
+            cv2.moveWindow('Hand Tracking (Camera View)', 50, 100)
+            cv2.moveWindow('Vision Hero: Defenders of the Farm', camera_width + 100, 100)
+        last_shoot_time = None
         shoot_cooldown = 0.5 
         
         last_hand_pos = None
@@ -70,6 +121,10 @@ def main():
         print("- Open all fingers for superpower (enhanced attacks)")
         print("- Press 'q' to quit")
         print("- Press 'r' to restart the game")
+        if dirty_rect_mode:
+            print("- Press 'd' to show dirty-rectangle regions")
+        if profiler.enabled:
+            print("- Press 'p' to show the frame-time breakdown")
         print("\nNew Game Rules:")
         print("- Protect your crops from enemies")
         print("- Survive until the timer runs out")
@@ -78,27 +133,47 @@ def main():
         print("\nStarting game. Enjoy!\n")
         
         print("Starting main game loop...")
+        mirrored = None
         while True:
-            success, frame = cap.read()
+            profiler.end_frame()
+            profiler.begin_frame()
+            profiler.push('capture')
+            success, frame, frame_time = capture.read()
             if not success:
-                print("Error: Failed to grab frame.")
+                if replay_path:
+                    print(f"Replay finished after {capture.frames} frames.")
+                else:
+                    print("Error: Failed to grab frame.")
                 break
-                
-            frame = cv2.flip(frame, 1)
             
-            cv2.putText(frame, "Hand Controls", (20, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
+            clock.now = capture.now if replay_path else time.perf_counter()
+            if last_shoot_time is None:
+                last_shoot_time = clock.now
+                
+            # The tracker mirrors its own downscaled input, so its landmarks are already in the
+            # mirrored view; the full frame is only flipped when it is shown
+            camera_frame = frame
+            if display:
+                profiler.switch('flip')
+                mirrored = cv2.flip(frame, 1, dst=mirrored)
+                frame = mirrored
+                
+                cv2.putText(frame, "Hand Controls", (20, 30), 
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 255, 255), 2)
             
+            hand = HandFrameResult()
             try:
-                frame = hand_tracker.find_hands(frame)
-                
-                lm_list = hand_tracker.find_position(frame)
+                profiler.switch('hand_tracking')
+                hand = hand_tracker.process(camera_frame)
+                if display:
+                    hand_tracker.draw_overlay(frame, hand)
                 
-                if lm_list and len(lm_list) >= 21:
-                    palm_x, palm_y = lm_list[0][1], lm_list[0][2]
+                profiler.switch('gestures')
+                if hand.hand_detected:
+                    palm_x, palm_y = int(hand.landmarks[0, 0, 0]), int(hand.landmarks[0, 0, 1])
                     
                     # Count fingers which is upp!!
-                    fingers_up = hand_tracker.count_fingers_up(lm_list)
+                    fingers_up = hand.fingers_up
                     
                     if fingers_up == 5:
                         game_engine.use_superpower()
@@ -122,60 +197,91 @@ def main():
                         game_engine.last_farmer_pos = (target_x, target_y)
                         
                     else:
-                        is_pinching = hand_tracker.check_thumb_index_pinch(lm_list, frame)
+                        is_pinching = hand.is_pinching
                         
                         if is_pinching:
-                            current_time = time.time()
+                            current_time = clock.now
                             if current_time - last_shoot_time > shoot_cooldown:
                                 # Get midpoint between thumb and index finger
-                                thumb_tip = lm_list[4][1:3]  
-                                index_tip = lm_list[8][1:3]  
-                                
-                                mid_x = (thumb_tip[0] + index_tip[0]) // 2
-                                mid_y = (thumb_tip[1] + index_tip[1]) // 2
-                                
-                                cv2.circle(frame, (mid_x, mid_y), 10, (0, 0, 255), -1)
-                                cv2.line(frame, (mid_x, mid_y), 
-                                         (mid_x, mid_y - 50), (0, 0, 255), 2)
+                                mid_x, mid_y = hand.pinch_center
                                 
                                 game_engine.shoot(mid_x, mid_y)
                                 last_shoot_time = current_time
-        
-                                cv2.putText(frame, f"SHOOT at ({mid_x}, {mid_y})", (10, 200),
-                                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                                
+                                if display:
+                                    cv2.circle(frame, (mid_x, mid_y), 10, (0, 0, 255), -1)
+                                    cv2.line(frame, (mid_x, mid_y), 
+                                             (mid_x, mid_y - 50), (0, 0, 255), 2)
+                                    cv2.putText(frame, f"SHOOT at ({mid_x}, {mid_y})", (10, 200),
+                                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
                     last_hand_pos = (palm_x, palm_y)
                     
             except Exception as e:
                 print(f"Error in hand tracking: {e}")
                 traceback.print_exc()
-                lm_list = []
             
             try:
+                profiler.switch('update')
                 game_engine.update()
+                profiler.switch('render')
                 game_frame = game_engine.render_game_only()
-                cv2.imshow('Hand Tracking (Camera View)', frame)
-                cv2.imshow('Vision Hero: Defenders of the Farm', game_frame)
+                profiler.switch('display')
+                if profiler.show_overlay:
+                    profiler.draw(frame)
+                if display:
+                    cv2.imshow('Hand Tracking (Camera View)', frame)
+                    cv2.imshow('Vision Hero: Defenders of the Farm', game_frame)
 
             except Exception as e:
                 print(f"Error in game logic: {e}")
                 traceback.print_exc()
-                cv2.imshow('Hand Tracking (Camera View)', frame)
-            key = cv2.waitKey(1) & 0xFF
+                if display:
+                    cv2.imshow('Hand Tracking (Camera View)', frame)
+            key = cv2.waitKey(1) & 0xFF if display else 0xFF
+            if replay_path and key != ord('q'):
+                key = capture.key
+            if recorder is not None:
+                recorder.write(clock.now, key, hand)
+            profiler.pop()
             if key == ord('q'):
                 print("Quit key pressed. Exiting game...")
                 break
             elif key == ord('r'):
                 print("Restarting game...")
-                game_engine = GameEngine(assets_path='assets')
+                show_dirty_rects = game_engine.show_dirty_rects
+                restarts += 1
+                game_engine = GameEngine(assets_path='assets', dirty_rect_mode=dirty_rect_mode, profiler=profiler,
+                                         clock=clock, seed=None if seed is None else seed + restarts)
+                game_engine.show_dirty_rects = show_dirty_rects
                 print("Game restarted!")
+            elif key == ord('d') and dirty_rect_mode:
+                game_engine.show_dirty_rects = not game_engine.show_dirty_rects
+            elif key == ord('p') and profiler.enabled:
+                profiler.show_overlay = not profiler.show_overlay
 
     except Exception as e:
         print(f"Critical error in game loop: {e}")
         traceback.print_exc()
     finally:
         print("Releasing resources...")
-        cap.release()
-        cv2.destroyAllWindows()
+        if hand_tracker is not None:
+            hand_tracker.close()
+        if recorder is not None:
+            recorder.close()
+            print(f"Recorded {recorder.frames} frames to {recorder.path}")
+        if capture is not None:
+            stats = capture.stats()
+            print(f"Capture stats: {stats['captured']} captured, {stats['dropped']} dropped, "
+                  f"mean frame age {stats['mean_age_ms']:.1f} ms")
+            capture.release()
+        elif cap is not None:
+            cap.release()
+        if profiler.enabled and profiler.frames:
+            profiler.export_csv('profile_frames.csv')
+            profiler.export_chrome_trace('profile_trace.json')
+            print("Frame timings written to profile_frames.csv and profile_trace.json")
+        if display:
+            cv2.destroyAllWindows()
         print("Game closed.")
 
 if __name__ == "__main__":
@@ -185,4 +291,6 @@ if __name__ == "__main__":
         print(f"Fatal error: {e}")
         traceback.print_exc()
         print("Game crashed. Please check error messages above.")
-        input("Press Enter to exit...")
\ No newline at end of file
+        # Only wait for a key when someone is there to press it
+        if '--no-display' not in sys.argv and sys.stdin.isatty():
+            input("Press Enter to exit...")
\ No newline at end of file
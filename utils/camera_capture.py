@@ -0,0 +1,153 @@
+import cv2
+import numpy as np
+import threading
+import time
+import traceback
+from collections import deque
+
+class ThreadedCapture:
+    """Reads frames on a background thread into a small preallocated ring buffer.
+
+    `capture` is a device index / path for cv2.VideoCapture, or any object with
+    `read()` and `release()` (an already configured cv2.VideoCapture, a source
+    from utils.frame_sources or a fake source in tests). The capture thread owns the source. `read()` hands back
+    only the newest frame; frames that were overwritten before the main loop
+    asked for them are counted as dropped instead of queueing up.
+
+    The frame returned by `read()` lives in the ring buffer and stays valid
+    until the next `read()` call. Copy it if it has to outlive that. Sources
+    that set `zero_copy` (memory-mapped dumps) are not copied: their read-only
+    frames are handed out as they are.
+    """
+
+    def __init__(self, capture=0, buffer_size=3, stats_window=120):
+        if isinstance(capture, (int, str)):
+            capture = cv2.VideoCapture(capture)
+        self.cap = capture
+        self.read_into = isinstance(capture, cv2.VideoCapture) or getattr(capture, 'supports_read_into', False)
+        self.zero_copy = getattr(capture, 'zero_copy', False)
+
+        # One slot may be held by the reader and one is being written, so keep at least 3
+        self.buffer_size = max(3, int(buffer_size))
+        self.slots = None
+        self.timestamps = [0.0] * self.buffer_size
+        self.sequence = [0] * self.buffer_size
+
+        self.condition = threading.Condition()
+        self.latest_slot = -1
+        self.reader_slot = -1
+        self.frames_captured = 0
+        self.last_delivered = 0
+        self.frames_delivered = 0
+        self.frames_dropped = 0
+        self.ages = deque(maxlen=stats_window)
+
+        self.running = True
+        self.finished = False
+        self.thread = threading.Thread(target=self.run, name="ThreadedCapture", daemon=True)
+        self.thread.start()
+
+    def isOpened(self):
+        opened = getattr(self.cap, 'isOpened', None)
+        return opened() if opened is not None else True
+
+    def get(self, prop_id):
+        return self.cap.get(prop_id)
+
+    def next_write_slot(self):
+        slot = (self.latest_slot + 1) % self.buffer_size
+        if slot == self.reader_slot:
+            slot = (slot + 1) % self.buffer_size
+        return slot
+
+    def read_frame(self, slot):
+        if self.read_into and self.slots is not None:
+            success, frame = self.cap.read(self.slots[slot])
+        else:
+            success, frame = self.cap.read()
+
+        if not success or frame is None:
+            return False
+
+        if self.zero_copy:
+            # The source keeps its frames alive, so the slot just holds a reference
+            if self.slots is None:
+                self.slots = [None] * self.buffer_size
+            self.slots[slot] = frame
+            return True
+
+        if self.slots is None:
+            self.slots = [np.empty_like(frame) for _ in range(self.buffer_size)]
+
+        if frame is not self.slots[slot]:
+            if frame.shape != self.slots[slot].shape or frame.dtype != self.slots[slot].dtype:
+                self.slots[slot] = np.empty_like(frame)
+            np.copyto(self.slots[slot], frame)
+        return True
+
+    def run(self):
+        try:
+            while self.running:
+                with self.condition:
+                    slot = self.next_write_slot()
+
+                if not self.read_frame(slot):
+                    break
+                timestamp = time.perf_counter()
+
+                with self.condition:
+                    self.frames_captured += 1
+                    if self.latest_slot >= 0 and self.sequence[self.latest_slot] > self.last_delivered:
+                        self.frames_dropped += 1
+
+                    self.timestamps[slot] = timestamp
+                    self.sequence[slot] = self.frames_captured
+                    self.latest_slot = slot
+                    self.condition.notify_all()
+        except Exception as e:
+            print(f"Error in capture thread: {e}")
+            traceback.print_exc()
+        finally:
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+
+    def read(self, timeout=1.0):
+        """Return (success, frame, capture_timestamp) for the newest frame not yet delivered.
+
+        Blocks up to `timeout` seconds for a new frame. Timestamps come from
+        time.perf_counter().
+        """
+        deadline = time.perf_counter() + timeout
+        with self.condition:
+            while (self.latest_slot < 0 or self.sequence[self.latest_slot] <= self.last_delivered):
+                remaining = deadline - time.perf_counter()
+                if self.finished or remaining <= 0:
+                    return False, None, None
+                self.condition.wait(remaining)
+
+            slot = self.latest_slot
+            self.reader_slot = slot
+            self.last_delivered = self.sequence[slot]
+            self.frames_delivered += 1
+            timestamp = self.timestamps[slot]
+            self.ages.append(time.perf_counter() - timestamp)
+
+            return True, self.slots[slot], timestamp
+
+    def stats(self):
+        with self.condition:
+            ages = list(self.ages)
+            return {
+                'captured': self.frames_captured,
+                'delivered': self.frames_delivered,
+                'dropped': self.frames_dropped,
+                'mean_age_ms': (sum(ages) / len(ages) * 1000) if ages else 0.0,
+                'max_age_ms': (max(ages) * 1000) if ages else 0.0
+            }
+
+    def release(self):
+        self.running = False
+        if self.thread.is_alive():
+            self.thread.join(timeout=2.0)
+        self.cap.release()
@@ -0,0 +1,125 @@
+import numpy as np
+
+def within_radius(ax, ay, bx, by, radius):
+    """Boolean (len(a), len(b)) matrix of pairs closer than `radius`.
+
+    Brute force over every pair. `radius` may be a scalar, a per-row or
+    per-column array, or a full matrix; it is broadcast against the pairwise
+    distances. Squared distances are compared, so no square roots are taken.
+    """
+    dx = np.asarray(ax, dtype=np.float64)[:, None] - np.asarray(bx, dtype=np.float64)[None, :]
+    dy = np.asarray(ay, dtype=np.float64)[:, None] - np.asarray(by, dtype=np.float64)[None, :]
+    radius = np.asarray(radius, dtype=np.float64)
+    return dx * dx + dy * dy < radius * radius
+
+class SpatialGrid:
+    """Uniform grid over the play field for broad-phase hit queries.
+
+    `build(x, y)` records the items; they are binned by cell with one stable
+    sort the first time a query needs the cell lists, so each cell's items are
+    a contiguous run of `order`, in ascending index order.
+    Positions outside the field are clamped into the border cells, which keeps
+    queries correct for enemies that are still walking in from off-screen.
+
+    Queries that would test at most `brute_force_pairs` pairs skip the cell
+    lists: with a handful of enemies the extra array bookkeeping costs more
+    than the distance tests it saves.
+    """
+
+    def __init__(self, width, height, cell_size=128, brute_force_pairs=4096):
+        self.cell_size = cell_size
+        self.brute_force_pairs = brute_force_pairs
+        self.cols = max(1, -(-int(width) // cell_size))
+        self.rows = max(1, -(-int(height) // cell_size))
+        self.order = np.zeros(0, dtype=np.intp)
+        self.cell_start = np.zeros(self.cols * self.rows + 1, dtype=np.intp)
+        self.x = self.y = None
+        self.count = 0
+        self.binned = True
+
+    def cell_coords(self, x, y):
+        # Truncating instead of flooring is fine: anything below zero is clamped to 0 anyway
+        col = np.clip((x * (1.0 / self.cell_size)).astype(np.intp), 0, self.cols - 1)
+        row = np.clip((y * (1.0 / self.cell_size)).astype(np.intp), 0, self.rows - 1)
+        return col, row
+
+    def build(self, x, y):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.count = len(self.x)
+        self.binned = False
+
+    def bin_items(self):
+        col, row = self.cell_coords(self.x, self.y)
+        cells = row * self.cols + col
+        if self.cols * self.rows <= np.iinfo(np.uint16).max:
+            # NumPy uses a linear-time radix sort for stable sorts of 16-bit keys
+            cells = cells.astype(np.uint16)
+        self.order = np.argsort(cells, kind='stable')
+        np.cumsum(np.bincount(cells, minlength=self.cols * self.rows), out=self.cell_start[1:])
+        self.binned = True
+
+    def query_pairs(self, qx, qy, radius):
+        """Candidate (query, item) index pairs from every cell touching each query's box.
+
+        Candidates are not distance-checked; see `pairs_within`.
+        """
+        qx = np.atleast_1d(np.asarray(qx, dtype=np.float64))
+        qy = np.atleast_1d(np.asarray(qy, dtype=np.float64))
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), qx.shape)
+        if self.count == 0 or len(qx) == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        if not self.binned:
+            self.bin_items()
+
+        col0, row0 = self.cell_coords(qx - radius, qy - radius)
+        col1, row1 = self.cell_coords(qx + radius, qy + radius)
+        span = col1 - col0 + 1
+        cells_per_query = span * (row1 - row0 + 1)
+
+        # One entry per (query, cell) pair
+        query = np.repeat(np.arange(len(qx)), cells_per_query)
+        k = np.arange(len(query)) - np.repeat(np.cumsum(cells_per_query) - cells_per_query, cells_per_query)
+        cell = (row0[query] + k // span[query]) * self.cols + col0[query] + k % span[query]
+
+        # Expanded into one entry per (query, item in that cell) pair
+        start = self.cell_start[cell]
+        counts = self.cell_start[cell + 1] - start
+        query = np.repeat(query, counts)
+        offset = np.arange(len(query)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return query, self.order[np.repeat(start, counts) + offset]
+
+def pairs_within(grid, item_x, item_y, qx, qy, radius):
+    """(query, item) index pairs closer than `radius` (scalar or per query).
+
+    `grid` must have been built from `item_x`, `item_y`. Pairs are grouped by
+    query but items within a query are not sorted.
+    """
+    qx = np.atleast_1d(np.asarray(qx, dtype=np.float64))
+    qy = np.atleast_1d(np.asarray(qy, dtype=np.float64))
+    radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), qx.shape)
+
+    if len(qx) * grid.count <= grid.brute_force_pairs:
+        return np.nonzero(within_radius(qx, qy, item_x, item_y, radius[:, None]))
+
+    query, item = grid.query_pairs(qx, qy, radius)
+    dx = np.asarray(item_x)[item] - qx[query]
+    dy = np.asarray(item_y)[item] - qy[query]
+    keep = dx * dx + dy * dy < radius[query] ** 2
+    return query[keep], item[keep]
+
+def first_hits(query, item, num_queries, available):
+    """Give each query, in order, the first available item it hits.
+
+    `query`/`item` are hit pairs in any order. An item can only be taken
+    once, so earlier queries win ties, the same as looping over queries and
+    breaking on the first hit. Returns the chosen item per query, or -1.
+    """
+    chosen = np.full(num_queries, -1, dtype=np.intp)
+    available = np.array(available, dtype=np.bool_)
+    order = np.lexsort((item, query))
+    for q, i in zip(query[order].tolist(), item[order].tolist()):
+        if chosen[q] < 0 and available[i]:
+            chosen[q] = i
+            available[i] = False
+    return chosen
@@ -0,0 +1,111 @@
+import cv2
+import numpy as np
+
+INV_255 = 1.0 / 255.0
+
+class Sprite:
+    """A BGRA image stored as premultiplied colour plus inverse alpha.
+
+    The premultiplication happens once when the sprite is built, so drawing it
+    is a single fixed-point `dst * (255 - a) / 255 + premultiplied` over the
+    whole ROI, done by two saturating uint8 OpenCV calls.
+    """
+
+    def __init__(self, img):
+        if img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA)
+        elif img.shape[2] == 3:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+
+        self.img = img
+        self.height, self.width = img.shape[0], img.shape[1]
+
+        alpha = cv2.merge([img[:, :, 3]] * 3)
+        self.color = cv2.multiply(np.ascontiguousarray(img[:, :, :3]), alpha, scale=INV_255)
+        self.inv_alpha = cv2.bitwise_not(alpha)
+        self.opaque = not self.inv_alpha.any()
+        self.flash_sprite = None
+        self.fade_sprites = None
+
+        for arr in (self.color, self.inv_alpha):
+            arr.setflags(write=False)
+
+    @classmethod
+    def from_premultiplied(cls, color, inv_alpha):
+        """Build a sprite from already premultiplied BGR colour and per-channel 255 - alpha."""
+        sprite = cls.__new__(cls)
+        sprite.height, sprite.width = color.shape[0], color.shape[1]
+        sprite.color = np.ascontiguousarray(color)
+        sprite.inv_alpha = np.ascontiguousarray(inv_alpha)
+        sprite.opaque = not sprite.inv_alpha.any()
+        sprite.img = None
+        sprite.flash_sprite = None
+        sprite.fade_sprites = None
+
+        for arr in (sprite.color, sprite.inv_alpha):
+            arr.setflags(write=False)
+        return sprite
+
+    def flash(self):
+        """This sprite's silhouette in white with the same alpha; built on first use and kept."""
+        if self.flash_sprite is None:
+            # White premultiplied by alpha is the alpha itself
+            self.flash_sprite = Sprite.from_premultiplied(cv2.bitwise_not(self.inv_alpha), self.inv_alpha)
+        return self.flash_sprite
+
+    def fade_frames(self, steps):
+        """`steps + 1` copies with alpha scaled by 1 - k / steps for k = 0..steps; built on first use and kept.
+
+        Sprites built from a BGRA image scale that alpha and premultiply again;
+        sprites made with `from_premultiplied` scale their colour and alpha directly.
+        """
+        if steps < 1:
+            raise ValueError(f"fade_frames needs at least one step, got {steps}")
+        if self.fade_sprites is None or len(self.fade_sprites) != steps + 1:
+            frames = []
+            for k in range(steps + 1):
+                opacity = 1.0 - k / steps
+                if self.img is None:
+                    color = cv2.convertScaleAbs(self.color, alpha=opacity)
+                    inv_alpha = cv2.bitwise_not(cv2.convertScaleAbs(cv2.bitwise_not(self.inv_alpha), alpha=opacity))
+                    frames.append(Sprite.from_premultiplied(color, inv_alpha))
+                    continue
+                img = self.img.copy()
+                img[:, :, 3] = (img[:, :, 3] * opacity).astype(np.uint8)
+                img.setflags(write=False)
+                frames.append(Sprite(img))
+            self.fade_sprites = tuple(frames)
+        return self.fade_sprites
+
+def clip_rect(dst_shape, x, y, width, height):
+    """Clip a (x, y, width, height) rect to the frame.
+
+    Returns (x1, y1, x2, y2, sx, sy) where sx, sy is the offset into the source,
+    or None when nothing is visible.
+    """
+    x, y = int(x), int(y)
+    x1, y1 = max(0, x), max(0, y)
+    x2, y2 = min(dst_shape[1], x + width), min(dst_shape[0], y + height)
+
+    if x1 >= x2 or y1 >= y2:
+        return None
+    return x1, y1, x2, y2, x1 - x, y1 - y
+
+def blit(dst, sprite, x, y):
+    """Alpha-blend `sprite` into the BGR frame `dst` with its top-left at (x, y), in place."""
+    rect = clip_rect(dst.shape, x, y, sprite.width, sprite.height)
+    if rect is None:
+        return False
+    x1, y1, x2, y2, sx, sy = rect
+    sx2, sy2 = sx + (x2 - x1), sy + (y2 - y1)
+
+    roi = dst[y1:y2, x1:x2]
+    color = sprite.color[sy:sy2, sx:sx2]
+
+    if sprite.opaque:
+        roi[:] = color
+        return True
+
+    cv2.multiply(roi, sprite.inv_alpha[sy:sy2, sx:sx2], dst=roi, scale=INV_255)
+    cv2.add(roi, color, dst=roi)
+    return True
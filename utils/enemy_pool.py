@@ -0,0 +1,253 @@
+import numpy as np
+import random
+
+DIRECT, ZIGZAG, SPIRAL = 0, 1, 2
+MOVEMENT_PATTERNS = ('direct', 'zigzag', 'spiral')
+
+class PoolField:
+    """An attribute of an enemy handle that lives in one of the pool's arrays."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, handle, owner=None):
+        if handle is None:
+            return self
+        return getattr(handle.pool, self.name)[handle.index].item()
+
+    def __set__(self, handle, value):
+        getattr(handle.pool, self.name)[handle.index] = value
+
+class EnemyPool:
+    """Struct-of-arrays storage for all enemies.
+
+    Row i holds the state of `handles[i]`. `Enemy` objects are thin handles
+    whose attributes read and write these arrays, so per-enemy code keeps
+    working while `update()` moves, steers and ages every enemy with a few
+    array operations. Rows stay in spawn order, which is also draw order.
+
+    Crops are referenced by index into `targets`, which the pool fills as
+    enemies are assigned to crops.
+
+    Handles of removed rows go on the `free` list and are handed out again by
+    `reuse_handle()`, so a long game does not keep allocating Enemy objects.
+    Until then only their plain attributes (such as `scored`) may be read.
+    """
+
+    FIELDS = {
+        'x': np.float64, 'y': np.float64,
+        'prev_x': np.float64, 'prev_y': np.float64,
+        'speed_x': np.float64, 'speed_y': np.float64,
+        'original_speed_x': np.float64, 'original_speed_y': np.float64,
+        'width': np.int32, 'height': np.int32,
+        'pattern': np.int8, 'pattern_timer': np.int32,
+        'hit_timer': np.int32, 'death_timer': np.int32,
+        'is_being_hit': np.bool_, 'is_dying': np.bool_, 'active': np.bool_,
+        'target_index': np.int32,
+    }
+
+    def __init__(self, screen_width, screen_height, capacity=16, max_trail_length=5,
+                 hit_duration=5, death_duration=10, rng=None):
+        self.screen_width, self.screen_height = screen_width, screen_height
+        self.capacity = max(1, int(capacity))
+        self.max_trail_length = max_trail_length
+        self.hit_duration = hit_duration
+        self.death_duration = death_duration
+        # Seeded from `random` so random.seed() still makes a whole game reproducible
+        self.rng = rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+
+        self.count = 0
+        self.handles = []
+        self.targets = []
+        self.free = []
+
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(self.capacity, dtype=dtype))
+        self.trail = np.zeros((self.capacity, max_trail_length, 2), dtype=np.int32)
+        self.trail_length = np.zeros(self.capacity, dtype=np.int32)
+
+    def __len__(self):
+        return self.count
+
+    def grow(self, capacity):
+        for name in list(self.FIELDS) + ['trail', 'trail_length']:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def add(self, handle, x, y, speed_x, speed_y, pattern, width, height):
+        """Append a row for `handle` and return its index."""
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+
+        i = self.count
+        for name in self.FIELDS:
+            getattr(self, name)[i] = 0
+        self.x[i], self.y[i] = x, y
+        self.prev_x[i], self.prev_y[i] = x, y
+        self.speed_x[i], self.speed_y[i] = speed_x, speed_y
+        self.original_speed_x[i], self.original_speed_y[i] = speed_x, speed_y
+        self.width[i], self.height[i] = width, height
+        self.pattern[i] = pattern
+        self.active[i] = True
+        self.target_index[i] = -1
+        self.trail_length[i] = 0
+
+        self.handles.append(handle)
+        self.count += 1
+        return i
+
+    def target_index_for(self, crop):
+        if crop is None:
+            return -1
+        for i, target in enumerate(self.targets):
+            if target is crop:
+                return i
+        self.targets.append(crop)
+        return len(self.targets) - 1
+
+    def target_crop(self, i):
+        index = self.target_index[i]
+        return self.targets[index] if index >= 0 else None
+
+    def trail_positions(self, i):
+        length = self.trail_length[i]
+        return [tuple(p) for p in self.trail[i, self.max_trail_length - length:].tolist()]
+
+    def save_previous_positions(self):
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+
+    def target_state(self):
+        """Centres and destroyed flags of all targeted crops as arrays."""
+        centers = np.array([(t.x + t.width // 2, t.y + t.height // 2) for t in self.targets],
+                           dtype=np.float64).reshape(-1, 2)
+        destroyed = np.array([t.is_destroyed() for t in self.targets], dtype=np.bool_)
+        return centers, destroyed
+
+    def update(self, farmer, crops):
+        """Advance every enemy by one tick: trails, lifecycle, steering and movement."""
+        n = self.count
+        if n == 0:
+            return
+
+        x, y = self.x[:n], self.y[:n]
+        speed_x, speed_y = self.speed_x[:n], self.speed_y[:n]
+        original_x, original_y = self.original_speed_x[:n], self.original_speed_y[:n]
+        half_w, half_h = self.width[:n] // 2, self.height[:n] // 2
+
+        # Trails hold the last few centres, oldest first
+        trail = self.trail[:n]
+        trail[:, :-1] = trail[:, 1:]
+        trail[:, -1, 0] = x.astype(np.int32) + half_w
+        trail[:, -1, 1] = y.astype(np.int32) + half_h
+        np.minimum(self.trail_length[:n] + 1, self.max_trail_length, out=self.trail_length[:n])
+
+        dying = self.is_dying[:n]
+        death_timer = self.death_timer[:n]
+        death_timer[dying] += 1
+        self.active[:n][dying & (death_timer >= self.death_duration)] = False
+
+        live = ~dying
+        if not live.any():
+            return
+
+        # Enemies whose crop was destroyed pick another one or fall back to the farmer
+        target_index = self.target_index[:n]
+        centers, destroyed = self.target_state()
+        has_target = target_index >= 0
+        if destroyed.any():
+            lost = live & has_target & destroyed[np.maximum(target_index, 0)]
+            if lost.any():
+                for i in np.flatnonzero(lost):
+                    self.handles[i].retarget(crops)
+                centers, destroyed = self.target_state()
+                has_target = target_index >= 0
+
+        target_x = np.full(n, farmer.x + farmer.width // 2, dtype=np.float64)
+        target_y = np.full(n, farmer.y + farmer.height // 2, dtype=np.float64)
+        if has_target.any():
+            on_crop = has_target & ~destroyed[np.maximum(target_index, 0)]
+            target_x[on_crop] = centers[target_index[on_crop], 0]
+            target_y[on_crop] = centers[target_index[on_crop], 1]
+
+        dx = target_x - (x + half_w)
+        dy = target_y - (y + half_h)
+        dist = np.maximum(1, np.hypot(dx, dy))
+        current_speed = np.hypot(speed_x, speed_y)
+        original_x[live] = (dx / dist * current_speed)[live]
+        original_y[live] = (dy / dist * current_speed)[live]
+
+        pattern = self.pattern[:n]
+        pattern_timer = self.pattern_timer[:n]
+        zigzag = live & (pattern == ZIGZAG)
+        spiral = live & (pattern == SPIRAL)
+        direct = live & (pattern == DIRECT)
+        pattern_timer[zigzag | spiral] += 1
+
+        refresh = zigzag & (pattern_timer % 30 == 0)
+        refresh_count = int(refresh.sum())
+        if refresh_count:
+            speed_x[refresh] = original_x[refresh] * self.rng.uniform(0.8, 1.2, refresh_count)
+            speed_y[refresh] = original_y[refresh] * self.rng.uniform(0.8, 1.2, refresh_count)
+
+        angle = pattern_timer[spiral] * 0.1
+        speed_x[spiral] = original_x[spiral] + np.sin(angle) * 2
+        speed_y[spiral] = original_y[spiral] + np.cos(angle) * 2
+
+        speed_x[direct] = original_x[direct]
+        speed_y[direct] = original_y[direct]
+
+        x[live] += speed_x[live]
+        y[live] += speed_y[live]
+
+        being_hit = self.is_being_hit[:n]
+        hit_timer = self.hit_timer[:n]
+        hitting = live & being_hit
+        hit_timer[hitting] += 1
+        recovered = hitting & (hit_timer >= self.hit_duration)
+        being_hit[recovered] = False
+        hit_timer[recovered] = 0
+
+        off_screen = live & ((x > self.screen_width + 100) | (x < -self.width[:n] - 100) |
+                             (y > self.screen_height + 100) | (y < -self.height[:n] - 100))
+        if off_screen.any():
+            self.active[:n][off_screen] = False
+            for i in np.flatnonzero(off_screen & (target_index >= 0)):
+                self.targets[target_index[i]].is_targeted = False
+                target_index[i] = -1
+
+    def remove_inactive(self):
+        """Drop inactive rows, keeping the order of the rest. Returns the removed handles."""
+        n = self.count
+        keep = self.active[:n].copy()
+        if keep.all():
+            return []
+
+        removed = [handle for handle, kept in zip(self.handles, keep) if not kept]
+        for handle in removed:
+            handle.index = None
+        self.free.extend(removed)
+
+        m = int(keep.sum())
+        for name in list(self.FIELDS) + ['trail', 'trail_length']:
+            array = getattr(self, name)
+            array[:m] = array[:n][keep]
+
+        self.handles[:] = [handle for handle, kept in zip(self.handles, keep) if kept]
+        for i, handle in enumerate(self.handles):
+            handle.index = i
+        self.count = m
+        return removed
+
+    def reuse_handle(self):
+        """A handle of a removed enemy to reset() into a new row, or None."""
+        return self.free.pop() if self.free else None
+
+    def centers(self):
+        """Sprite centres of all enemies as two float arrays."""
+        n = self.count
+        return (self.x[:n] + self.width[:n] // 2, self.y[:n] + self.height[:n] // 2)
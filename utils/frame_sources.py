@@ -0,0 +1,238 @@
+"""Frame sources that stand in for the webcam.
+
+Every source reads like cv2.VideoCapture (`read()`, `get()`, `isOpened()`,
+`release()`), so it can be handed to ThreadedCapture or used directly.
+`open_frame_source(spec)` picks one from a command-line style spec:
+
+    0, 1, ...          webcam index
+    path/to/video.mp4  video file
+    path/to/frames/    directory of images, in file-name order
+    path/to/dump.npy   (frames, height, width, 3) uint8 array, memory-mapped
+    synthetic          generated test pattern with a moving hand-sized blob
+
+File and synthetic sources deliver frames at their frame rate when
+`realtime` is set, and as fast as they are read otherwise. Frames from a
+memory-mapped dump are read-only views of the file: no decoding, no copy,
+and ThreadedCapture hands them out as they are instead of copying them into
+its ring buffer.
+
+    python -m utils.frame_sources dump SOURCE OUT.npy --frames 300
+writes a dump from any source.
+"""
+import argparse
+import cv2
+from abc import ABC, abstractmethod
+import numpy as np
+import os
+import time
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp')
+
+class FrameSource(ABC):
+    """Common pacing, looping and property handling for the non-webcam sources."""
+
+    # ThreadedCapture may pass a preallocated buffer to read() instead of copying the result
+    supports_read_into = False
+    # Frames stay valid and unchanged after later reads, so ThreadedCapture may keep them without copying
+    zero_copy = False
+
+    def __init__(self, width, height, fps=30.0, frame_count=-1, realtime=True, loop=False):
+        self.width, self.height = width, height
+        self.fps = fps
+        self.frame_count = frame_count
+        self.realtime = realtime
+        self.loop = loop
+        self.position = 0
+        self.next_time = None
+        self.opened = True
+
+    def pace(self):
+        """Sleep until this frame is due when running in real time."""
+        if not self.realtime or not self.fps:
+            return
+        now = time.perf_counter()
+        if self.next_time is None or now - self.next_time > 1.0 / self.fps:
+            # First frame, or too far behind to catch up: restart the schedule from now
+            self.next_time = now
+        elif self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time += 1.0 / self.fps
+
+    def read(self, image=None):
+        if not self.opened:
+            return False, None
+        if self.frame_count >= 0 and self.position >= self.frame_count:
+            if not self.loop or self.frame_count == 0:
+                return False, None
+            self.rewind()
+
+        self.pace()
+        frame = self.read_frame(self.position, image)
+        if frame is None:
+            return False, None
+        self.position += 1
+        return True, frame
+
+    @abstractmethod
+    def read_frame(self, index, image):
+        """Return frame `index`, drawn into `image` when the source supports it, or None at the end."""
+
+    def rewind(self):
+        self.position = 0
+
+    def isOpened(self):
+        return self.opened
+
+    def get(self, prop_id):
+        if prop_id == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.width
+        if prop_id == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.height
+        if prop_id == cv2.CAP_PROP_FPS:
+            return self.fps
+        if prop_id == cv2.CAP_PROP_FRAME_COUNT:
+            return self.frame_count
+        if prop_id == cv2.CAP_PROP_POS_FRAMES:
+            return self.position
+        return 0
+
+    def set(self, prop_id, value):
+        return False
+
+    def release(self):
+        self.opened = False
+
+class VideoFileSource(FrameSource):
+    supports_read_into = True
+
+    def __init__(self, path, realtime=True, loop=False):
+        self.cap = cv2.VideoCapture(path)
+        super().__init__(int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                         self.cap.get(cv2.CAP_PROP_FPS) or 30.0, int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+                         realtime, loop)
+        self.opened = self.cap.isOpened()
+        # Frame counts from containers are estimates; the end is wherever decoding stops
+        self.frame_count = -1
+
+    def read_frame(self, index, image):
+        success, frame = self.cap.read(image) if image is not None else self.cap.read()
+        if not success and self.loop and index > 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.position = 0
+            success, frame = self.cap.read(image) if image is not None else self.cap.read()
+        return frame if success else None
+
+    def release(self):
+        super().release()
+        self.cap.release()
+
+class ImageDirectorySource(FrameSource):
+    def __init__(self, path, fps=30.0, realtime=True, loop=False):
+        self.paths = sorted(os.path.join(path, name) for name in os.listdir(path)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        first = cv2.imread(self.paths[0]) if self.paths else None
+        height, width = first.shape[:2] if first is not None else (0, 0)
+        super().__init__(width, height, fps, len(self.paths), realtime, loop)
+        self.opened = first is not None
+
+    def read_frame(self, index, image):
+        frame = cv2.imread(self.paths[index])
+        if frame is not None and frame.shape[:2] != (self.height, self.width):
+            frame = cv2.resize(frame, (self.width, self.height))
+        return frame
+
+class MemmapSource(FrameSource):
+    zero_copy = True
+
+    def __init__(self, path, fps=30.0, realtime=True, loop=False):
+        self.frames = np.load(path, mmap_mode='r')
+        if self.frames.ndim != 4 or self.frames.shape[3] != 3 or self.frames.dtype != np.uint8:
+            raise ValueError(f"{path}: expected a (frames, height, width, 3) uint8 array, "
+                             f"got {self.frames.shape} {self.frames.dtype}")
+        super().__init__(self.frames.shape[2], self.frames.shape[1], fps, len(self.frames), realtime, loop)
+
+    def read_frame(self, index, image):
+        return self.frames[index]
+
+    def release(self):
+        super().release()
+        self.frames = None
+
+class SyntheticSource(FrameSource):
+    """A fixed gradient with a skin-coloured blob moving in a circle; every frame is drawn into one buffer."""
+
+    supports_read_into = True
+
+    def __init__(self, width=1280, height=720, fps=30.0, frame_count=-1, realtime=True):
+        super().__init__(width, height, fps, frame_count, realtime)
+        ramp = np.linspace(40, 140, width, dtype=np.float32)
+        self.background = np.empty((height, width, 3), dtype=np.uint8)
+        self.background[:] = np.stack([ramp, ramp * 0.8, ramp * 0.6], axis=1).astype(np.uint8)
+        self.frame = np.empty_like(self.background)
+
+    def read_frame(self, index, image):
+        frame = image if image is not None and image.shape == self.frame.shape else self.frame
+        np.copyto(frame, self.background)
+        angle = index * 2 * np.pi / 120
+        center = (int(self.width * (0.5 + 0.3 * np.cos(angle))), int(self.height * (0.5 + 0.3 * np.sin(angle))))
+        cv2.circle(frame, center, min(self.width, self.height) // 8, (120, 160, 220), -1)
+        cv2.putText(frame, str(index), (20, self.height - 20), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        return frame
+
+def open_frame_source(spec, width=1280, height=720, fps=30.0, realtime=True, loop=False):
+    """Open a webcam, video file, image directory, .npy dump or 'synthetic' source from `spec`."""
+    spec = str(spec)
+    if spec.isdigit():
+        cap = cv2.VideoCapture(int(spec))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+    if spec == 'synthetic':
+        return SyntheticSource(width, height, fps, realtime=realtime)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, fps, realtime, loop)
+    if spec.endswith('.npy'):
+        return MemmapSource(spec, fps, realtime, loop)
+    return VideoFileSource(spec, realtime, loop)
+
+def dump_frames(source, path, max_frames):
+    """Write up to `max_frames` frames from `source` to a .npy file that MemmapSource can map."""
+    width, height = int(source.get(cv2.CAP_PROP_FRAME_WIDTH)), int(source.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    frames = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(max_frames, height, width, 3))
+    count = 0
+    while count < max_frames:
+        success, frame = source.read()
+        if not success:
+            break
+        if frame.shape[:2] != (height, width):
+            frame = cv2.resize(frame, (width, height))
+        frames[count] = frame
+        count += 1
+    frames.flush()
+    del frames
+
+    if count < max_frames:
+        # Rewrite with the real length so the header matches the data
+        data = np.load(path, mmap_mode='r')[:count].copy()
+        np.save(path, data)
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame source utilities.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    dump = subparsers.add_parser('dump', help="write frames from a source to a memory-mappable .npy file")
+    dump.add_argument('source')
+    dump.add_argument('output')
+    dump.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    source = open_frame_source(args.source, realtime=False)
+    try:
+        count = dump_frames(source, args.output, args.frames)
+    finally:
+        source.release()
+    print(f"Wrote {count} frames to {args.output}")
+
+if __name__ == "__main__":
+    main()
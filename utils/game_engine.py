@@ -5,68 +5,126 @@ import time
 import os
 import traceback
 import math
+from utils.compositor import Sprite, blit
+from utils.enemy_pool import EnemyPool, PoolField, MOVEMENT_PATTERNS, DIRECT
+from utils.collisions import SpatialGrid, pairs_within, first_hits
+from utils.particles import ParticleSystem
+from utils.profiler import FrameProfiler
+from utils.records import Bullet, Notification, RecordPool
+from utils.render_layers import CachedLayer, blend_rect, panel_cache, render_overlay
+from utils.sprite_cache import sprite_cache
+from utils.text_cache import FADE_STEPS, text_cache, text_size
+
+def make_fallback_crop_img():
+    img = np.zeros((80, 80, 4), dtype=np.uint8)
+    img[:, :, 0] = 50
+    img[:, :, 1] = 170
+    img[:, :, 2] = 100
+    img[:, :, 3] = 255
+    
+    cv2.rectangle(img, (20, 40), (60, 70), (20, 120, 30), -1)
+    cv2.rectangle(img, (30, 20), (50, 40), (20, 200, 50), -1)
+    return img
+
+def make_fallback_enemy_img():
+    img = np.zeros((80, 80, 4), dtype=np.uint8)
+    cv2.circle(img, (40, 40), 30, (0, 0, 255, 255), -1)
+    return img
+
+def make_fallback_farmer_img():
+    img = np.zeros((120, 120, 4), dtype=np.uint8)
+    cv2.rectangle(img, (40, 40), (80, 90), (0, 0, 255, 255), -1)
+    cv2.circle(img, (60, 30), 20, (0, 0, 255, 255), -1)
+    return img
+
+HEALTH_BAR_WIDTH = 60
+HEALTH_BAR_HEIGHT = 10
+TARGET_PULSE_PHASES = 30
+END_SCREEN_INSTRUCTION = "Press 'r' to Restart or 'q' to Quit"
+
+# Health-bar and targeting-ring sprite tables shared by every crop of the same width and max health
+crop_overlay_tables = {}
+
+def make_health_bar_sprites(max_health, health_colors):
+    """One opaque health-bar sprite per health value 0..max_health, including the 2 px dark frame."""
+    sprites = []
+    for health in range(max_health + 1):
+        img = np.zeros((HEALTH_BAR_HEIGHT + 5, HEALTH_BAR_WIDTH + 5, 3), dtype=np.uint8)
+        img[:] = (20, 20, 20)
+        cv2.rectangle(img, (2, 2), (2 + HEALTH_BAR_WIDTH, 2 + HEALTH_BAR_HEIGHT), (50, 50, 50), -1)
+        
+        current_health_width = int((health / max_health) * HEALTH_BAR_WIDTH)
+        health_color = health_colors[min(health, len(health_colors) - 1)]
+        
+        for i in range(HEALTH_BAR_HEIGHT):
+            brightness_factor = 1.3 - (i / HEALTH_BAR_HEIGHT)
+            bar_color = tuple(min(255, int(c * brightness_factor)) for c in health_color)
+            cv2.line(img, (2, 2 + i), (2 + current_health_width, 2 + i), bar_color, 1)
+        
+        img.setflags(write=False)
+        sprites.append(Sprite(img))
+    return tuple(sprites)
+
+def make_target_ring_sprites(crop_width):
+    """One targeting-ring sprite per pulse phase, all the same size and centred on their middle pixel."""
+    max_radius = crop_width // 2 + 8
+    size = 2 * (max_radius + 2) + 1
+    center = (size // 2, size // 2)
+    
+    sprites = []
+    for phase in range(TARGET_PULSE_PHASES):
+        pulse_size = 5 + int(3 * math.sin(phase * 0.2))
+        ring_radius = crop_width // 2 + pulse_size
+        sprites.append(render_overlay(
+            lambda canvas: cv2.circle(canvas, center, ring_radius, (0, 0, 255), 2), size, size))
+    return tuple(sprites)
+
+def get_crop_overlay_tables(crop_width, max_health, health_colors):
+    key = (crop_width, max_health, health_colors)
+    tables = crop_overlay_tables.get(key)
+    if tables is None:
+        tables = (make_health_bar_sprites(max_health, health_colors), make_target_ring_sprites(crop_width))
+        crop_overlay_tables[key] = tables
+    return tables
 
 class CropPlot:
+    __slots__ = ('sprite', 'img', 'width', 'height', 'screen_width', 'screen_height', 'x', 'y',
+                 'max_health', 'health', 'is_being_hit', 'hit_timer', 'hit_duration',
+                 'is_targeted', 'target_pulse', 'health_bars', 'target_rings')
+    
+    health_colors = (
+        (0, 0, 255),
+        (0, 165, 255),
+        (0, 255, 0)
+    )
+    
     def __init__(self, img_path, x, y, screen_width, screen_height):
         try:
-            self.original_img = cv2.imread(img_path, cv2.IMREAD_UNCHANGED)
-            
-            if self.original_img is None:
-                self.img = np.zeros((80, 80, 4), dtype=np.uint8)
-                self.img[:, :, 0] = 50
-                self.img[:, :, 1] = 170
-                self.img[:, :, 2] = 100
-                self.img[:, :, 3] = 255
-                
-                cv2.rectangle(self.img, (20, 40), (60, 70), (20, 120, 30), -1)
-                cv2.rectangle(self.img, (30, 20), (50, 40), (20, 200, 50), -1)
-            elif self.original_img.shape[2] == 3:
-                self.original_img = cv2.cvtColor(self.original_img, cv2.COLOR_BGR2BGRA)
-                self.img = cv2.resize(self.original_img, (80, 80))
-            else:
-                self.img = cv2.resize(self.original_img, (80, 80))
-                
-            self.width, self.height = self.img.shape[1], self.img.shape[0]
-            self.screen_width, self.screen_height = screen_width, screen_height
-            
-            self.x = x
-            self.y = y
-            
-            self.max_health = 3
-            self.health = self.max_health
-            
-            self.is_being_hit = False
-            self.hit_timer = 0
-            self.hit_duration = 8
-            
-            self.health_colors = [
-                (0, 0, 255),
-                (0, 165, 255),
-                (0, 255, 0)
-            ]
-            
-            self.is_targeted = False
-            self.target_pulse = 0
-            
+            self.sprite = sprite_cache.get_sprite(img_path, (80, 80), fallback=make_fallback_crop_img)
         except Exception as e:
             print(f"Error creating crop: {e}")
             traceback.print_exc()
-            self.img = np.zeros((80, 80, 4), dtype=np.uint8)
-            cv2.rectangle(self.img, (20, 40), (60, 70), (20, 120, 30), -1)
-            cv2.rectangle(self.img, (30, 20), (50, 40), (20, 200, 50), -1)
-            self.img[:, :, 3] = 255
-            
-            self.width, self.height = 80, 80
-            self.screen_width, self.screen_height = screen_width, screen_height
-            self.x, self.y = x, y
-            self.max_health = 3
-            self.health = self.max_health
-            self.is_being_hit = False
-            self.hit_timer = 0
-            self.hit_duration = 8
-            self.health_colors = [(0, 0, 255), (0, 165, 255), (0, 255, 0)]
-            self.is_targeted = False
-            self.target_pulse = 0
+            self.sprite = Sprite(make_fallback_crop_img())
+        self.img = self.sprite.img
+            
+        self.width, self.height = self.img.shape[1], self.img.shape[0]
+        self.screen_width, self.screen_height = screen_width, screen_height
+        
+        self.x = x
+        self.y = y
+        
+        self.max_health = 3
+        self.health = self.max_health
+        
+        self.is_being_hit = False
+        self.hit_timer = 0
+        self.hit_duration = 8
+        
+        self.is_targeted = False
+        self.target_pulse = 0
+        
+        self.health_bars, self.target_rings = get_crop_overlay_tables(self.width, self.max_health,
+                                                                      self.health_colors)
     
     def update(self):
         if self.is_being_hit:
@@ -76,7 +134,7 @@ class CropPlot:
                 self.hit_timer = 0
         
         if self.is_targeted:
-            self.target_pulse = (self.target_pulse + 1) % 30
+            self.target_pulse = (self.target_pulse + 1) % TARGET_PULSE_PHASES
     
     def take_damage(self):
         self.health = max(0, self.health - 1)
@@ -95,95 +153,111 @@ class CropPlot:
         return self.health_colors[index]
 
 class Enemy:
-    def __init__(self, img_path, screen_width, screen_height, target_type="farmer"):
+    x = PoolField('x')
+    y = PoolField('y')
+    prev_x = PoolField('prev_x')
+    prev_y = PoolField('prev_y')
+    speed_x = PoolField('speed_x')
+    speed_y = PoolField('speed_y')
+    original_speed_x = PoolField('original_speed_x')
+    original_speed_y = PoolField('original_speed_y')
+    pattern_timer = PoolField('pattern_timer')
+    hit_timer = PoolField('hit_timer')
+    death_timer = PoolField('death_timer')
+    is_being_hit = PoolField('is_being_hit')
+    is_dying = PoolField('is_dying')
+    active = PoolField('active')
+    target_index = PoolField('target_index')
+    
+    __slots__ = ('pool', 'index', 'sprite', 'img', 'width', 'height', 'screen_width', 'screen_height',
+                 'movement_pattern', 'time_reward', 'scored', 'target_type', 'rng')
+    
+    def __init__(self, img_path, screen_width, screen_height, target_type="farmer", pool=None, rng=None):
+        # State that changes every tick lives in an EnemyPool row; this object is a handle to it
+        self.pool = pool if pool is not None else EnemyPool(screen_width, screen_height, capacity=1)
+        self.rng = rng if rng is not None else random
+        self.reset(img_path, screen_width, screen_height, target_type)
+    
+    def reset(self, img_path, screen_width, screen_height, target_type="farmer"):
+        """(Re)initialise this handle as a freshly spawned enemy in a new pool row."""
+        size = self.rng.randint(80, 120)
         try:
-            self.original_img = cv2.imread(img_path, cv2.IMREAD_UNCHANGED)
-            
-            if self.original_img is None:
-                self.original_img = np.zeros((80, 80, 4), dtype=np.uint8)
-                cv2.circle(self.original_img, (40, 40), 30, (0, 0, 255, 255), -1)
-                print(f"Created fallback enemy image as {img_path} was not found")
-            elif self.original_img.shape[2] == 3:
-                self.original_img = cv2.cvtColor(self.original_img, cv2.COLOR_BGR2BGRA)
-                
-            size = random.randint(80, 120)
-            self.img = cv2.resize(self.original_img, (size, size))
-            
-            self.width, self.height = self.img.shape[1], self.img.shape[0]
-            self.screen_width, self.screen_height = screen_width, screen_height
-            
-            side = random.choice(['left', 'right', 'top', 'bottom'])
-            if side == 'left':
-                self.x = -self.width
-                self.y = random.randint(0, screen_height - self.height)
-            elif side == 'right':
-                self.x = screen_width
-                self.y = random.randint(0, screen_height - self.height)
-            elif side == 'top':
-                self.x = random.randint(0, screen_width - self.width)
-                self.y = -self.height
-            else:
-                self.x = random.randint(0, screen_width - self.width)
-                self.y = screen_height
-            
-            self.target_type = target_type
-            self.target_crop = None
-            
-            center_x, center_y = screen_width // 2, screen_height // 2
-            dx, dy = center_x - self.x, center_y - self.y
-            dist = max(1, np.sqrt(dx**2 + dy**2))
-            
-            self.speed_x = (dx / dist) * random.uniform(1, 3)
-            self.speed_y = (dy / dist) * random.uniform(1, 3)
-            
-            self.speed_x += random.uniform(-0.5, 0.5)
-            self.speed_y += random.uniform(-0.5, 0.5)
-            
-            self.movement_pattern = random.choice(['direct', 'zigzag', 'spiral'])
-            self.pattern_timer = 0
-            self.original_speed_x = self.speed_x
-            self.original_speed_y = self.speed_y
-            
-            self.active = True
-            
-            self.is_being_hit = False
-            self.hit_timer = 0
-            self.hit_duration = 5
-            
-            self.is_dying = False
-            self.death_timer = 0
-            self.death_duration = 10
-            
-            self.trail_positions = []
-            self.max_trail_length = 5
-            
-            self.time_reward = random.uniform(1.0, 2.0)
-            
-            self.scored = False
-            
+            self.sprite = sprite_cache.get_sprite(img_path, (size, size), fallback=make_fallback_enemy_img)
         except Exception as e:
             print(f"Error creating enemy: {e}")
             traceback.print_exc()
-            self.img = np.zeros((80, 80, 4), dtype=np.uint8)
-            cv2.circle(self.img, (40, 40), 30, (0, 0, 255, 255), -1)
-            self.width, self.height = 80, 80
-            self.screen_width, self.screen_height = screen_width, screen_height
-            self.x, self.y = -80, screen_height // 2
-            self.speed_x, self.speed_y = 2, 0
-            self.target_type = target_type
-            self.target_crop = None
-            self.active = True
-            self.is_being_hit = False
-            self.hit_timer = 0
-            self.hit_duration = 5
-            self.is_dying = False
-            self.death_timer = 0
-            self.death_duration = 10
-            self.movement_pattern = 'direct'
-            self.trail_positions = []
-            self.max_trail_length = 5
-            self.time_reward = 1.5
-            self.scored = False
+            self.sprite = Sprite(make_fallback_enemy_img())
+        self.img = self.sprite.img
+        
+        # Build the hit-flash and death-fade variants now rather than in the frame the enemy is shot
+        self.sprite.flash()
+        self.sprite.fade_frames(self.pool.death_duration)
+        
+        self.width, self.height = self.img.shape[1], self.img.shape[0]
+        self.screen_width, self.screen_height = screen_width, screen_height
+        
+        side = self.rng.choice(['left', 'right', 'top', 'bottom'])
+        if side == 'left':
+            x = -self.width
+            y = self.rng.randint(0, screen_height - self.height)
+        elif side == 'right':
+            x = screen_width
+            y = self.rng.randint(0, screen_height - self.height)
+        elif side == 'top':
+            x = self.rng.randint(0, screen_width - self.width)
+            y = -self.height
+        else:
+            x = self.rng.randint(0, screen_width - self.width)
+            y = screen_height
+        
+        center_x, center_y = screen_width // 2, screen_height // 2
+        dx, dy = center_x - x, center_y - y
+        dist = max(1, math.sqrt(dx**2 + dy**2))
+        
+        speed_x = (dx / dist) * self.rng.uniform(1, 3)
+        speed_y = (dy / dist) * self.rng.uniform(1, 3)
+        
+        speed_x += self.rng.uniform(-0.5, 0.5)
+        speed_y += self.rng.uniform(-0.5, 0.5)
+        
+        self.movement_pattern = self.rng.choice(MOVEMENT_PATTERNS)
+        
+        self.time_reward = self.rng.uniform(1.0, 2.0)
+        
+        self.scored = False
+        
+        self.index = self.pool.add(self, x, y, speed_x, speed_y,
+                                   MOVEMENT_PATTERNS.index(self.movement_pattern),
+                                   self.width, self.height)
+        self.target_type = target_type
+    
+    @property
+    def target_crop(self):
+        return self.pool.target_crop(self.index)
+    
+    @target_crop.setter
+    def target_crop(self, crop):
+        self.target_index = self.pool.target_index_for(crop)
+    
+    @property
+    def trail_positions(self):
+        return self.pool.trail_positions(self.index)
+    
+    @property
+    def hit_duration(self):
+        return self.pool.hit_duration
+    
+    @property
+    def death_duration(self):
+        return self.pool.death_duration
+    
+    def save_previous_position(self):
+        self.prev_x, self.prev_y = self.x, self.y
+    
+    def render_position(self, alpha):
+        """Position interpolated between the last two simulation ticks."""
+        return (int(self.prev_x + (self.x - self.prev_x) * alpha),
+                int(self.prev_y + (self.y - self.prev_y) * alpha))
     
     def set_target_crop(self, crop):
         self.target_crop = crop
@@ -191,91 +265,18 @@ class Enemy:
         if crop:
             crop.is_targeted = True
     
-    def update_target_direction(self, farmer, crops):
-        if self.is_dying:
-            return
-            
-        target_x, target_y = None, None
-            
-        if self.target_type == "crop" and self.target_crop is not None:
-            if self.target_crop.is_destroyed():
-                valid_crops = [crop for crop in crops if not crop.is_destroyed()]
-                if valid_crops:
-                    self.target_crop.is_targeted = False
-                    self.target_crop = random.choice(valid_crops)
-                    self.target_crop.is_targeted = True
-                else:
-                    if self.target_crop:
-                        self.target_crop.is_targeted = False
-                    self.target_type = "farmer"
-                    self.target_crop = None
-                    
-            if self.target_crop and not self.target_crop.is_destroyed():
-                target_x = self.target_crop.x + self.target_crop.width // 2
-                target_y = self.target_crop.y + self.target_crop.height // 2
-            else:
-                target_x = farmer.x + farmer.width // 2
-                target_y = farmer.y + farmer.height // 2
-                
+    def retarget(self, crops):
+        """Pick a new crop after the current target was destroyed, or go for the farmer."""
+        valid_crops = [crop for crop in crops if not crop.is_destroyed()]
+        if self.target_crop:
+            self.target_crop.is_targeted = False
+        if valid_crops:
+            self.target_crop = self.rng.choice(valid_crops)
+            self.target_crop.is_targeted = True
         else:
-            target_x = farmer.x + farmer.width // 2
-            target_y = farmer.y + farmer.height // 2
-        
-        dx = target_x - (self.x + self.width // 2)
-        dy = target_y - (self.y + self.height // 2)
-        dist = max(1, np.sqrt(dx**2 + dy**2))
-        
-        current_speed = np.sqrt(self.speed_x**2 + self.speed_y**2)
-        self.original_speed_x = (dx / dist) * current_speed
-        self.original_speed_y = (dy / dist) * current_speed
+            self.target_type = "farmer"
+            self.target_crop = None
     
-    def update(self, farmer=None, crops=None):
-        self.trail_positions.append((int(self.x) + self.width//2, int(self.y) + self.height//2))
-        if len(self.trail_positions) > self.max_trail_length:
-            self.trail_positions.pop(0)
-        
-        if self.is_dying:
-            self.death_timer += 1
-            if self.death_timer >= self.death_duration:
-                self.active = False
-            return
-        
-        if farmer is not None and crops is not None:
-            self.update_target_direction(farmer, crops)
-        
-        if self.movement_pattern == 'zigzag':
-            self.pattern_timer += 1
-            if self.pattern_timer % 30 == 0:
-                self.speed_x = self.original_speed_x * random.uniform(0.8, 1.2)
-                self.speed_y = self.original_speed_y * random.uniform(0.8, 1.2)
-        
-        elif self.movement_pattern == 'spiral':
-            self.pattern_timer += 1
-            angle = self.pattern_timer * 0.1
-            spiral_x = math.sin(angle) * 2
-            spiral_y = math.cos(angle) * 2
-            self.speed_x = self.original_speed_x + spiral_x
-            self.speed_y = self.original_speed_y + spiral_y
-        else:
-            self.speed_x = self.original_speed_x
-            self.speed_y = self.original_speed_y
-        
-        self.x += self.speed_x
-        self.y += self.speed_y
-        
-        if self.is_being_hit:
-            self.hit_timer += 1
-            if self.hit_timer >= self.hit_duration:
-                self.is_being_hit = False
-                self.hit_timer = 0
-        
-        if (self.x > self.screen_width + 100 or self.x < -self.width - 100 or 
-            self.y > self.screen_height + 100 or self.y < -self.height - 100):
-            self.active = False
-            if self.target_crop:
-                self.target_crop.is_targeted = False
-                self.target_crop = None
-            
     def start_hit_animation(self):
         self.is_being_hit = True
         self.hit_timer = 0
@@ -296,10 +297,6 @@ class Enemy:
         enemy_center_x = self.x + self.width // 2
         enemy_center_y = self.y + self.height // 2
         distance = np.sqrt((x - enemy_center_x)**2 + (y - enemy_center_y)**2)
-        
-        if distance < 100:
-            print(f"Shot distance to enemy: {distance}, Need: {radius}")
-            
         return distance < radius
     
     def is_colliding_with_crop(self, crop):
@@ -315,67 +312,52 @@ class Enemy:
         return distance < (self.width // 2 + crop.width // 2) * 0.6
 
 class Farmer:
+    __slots__ = ('sprite', 'img', 'width', 'height', 'screen_width', 'screen_height', 'x', 'y',
+                 'prev_x', 'prev_y', 'is_moving', 'move_timer', 'move_duration', 'move_direction',
+                 'original_x', 'original_y', 'is_attacking', 'attack_timer', 'attack_duration',
+                 'has_superpower', 'superpower_timer', 'superpower_duration', 'superpower_multiplier')
+    
     def __init__(self, img_path, screen_width, screen_height):
         try:
-            self.original_img = cv2.imread(img_path, cv2.IMREAD_UNCHANGED)
-            
-            if self.original_img is None:
-                self.original_img = np.zeros((120, 120, 4), dtype=np.uint8)
-                cv2.rectangle(self.original_img, (40, 40), (80, 90), (0, 0, 255, 255), -1)
-                cv2.circle(self.original_img, (60, 30), 20, (0, 0, 255, 255), -1)
-                print(f"Created fallback farmer image as {img_path} was not found")
-                self.img = self.original_img
-            elif self.original_img.shape[2] == 3:
-                self.original_img = cv2.cvtColor(self.original_img, cv2.COLOR_BGR2BGRA)
-                self.img = cv2.resize(self.original_img, (120, 120))
-            else:
-                self.img = cv2.resize(self.original_img, (120, 120))
-            
-            self.width, self.height = self.img.shape[1], self.img.shape[0]
-            self.screen_width, self.screen_height = screen_width, screen_height
-            
-            self.x = screen_width // 2 - self.width // 2
-            self.y = screen_height // 2 - self.height // 2
-            
-            self.is_moving = False
-            self.move_timer = 0
-            self.move_duration = 10
-            self.move_direction = None
-            self.original_x = self.x
-            self.original_y = self.y
-            
-            self.is_attacking = False
-            self.attack_timer = 0
-            self.attack_duration = 5
-            
-            self.has_superpower = False
-            self.superpower_timer = 0
-            self.superpower_duration = 300
-            self.superpower_multiplier = 3.0
-            
+            self.sprite = sprite_cache.get_sprite(img_path, (120, 120), fallback=make_fallback_farmer_img)
         except Exception as e:
             print(f"Error creating farmer: {e}")
             traceback.print_exc()
-            self.img = np.zeros((100, 100, 4), dtype=np.uint8)
-            cv2.circle(self.img, (50, 50), 40, (0, 0, 255, 255), -1)
-            self.width, self.height = 100, 100
-            self.screen_width, self.screen_height = screen_width, screen_height
-            self.x = screen_width // 2 - self.width // 2
-            self.y = screen_height // 2 - self.height // 2
-            self.is_moving = False
-            self.move_timer = 0
-            self.move_duration = 10
-            self.move_direction = None
-            self.original_x = self.x
-            self.original_y = self.y
-            self.is_attacking = False
-            self.attack_timer = 0
-            self.attack_duration = 5
-            self.has_superpower = False
-            self.superpower_timer = 0
-            self.superpower_duration = 300
-            self.superpower_multiplier = 3.0
+            self.sprite = Sprite(make_fallback_farmer_img())
+        self.img = self.sprite.img
+        
+        self.width, self.height = self.img.shape[1], self.img.shape[0]
+        self.screen_width, self.screen_height = screen_width, screen_height
+        
+        self.x = screen_width // 2 - self.width // 2
+        self.y = screen_height // 2 - self.height // 2
+        
+        self.is_moving = False
+        self.move_timer = 0
+        self.move_duration = 10
+        self.move_direction = None
+        self.original_x = self.x
+        self.original_y = self.y
+        
+        self.is_attacking = False
+        self.attack_timer = 0
+        self.attack_duration = 5
+        
+        self.has_superpower = False
+        self.superpower_timer = 0
+        self.superpower_duration = 300
+        self.superpower_multiplier = 3.0
+        
+        self.prev_x, self.prev_y = self.x, self.y
             
+    def save_previous_position(self):
+        self.prev_x, self.prev_y = self.x, self.y
+    
+    def render_position(self, alpha):
+        """Position interpolated between the last two simulation ticks."""
+        return (int(self.prev_x + (self.x - self.prev_x) * alpha),
+                int(self.prev_y + (self.y - self.prev_y) * alpha))
+    
     def update(self):
         if self.is_moving:
             self.move_timer += 1
@@ -428,6 +410,8 @@ class Farmer:
         self.y = max(0, min(y, self.screen_height - self.height))
         self.original_x = self.x
         self.original_y = self.y
+        # Hand input is applied immediately, not interpolated
+        self.prev_x, self.prev_y = self.x, self.y
     
     def start_move_animation(self, direction):
         if not self.is_moving:
@@ -445,7 +429,15 @@ class Farmer:
         return True
 
 class GameEngine:
-    def __init__(self, assets_path='assets', game_duration=90):
+    def __init__(self, assets_path='assets', game_duration=90, dirty_rect_mode=False,
+                 tick_rate=30, max_steps_per_update=5, particle_budget=512, clock=None, seed=None,
+                 profiler=None):
+        # All game randomness comes from self.rng and all wall-clock reads from self.clock,
+        # so a fixed seed and a scripted clock replay a game exactly
+        self.clock = clock if clock is not None else time.perf_counter
+        self.rng = random.Random(seed if seed is not None else random.getrandbits(64))
+        # Disabled unless the caller passes an enabled FrameProfiler; timings go into its ring buffers
+        self.profiler = profiler if profiler is not None else FrameProfiler(enabled=False)
         try:
             if not os.path.exists(assets_path):
                 os.makedirs(assets_path, exist_ok=True)
@@ -510,22 +502,41 @@ class GameEngine:
             
             self.farmer = Farmer(farmer_path, self.width, self.height)
             
+            self.static_layer = CachedLayer(self.build_static_layer)
+            self.hud_layer = CachedLayer(self.build_hud_layer)
+            self.hud_height = 56
+            
             self.crops = []
             self.create_crops()
             
             self.game_duration = game_duration
             self.remaining_time = game_duration
-            self.last_time_update = time.time()
             self.frame_count = 0
+            self.fps_time = 0.0
             self.fps_estimate = 30
             
+            # Simulation runs in fixed ticks; all frame-counted timers are in ticks
+            self.tick_rate = tick_rate
+            self.tick_dt = 1.0 / tick_rate
+            self.max_steps_per_update = max_steps_per_update
+            self.accumulator = 0.0
+            self.last_update_time = None
+            self.sim_time = 0.0
+            self.ticks = 0
+            self.dropped_ticks = 0
+            self.render_alpha = 1.0
+            
             self.score = 0
             self.game_over = False
             self.game_won = False
-            self.enemies = []
+            self.enemy_pool = EnemyPool(self.width, self.height,
+                                        rng=np.random.default_rng(self.rng.getrandbits(64)))
+            self.enemies = self.enemy_pool.handles
+            self.enemy_grid = SpatialGrid(self.width, self.height, cell_size=64)
             self.bullets = []
-            self.last_enemy_spawn = time.time()
-            self.last_superpower_time = time.time() - 30
+            self.bullet_pool = RecordPool(Bullet)
+            self.last_enemy_spawn = self.sim_time
+            self.last_superpower_time = self.sim_time - 30
             self.superpower_cooldown = 30
             
             self.superpower_active = False
@@ -533,8 +544,10 @@ class GameEngine:
             self.superpower_effect_duration = 20
             
             self.notifications = []
+            self.notification_pool = RecordPool(Notification)
             
-            self.smoke_particles = []
+            self.smoke_particles = ParticleSystem(capacity=particle_budget,
+                                                  rng=np.random.default_rng(self.rng.getrandbits(64)))
             
             self.last_farmer_pos = None
             
@@ -544,6 +557,15 @@ class GameEngine:
             
             self.crop_targeting_chance = 0.8
             
+            self.dirty_rect_mode = dirty_rect_mode
+            self.show_dirty_rects = False
+            self.frame_buffer = None
+            self.frame_rects = None
+            self.prev_frame_rects = []
+            self.static_layer_version = -1
+            self.end_screen = None
+            self.dirty_stats = {'rects': 0, 'pixel_fraction': 1.0}
+            
         except Exception as e:
             print(f"Error initializing GameEngine: {e}")
             traceback.print_exc()
@@ -555,25 +577,43 @@ class GameEngine:
             self.farmer = Farmer("", self.width, self.height)
             
             self.enemy_img_paths = []
+            self.static_layer = CachedLayer(self.build_static_layer)
+            self.hud_layer = CachedLayer(self.build_hud_layer)
+            self.hud_height = 56
             self.crops = []
             self.create_crops()
             self.score = 0
             self.game_over = False
             self.game_won = False
-            self.enemies = []
+            self.enemy_pool = EnemyPool(self.width, self.height,
+                                        rng=np.random.default_rng(self.rng.getrandbits(64)))
+            self.enemies = self.enemy_pool.handles
+            self.enemy_grid = SpatialGrid(self.width, self.height, cell_size=64)
             self.bullets = []
-            self.smoke_particles = []
-            self.last_enemy_spawn = time.time()
-            self.last_superpower_time = time.time() - 30
+            self.bullet_pool = RecordPool(Bullet)
+            self.smoke_particles = ParticleSystem(capacity=particle_budget,
+                                                  rng=np.random.default_rng(self.rng.getrandbits(64)))
+            self.tick_rate = tick_rate
+            self.tick_dt = 1.0 / tick_rate
+            self.max_steps_per_update = max_steps_per_update
+            self.accumulator = 0.0
+            self.last_update_time = None
+            self.sim_time = 0.0
+            self.ticks = 0
+            self.dropped_ticks = 0
+            self.render_alpha = 1.0
+            self.last_enemy_spawn = self.sim_time
+            self.last_superpower_time = self.sim_time - 30
             self.superpower_cooldown = 30
             self.superpower_active = False
             self.superpower_effect_timer = 0
             self.superpower_effect_duration = 20
             self.notifications = []
+            self.notification_pool = RecordPool(Notification)
             self.last_farmer_pos = None
             self.remaining_time = game_duration
-            self.last_time_update = time.time()
             self.frame_count = 0
+            self.fps_time = 0.0
             self.fps_estimate = 30
             self.min_enemy_spawn_interval = 2.0
             self.max_enemy_spawn_interval = 4.0
@@ -582,30 +622,49 @@ class GameEngine:
             self.font = cv2.FONT_HERSHEY_SIMPLEX
             self.font_scale = 0.9
             self.font_thickness = 2
+            self.dirty_rect_mode = dirty_rect_mode
+            self.show_dirty_rects = False
+            self.frame_buffer = None
+            self.frame_rects = None
+            self.prev_frame_rects = []
+            self.static_layer_version = -1
+            self.end_screen = None
+            self.dirty_stats = {'rects': 0, 'pixel_fraction': 1.0}
     
-    def draw_pixelated_text(self, img, text, position, color, font_scale=1.0, thickness=2):
-        x, y = position
-        
-        shadow_offset = int(2 * font_scale)
-        cv2.putText(img, text, (x + shadow_offset, y + shadow_offset), 
-                    self.font, font_scale, (0, 0, 0), thickness + 1)
-        
-        for dx, dy in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            cv2.putText(img, text, (x + dx, y + dy), 
-                        self.font, font_scale, (0, 0, 0), thickness)
+    def mark_dirty(self, x1, y1, x2, y2):
+        if self.frame_rects is not None:
+            self.frame_rects.append((int(x1), int(y1), int(x2), int(y2)))
+    
+    def mark_dirty_rects(self, rects):
+        if self.frame_rects is not None:
+            self.frame_rects.extend(map(tuple, rects.tolist()))
+    
+    def draw_pixelated_text(self, img, text, position, color, font_scale=1.0, thickness=2, opacity=1.0):
+        # Outlined labels are rasterized once per (text, scale, thickness, colour) and blitted after that
+        label = text_cache.get(text, self.font, font_scale, thickness, color)
+        sprite = label.sprite
+        if opacity < 1.0:
+            step = min(FADE_STEPS, max(0, int(round((1.0 - opacity) * FADE_STEPS))))
+            sprite = sprite.fade_frames(FADE_STEPS)[step]
+        x, y = position[0] - label.left, position[1] - label.top
         
-        cv2.putText(img, text, (x, y), 
-                    self.font, font_scale, color, thickness)
+        self.mark_dirty(x, y, x + label.width, y + label.height)
+        blit(img, sprite, x, y)
         
         return img
     
-    def draw_ui_panel(self, img, pos, size, color=(60, 60, 60), alpha=0.7, border_color=None, border_size=2):
+    def draw_ui_panel(self, img, pos, size, color=(60, 60, 60), alpha=0.7, border_color=None, border_size=2,
+                      cached=False):
         x, y, w, h = pos[0], pos[1], size[0], size[1]
         
-        overlay = img.copy()
-        cv2.rectangle(overlay, (x, y), (x + w, y + h), color, -1)
+        self.mark_dirty(x - border_size, y - border_size, x + w + border_size + 1, y + h + border_size + 1)
+        
+        # Panels that look the same every frame are blitted from a pre-rendered sprite
+        if cached:
+            blit(img, panel_cache.get(w, h, color, alpha, border_color, border_size), x - border_size, y - border_size)
+            return img
         
-        cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+        blend_rect(img, x, y, x + w, y + h, color, alpha)
         
         if border_color:
             cv2.rectangle(img, (x, y), (x + w, y + h), border_color, border_size)
@@ -638,23 +697,21 @@ class GameEngine:
             crop = CropPlot(self.crop_img_path, x, y, self.width, self.height)
             self.crops.append(crop)
     
-    def update_time_remaining(self):
+    def update_fps_estimate(self, elapsed):
         self.frame_count += 1
+        self.fps_time += elapsed
         
-        current_time = time.time()
-        time_elapsed = current_time - self.last_time_update
-        
-        if time_elapsed >= 0.25:
-            self.fps_estimate = self.frame_count / time_elapsed
-            
-            self.remaining_time -= time_elapsed
-            
-            self.last_time_update = current_time
+        if self.fps_time >= 0.25:
+            self.fps_estimate = self.frame_count / self.fps_time
+            self.fps_time = 0.0
             self.frame_count = 0
-            
-            if self.remaining_time <= 0:
-                self.remaining_time = 0
-                self.handle_game_end(True)
+    
+    def update_time_remaining(self):
+        self.remaining_time -= self.tick_dt
+        
+        if self.remaining_time <= 0:
+            self.remaining_time = 0
+            self.handle_game_end(True)
     
     def add_time(self, seconds):
         self.remaining_time += seconds
@@ -684,62 +741,39 @@ class GameEngine:
         return all(crop.is_destroyed() for crop in self.crops)
     
     def create_smoke_particles(self, x, y, count=10):
-        for _ in range(count):
-            size = random.randint(5, 15)
-            life = random.randint(20, 40)
-            color = (random.randint(150, 200), random.randint(150, 200), random.randint(150, 200))
-            vel_x = random.uniform(-2, 2)
-            vel_y = random.uniform(-2, 2)
-            
-            self.smoke_particles.append({
-                'x': x,
-                'y': y,
-                'size': size,
-                'life': life,
-                'max_life': life,
-                'color': color,
-                'vel_x': vel_x,
-                'vel_y': vel_y
-            })
+        self.smoke_particles.emit(x, y, count)
     
     def update_smoke_particles(self):
-        for particle in self.smoke_particles[:]:
-            particle['life'] -= 1
-            
-            if particle['life'] <= 0:
-                self.smoke_particles.remove(particle)
-                continue
-                
-            particle['x'] += particle['vel_x']
-            particle['y'] += particle['vel_y']
-            
-            particle['vel_x'] *= 0.95
-            particle['vel_y'] *= 0.95
+        self.smoke_particles.update()
     
     def spawn_enemy(self, force=False):
-        current_time = time.time()
+        current_time = self.sim_time
         
         spawn_interval = max(
             self.min_enemy_spawn_interval,
             self.max_enemy_spawn_interval * (self.remaining_time / self.game_duration)
         )
         
-        if force or (current_time - self.last_enemy_spawn > random.uniform(spawn_interval * 0.8, spawn_interval * 1.2) 
+        if force or (current_time - self.last_enemy_spawn > self.rng.uniform(spawn_interval * 0.8, spawn_interval * 1.2) 
                      and len(self.enemies) < self.max_enemies):
             try:
-                enemy_img_path = random.choice(self.enemy_img_paths)
+                enemy_img_path = self.rng.choice(self.enemy_img_paths)
                 
-                target_type = "crop" if random.random() < self.crop_targeting_chance and self.are_any_crops_alive() else "farmer"
+                target_type = "crop" if self.rng.random() < self.crop_targeting_chance and self.are_any_crops_alive() else "farmer"
                 
-                enemy = Enemy(enemy_img_path, self.width, self.height, target_type)
+                enemy = self.enemy_pool.reuse_handle()
+                if enemy is None:
+                    enemy = Enemy(enemy_img_path, self.width, self.height, target_type,
+                                  pool=self.enemy_pool, rng=self.rng)
+                else:
+                    enemy.reset(enemy_img_path, self.width, self.height, target_type)
                 
                 if target_type == "crop" and self.are_any_crops_alive():
                     valid_crops = [crop for crop in self.crops if not crop.is_destroyed()]
                     if valid_crops:
-                        target_crop = random.choice(valid_crops)
+                        target_crop = self.rng.choice(valid_crops)
                         enemy.set_target_crop(target_crop)
                 
-                self.enemies.append(enemy)
                 self.last_enemy_spawn = current_time
             except Exception as e:
                 print(f"Error spawning enemy: {e}")
@@ -772,14 +806,8 @@ class GameEngine:
             if self.farmer.has_superpower:
                 bullet_color = (0, 0, 255)
                 
-            self.bullets.append({
-                'x': scaled_x, 
-                'y': scaled_y, 
-                'radius': 50,
-                'life': 10,
-                'color': bullet_color,
-                'is_superpower': self.farmer.has_superpower
-            })
+            self.bullets.append(self.bullet_pool.acquire(scaled_x, scaled_y, 50, 10, bullet_color,
+                                                         self.farmer.has_superpower))
             
             self.add_notification(f"Shoot!", bullet_color, 30, category="shoot")
             
@@ -789,7 +817,7 @@ class GameEngine:
     
     def use_superpower(self):
         try:
-            current_time = time.time()
+            current_time = self.sim_time
             if current_time - self.last_superpower_time > self.superpower_cooldown:
                 self.farmer.activate_superpower()
                 
@@ -808,68 +836,198 @@ class GameEngine:
             return False
     
     def add_notification(self, text, color, duration=90, category="default"):
-        for i, notification in enumerate(self.notifications):
-            if notification.get('category') == category and category != "default":
-                self.notifications[i] = {
-                    'text': text,
-                    'color': color,
-                    'timer': 0,
-                    'duration': duration,
-                    'category': category,
-                    'animation': 0
-                }
+        for notification in self.notifications:
+            if notification.category == category and category != "default":
+                notification.reset(text, color, duration, category)
                 return
                 
-        self.notifications.append({
-            'text': text,
-            'color': color,
-            'timer': 0,
-            'duration': duration,
-            'category': category,
-            'animation': 0
-        })
+        self.notifications.append(self.notification_pool.acquire(text, color, duration, category))
     
     def update_notifications(self):
-        for notification in self.notifications[:]:
-            notification['timer'] += 1
+        kept = 0
+        for notification in self.notifications:
+            notification.timer += 1
             
-            if notification['animation'] < 10:
-                notification['animation'] += 1
+            if notification.animation < 10:
+                notification.animation += 1
                 
-            if notification['timer'] >= notification['duration']:
-                self.notifications.remove(notification)
+            if notification.timer >= notification.duration:
+                self.notification_pool.release(notification)
+            else:
+                self.notifications[kept] = notification
+                kept += 1
+        del self.notifications[kept:]
                 
+    def check_crop_enemy_collisions(self):
+        """Each live enemy damages the first crop it touches, in enemy then crop order."""
+        if not len(self.enemies) or not self.crops:
+            return
+        
+        n = self.enemy_pool.count
+        enemy_x, enemy_y = self.enemy_pool.centers()
+        crop_x = np.array([crop.x + crop.width // 2 for crop in self.crops])
+        crop_y = np.array([crop.y + crop.height // 2 for crop in self.crops])
+        crop_half = np.array([crop.width // 2 for crop in self.crops])
+        destroyed = np.array([crop.is_destroyed() for crop in self.crops])
+        
+        # Contact distance depends on both sizes, so query with the widest enemy and filter exactly
+        max_reach = (self.enemy_pool.width[:n].max() // 2 + crop_half) * 0.6
+        crop_index, enemy_index = self.enemy_grid.query_pairs(crop_x, crop_y, max_reach)
+        dx = enemy_x[enemy_index] - crop_x[crop_index]
+        dy = enemy_y[enemy_index] - crop_y[crop_index]
+        reach = (self.enemy_pool.width[enemy_index] // 2 + crop_half[crop_index]) * 0.6
+        hit = ((dx * dx + dy * dy < reach * reach) & ~self.enemy_pool.is_dying[enemy_index] &
+               ~destroyed[crop_index])
+        enemy_index, crop_index = enemy_index[hit], crop_index[hit]
+        order = np.lexsort((crop_index, enemy_index))
+        
+        # Resolve in order: an earlier enemy can destroy a crop a later one was about to hit
+        for i, j in zip(enemy_index[order].tolist(), crop_index[order].tolist()):
+            enemy = self.enemies[i]
+            crop = self.crops[j]
+            if enemy.is_dying or crop.is_destroyed():
+                continue
+            
+            is_destroyed = crop.take_damage()
+            
+            crop_center_x = crop.x + crop.width // 2
+            crop_center_y = crop.y + crop.height // 2
+            self.create_smoke_particles(crop_center_x, crop_center_y, 10)
+            
+            enemy.start_death_animation()
+            
+            if is_destroyed:
+                self.add_notification("Crop destroyed!", (255, 0, 0), category="crop_status")
+            else:
+                self.add_notification(f"Crop damaged! Health: {crop.health}/{crop.max_health}", (255, 165, 0), category="crop_status")
+            
+            if self.are_all_crops_destroyed():
+                self.handle_game_end(False)
+    
     def check_farmer_enemy_collisions(self):
+        if not len(self.enemies):
+            return
+        
         farmer_center_x = self.farmer.x + self.farmer.width // 2
         farmer_center_y = self.farmer.y + self.farmer.height // 2
         
-        for enemy in self.enemies[:]:
-            if enemy.is_dying:
+        enemy_x, enemy_y = self.enemy_pool.centers()
+        _, hits = pairs_within(self.enemy_grid, enemy_x, enemy_y, farmer_center_x, farmer_center_y, 70)
+        
+        for i in hits[~self.enemy_pool.is_dying[hits]]:
+            enemy = self.enemies[i]
+            enemy.start_death_animation()
+            
+            self.create_smoke_particles(enemy_x[i], enemy_y[i], 15)
+            
+            self.score += 1
+            
+            self.add_notification("Enemy defeated!", (0, 255, 0), 60, category="enemy_hit")
+            
+            self.farmer.start_attack_animation()
+    
+    def check_bullet_enemy_collisions(self):
+        """Each bullet kills the first live enemy inside its radius; spent bullets are dropped."""
+        if not self.bullets:
+            return
+        
+        hit_enemy = np.full(len(self.bullets), -1)
+        if len(self.enemies):
+            enemy_x, enemy_y = self.enemy_pool.centers()
+            bullets, enemies = pairs_within(self.enemy_grid, enemy_x, enemy_y,
+                                            [bullet.x for bullet in self.bullets],
+                                            [bullet.y for bullet in self.bullets],
+                                            [bullet.radius for bullet in self.bullets])
+            hit_enemy = first_hits(bullets, enemies, len(self.bullets),
+                                   ~self.enemy_pool.is_dying[:self.enemy_pool.count])
+        
+        kept = 0
+        for bullet, i in zip(list(self.bullets), hit_enemy.tolist()):
+            if i < 0:
+                if bullet.life > 0:
+                    bullet.life -= 1
+                    self.bullets[kept] = bullet
+                    kept += 1
+                else:
+                    self.bullet_pool.release(bullet)
                 continue
-                
-            enemy_center_x = enemy.x + enemy.width // 2
-            enemy_center_y = enemy.y + enemy.height // 2
             
-            distance = np.sqrt((farmer_center_x - enemy_center_x)**2 + 
-                              (farmer_center_y - enemy_center_y)**2)
+            enemy = self.enemies[i]
+            enemy.start_hit_animation()
             
-            if distance < 70:
-                print(f"Farmer collided with enemy! Distance: {distance}")
-                
-                enemy.start_death_animation()
-                
-                self.create_smoke_particles(enemy_center_x, enemy_center_y, 15)
-                
-                self.score += 1
-                
-                self.add_notification("Enemy defeated!", (0, 255, 0), 60, category="enemy_hit")
-                
-                self.farmer.start_attack_animation()
+            enemy.start_death_animation()
+            
+            self.create_smoke_particles(bullet.x, bullet.y, 10)
+            
+            self.add_time(enemy.time_reward)
+            
+            points = 2 if bullet.is_superpower else 1
+            self.score += points
+            
+            if points > 1:
+                self.add_notification(f"+{points} points!", (0, 255, 0), 60, category="points")
+            else:
+                self.add_notification(f"Enemy hit!", (0, 255, 255), 30, category="enemy_hit")
+            
+            self.farmer.start_attack_animation()
+            self.bullet_pool.release(bullet)
+        
+        del self.bullets[kept:]
     
-    def update(self):
+    def update(self, now=None):
+        """Advance the game by the time since the last call, in fixed ticks.
+
+        At most `max_steps_per_update` ticks run per call; time beyond that
+        (a stalled camera, a debugger pause) is dropped rather than caught up.
+        The leftover fraction of a tick is kept in `render_alpha` so drawing
+        can interpolate between the last two ticks.
+        """
+        try:
+            if now is None:
+                now = self.clock()
+            if self.last_update_time is None:
+                self.last_update_time = now - self.tick_dt
+            elapsed = max(0.0, now - self.last_update_time)
+            self.last_update_time = now
+            self.update_fps_estimate(elapsed)
+            
+            if self.game_over:
+                return
+            
+            self.accumulator += elapsed
+            steps = 0
+            while self.accumulator >= self.tick_dt and steps < self.max_steps_per_update:
+                self.step()
+                self.accumulator -= self.tick_dt
+                steps += 1
+                if self.game_over:
+                    break
+            
+            if self.accumulator >= self.tick_dt:
+                self.dropped_ticks += int(self.accumulator / self.tick_dt)
+                self.accumulator %= self.tick_dt
+            self.render_alpha = 1.0 if self.game_over else self.accumulator / self.tick_dt
+        except Exception as e:
+            print(f"Error in update: {e}")
+            traceback.print_exc()
+    
+    def step(self):
+        """Run one fixed simulation tick.
+
+        Crop hits are checked against where enemies stand at the start of the
+        tick, before they move, so an enemy whose crop was just destroyed picks
+        a new target in the same tick's update. Farmer and bullet hits are
+        checked after the move, as they always were.
+        """
+        profile_depth = self.profiler.depth
         try:
             if self.game_over:
                 return
+            
+            self.ticks += 1
+            self.sim_time += self.tick_dt
+            self.farmer.save_previous_position()
+            self.enemy_pool.save_previous_positions()
                 
             self.update_time_remaining()
             
@@ -877,6 +1035,7 @@ class GameEngine:
                 self.handle_game_end(False)
                 return
             
+            self.profiler.push('update/entities')
             self.farmer.update()
             
             for crop in self.crops:
@@ -891,128 +1050,369 @@ class GameEngine:
             
             self.update_smoke_particles()
             
+            self.profiler.switch('update/spawn')
             self.spawn_enemy()
             
-            for enemy in self.enemies[:]:
-                enemy.update(self.farmer, self.crops)
-                
-                if not enemy.active:
-                    if not hasattr(enemy, 'scored') or not enemy.scored:
-                        self.score += 1
-                        enemy.scored = True
-                        print(f"Enemy removed, score increased to {self.score}")
-                        
-                    self.enemies.remove(enemy)
-                    continue
-                for crop in self.crops:
-                    if not crop.is_destroyed() and enemy.is_colliding_with_crop(crop):
-                        is_destroyed = crop.take_damage()
-                        
-                        crop_center_x = crop.x + crop.width // 2
-                        crop_center_y = crop.y + crop.height // 2
-                        self.create_smoke_particles(crop_center_x, crop_center_y, 10)
-                        
-                        enemy.start_death_animation()
-                        
-                        if is_destroyed:
-                            self.add_notification("Crop destroyed!", (255, 0, 0), category="crop_status")
-                        else:
-                            self.add_notification(f"Crop damaged! Health: {crop.health}/{crop.max_health}", (255, 165, 0), category="crop_status")
-                        
-                        if self.are_all_crops_destroyed():
-                            self.handle_game_end(False)
-                        
-                        break
+            self.profiler.switch('update/collisions')
+            self.enemy_grid.build(*self.enemy_pool.centers())
+            self.check_crop_enemy_collisions()
+            
+            self.profiler.switch('update/enemies')
+            self.enemy_pool.update(self.farmer, self.crops)
+            
+            for enemy in self.enemy_pool.remove_inactive():
+                if not enemy.scored:
+                    self.score += 1
+                    enemy.scored = True
+            
+            self.profiler.switch('update/collisions')
+            self.enemy_grid.build(*self.enemy_pool.centers())
             
             self.check_farmer_enemy_collisions()
             
-            for bullet in self.bullets[:]:
-                hit = False
-                for enemy in self.enemies[:]:
-                    if enemy.is_hit(bullet['x'], bullet['y'], bullet['radius']):
-                        if enemy in self.enemies:
-                            enemy.start_hit_animation()
-                            
-                            enemy.start_death_animation()
-                            
-                            self.create_smoke_particles(bullet['x'], bullet['y'], 10)
-                            
-                            self.add_time(enemy.time_reward)
-                            
-                            points = 2 if bullet.get('is_superpower', False) else 1
-                            self.score += points
-                            
-                            if points > 1:
-                                self.add_notification(f"+{points} points!", (0, 255, 0), 60, category="points")
-                            else:
-                                self.add_notification(f"Enemy hit!", (0, 255, 255), 30, category="enemy_hit")
-                            
-                            self.farmer.start_attack_animation()
-                            
-                            hit = True
-                            break
-                
-                if hit and bullet in self.bullets:
-                    self.bullets.remove(bullet)
-                elif bullet['life'] <= 0:
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
-                else:
-                    bullet['life'] -= 1
+            self.check_bullet_enemy_collisions()
+            self.profiler.pop()
                 
         except Exception as e:
-            print(f"Error in update: {e}")
+            print(f"Error in step: {e}")
             traceback.print_exc()
+            self.profiler.unwind(profile_depth)
     
     def draw_farmer(self, game_frame):
         try:
-            y1, y2 = int(self.farmer.y), int(self.farmer.y + self.farmer.height)
-            x1, x2 = int(self.farmer.x), int(self.farmer.x + self.farmer.width)
+            x1, y1 = self.farmer.render_position(self.render_alpha)
+            x2, y2 = x1 + self.farmer.width, y1 + self.farmer.height
             
             if x1 >= 0 and y1 >= 0 and x2 <= game_frame.shape[1] and y2 <= game_frame.shape[0]:
-                if self.farmer.img.shape[2] == 4:
-                    alpha_farmer = self.farmer.img[:, :, 3] / 255.0
-                    for c in range(0, 3):
-                        game_frame[y1:y2, x1:x2, c] = (
-                            (1 - alpha_farmer) * game_frame[y1:y2, x1:x2, c] + 
-                            alpha_farmer * self.farmer.img[:, :, c]
-                        )
-                else:
-                    game_frame[y1:y2, x1:x2] = self.farmer.img
+                blit(game_frame, self.farmer.sprite, x1, y1)
         except Exception as e:
             print(f"Error drawing farmer: {e}")
             traceback.print_exc()
     
+    def draw_crop_health_bar(self, img, crop):
+        health_x = int(crop.x) + (crop.width - HEALTH_BAR_WIDTH) // 2
+        health_y = int(crop.y) - 18
+        
+        # The table was built for the starting max_health; index by fraction so a changed max still fits
+        health_bars = crop.health_bars
+        health = min(max(crop.health, 0), crop.max_health)
+        index = round(health * (len(health_bars) - 1) / crop.max_health) if crop.max_health > 0 else 0
+        blit(img, health_bars[index], health_x - 2, health_y - 2)
+    
+    def build_static_layer(self, key=None):
+        img = self.background.copy() if self.background is not None else np.zeros((720, 1280, 3), dtype=np.uint8)
+        
+        self.draw_ui_panel(img, (0, self.height - 50), (self.width, 50), 
+                           color=(30, 80, 30), alpha=0.8, border_color=(40, 120, 40), border_size=2)
+        
+        return img
+    
+    def get_hud_state(self):
+        score_text = f"Score: {self.score}"
+        
+        minutes = int(self.remaining_time) // 60
+        seconds = int(self.remaining_time) % 60
+        time_text = f"Time: {minutes:02}:{seconds:02}"
+        time_level = 2 if self.remaining_time < 10 else 1 if self.remaining_time < 30 else 0
+        
+        alive_crops = sum(1 for crop in self.crops if not crop.is_destroyed())
+        crop_text = f"Crops: {alive_crops}/{len(self.crops)}"
+        
+        cooldown_remaining = max(0, self.superpower_cooldown - (self.sim_time - self.last_superpower_time))
+        
+        if self.farmer.has_superpower:
+            time_left = int((self.farmer.superpower_duration - self.farmer.superpower_timer) / self.tick_rate)
+            superpower_text = f"SUPERPOWER: {time_left}s"
+            color = (50, 50, 255)
+            panel_color = (30, 30, 150)
+            border_color = (80, 80, 255)
+        elif cooldown_remaining == 0:
+            superpower_text = "SUPERPOWER: READY!"
+            color = (50, 255, 50)
+            panel_color = (20, 120, 20)
+            border_color = (80, 255, 80)
+        else:
+            superpower_text = f"SUPERPOWER: {int(cooldown_remaining)}s"
+            color = (200, 150, 50)
+            panel_color = (100, 70, 20)
+            border_color = (200, 150, 50)
+        
+        border_pulses = cooldown_remaining == 0 and not self.farmer.has_superpower
+        
+        return (score_text, time_text, time_level, crop_text,
+                superpower_text, color, panel_color, border_color, border_pulses)
+    
+    def draw_hud(self, img, hud_state):
+        (score_text, time_text, time_level, crop_text,
+         superpower_text, color, panel_color, border_color, border_pulses) = hud_state
+        
+        ui_box_height = 50
+        
+        self.draw_ui_panel(img, 
+                          (0, 0), 
+                          (self.width, ui_box_height), 
+                          color=(40, 40, 60),
+                          alpha=0.85,
+                          border_color=(60, 60, 100),
+                          border_size=2)
+        
+        score_width = text_size(score_text, self.font, self.font_scale, self.font_thickness)[0][0]
+        score_panel_width = score_width + 30
+        
+        self.draw_ui_panel(img, 
+                          (10, 8), 
+                          (score_panel_width, 35), 
+                          color=(60, 60, 100),
+                          alpha=0.7,
+                          border_color=(100, 100, 180),
+                          border_size=1)
+                          
+        self.draw_pixelated_text(img, score_text, (25, 35), 
+                               (255, 255, 255), 0.9, 2)
+        
+        time_color = (255, 255, 255)  
+        if time_level == 2:  
+            time_color = (255, 50, 50)
+        elif time_level == 1:  
+            time_color = (255, 200, 50)
+            
+        time_width = text_size(time_text, self.font, self.font_scale, self.font_thickness)[0][0]
+        
+        time_panel_color = (80, 50, 50) if time_level == 2 else (70, 70, 100)
+        time_border_color = (180, 50, 50) if time_level == 2 else (100, 100, 180)
+        
+        self.draw_ui_panel(img, 
+                          (score_panel_width + 30, 8), 
+                          (time_width + 30, 35), 
+                          color=time_panel_color,
+                          alpha=0.7,
+                          border_color=time_border_color,
+                          border_size=1)
+        
+        self.draw_pixelated_text(img, time_text, (score_panel_width + 45, 35), 
+                                time_color, 0.9, 2)
+        
+        crop_width = text_size(crop_text, self.font, self.font_scale, self.font_thickness)[0][0]
+        
+        crop_panel_x = score_panel_width + time_width + 80
+        
+        self.draw_ui_panel(img, 
+                          (crop_panel_x, 8), 
+                          (crop_width + 30, 35), 
+                          color=(50, 80, 50),
+                          alpha=0.7,
+                          border_color=(80, 160, 80),
+                          border_size=1)
+                          
+        self.draw_pixelated_text(img, crop_text, (crop_panel_x + 15, 35), 
+                               (180, 255, 180), 0.9, 2)
+        
+        superpower_width = text_size(superpower_text, self.font, self.font_scale, self.font_thickness)[0][0]
+        self.superpower_panel_rect = (self.width - superpower_width - 40, 8, superpower_width + 30, 35)
+        
+        # A pulsing border changes every frame, so it is drawn per frame on top of the cached HUD
+        self.draw_ui_panel(img, 
+                          (self.width - superpower_width - 40, 8), 
+                          (superpower_width + 30, 35), 
+                          color=panel_color,
+                          alpha=0.7,
+                          border_color=None if border_pulses else border_color,
+                          border_size=2)
+                          
+        self.draw_pixelated_text(img, superpower_text, (self.width - superpower_width - 25, 35), 
+                               color, 0.9, 2)
+        
+        return img
+    
+    def build_hud_layer(self, hud_state):
+        return render_overlay(lambda canvas: self.draw_hud(canvas, hud_state), self.width, self.hud_height)
+    
+    def begin_dirty_frame(self):
+        static = self.static_layer.get()
+        
+        if (self.frame_buffer is None or self.frame_buffer.shape != static.shape or
+                self.static_layer_version != self.static_layer.rebuilds):
+            self.frame_buffer = static.copy()
+            self.static_layer_version = self.static_layer.rebuilds
+            self.prev_frame_rects = [(0, 0, self.width, self.height)]
+        else:
+            for x1, y1, x2, y2 in self.prev_frame_rects:
+                self.frame_buffer[y1:y2, x1:x2] = static[y1:y2, x1:x2]
+        
+        self.frame_rects = []
+        return self.frame_buffer
+    
+    def end_dirty_frame(self, game_frame):
+        current_rects = []
+        for x1, y1, x2, y2 in self.frame_rects:
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(self.width, x2), min(self.height, y2)
+            if x1 < x2 and y1 < y2:
+                current_rects.append((x1, y1, x2, y2))
+        
+        touched_rects = self.prev_frame_rects + current_rects
+        
+        # Coverage is measured on an 8x8 tile grid, which is cheap and close enough for a counter
+        tiles = np.zeros(((self.height + 7) // 8, (self.width + 7) // 8), dtype=bool)
+        for x1, y1, x2, y2 in touched_rects:
+            tiles[y1 // 8:(y2 + 7) // 8, x1 // 8:(x2 + 7) // 8] = True
+        self.dirty_stats = {'rects': len(touched_rects), 'pixel_fraction': float(tiles.mean())}
+        
+        self.frame_rects = None
+        self.prev_frame_rects = current_rects
+        
+        if self.show_dirty_rects:
+            game_frame = game_frame.copy()
+            for x1, y1, x2, y2 in touched_rects:
+                cv2.rectangle(game_frame, (x1, y1), (x2 - 1, y2 - 1), (255, 0, 255), 1)
+            self.draw_pixelated_text(game_frame, f"Dirty: {self.dirty_stats['pixel_fraction'] * 100:.1f}% "
+                                     f"({self.dirty_stats['rects']} rects)",
+                                     (20, self.height - 70), (255, 0, 255), 0.6, 1)
+        
+        return game_frame
+    
+    def end_screen_panel_rect(self):
+        panel_width = 600
+        panel_height = 300
+        return (self.width - panel_width) // 2, (self.height - panel_height) // 2, panel_width, panel_height
+    
+    def end_screen_instruction_pos(self):
+        panel_x, panel_y, panel_width, panel_height = self.end_screen_panel_rect()
+        instruction_width = text_size(END_SCREEN_INSTRUCTION, self.font, 1, 2)[0][0]
+        return panel_x + (panel_width - instruction_width) // 2, panel_y + panel_height - 40, instruction_width
+    
+    def draw_end_screen(self, game_frame):
+        """Dim the frame and draw the parts of the game-over screen that do not animate."""
+        cv2.convertScaleAbs(game_frame, game_frame, 0.3)
+        
+        panel_x, panel_y, panel_width, panel_height = self.end_screen_panel_rect()
+        panel_color = (0, 70, 0) if self.game_won else (70, 0, 0)
+        
+        self.draw_ui_panel(game_frame, 
+                          (panel_x, panel_y), 
+                          (panel_width, panel_height), 
+                          color=panel_color, 
+                          alpha=0.85,
+                          border_size=4,
+                          cached=True)
+        
+        if self.game_won:
+            self.draw_pixelated_text(game_frame, 
+                                   "VICTORY!", 
+                                   (panel_x + panel_width//2 - 120, panel_y + 80), 
+                                   (100, 255, 100), 2, 5)
+            
+            self.draw_pixelated_text(game_frame, 
+                                   f"Final Score: {self.score}", 
+                                   (panel_x + panel_width//2 - 120, panel_y + 150), 
+                                   (255, 255, 255), 1, 2)
+            
+            surviving_crops = sum(1 for crop in self.crops if not crop.is_destroyed())
+            self.draw_pixelated_text(game_frame, 
+                                   f"Crops Saved: {surviving_crops}/{len(self.crops)}", 
+                                   (panel_x + panel_width//2 - 140, panel_y + 190), 
+                                   (100, 255, 255), 1, 2)
+        else:
+            self.draw_pixelated_text(game_frame, 
+                                   "GAME OVER!", 
+                                   (panel_x + panel_width//2 - 140, panel_y + 80), 
+                                   (255, 100, 100), 2, 5)
+            self.draw_pixelated_text(game_frame, 
+                                   f"Final Score: {self.score}", 
+                                   (panel_x + panel_width//2 - 120, panel_y + 150), 
+                                   (255, 255, 255), 1, 2)
+        
+        instruction_x, instruction_y, instruction_width = self.end_screen_instruction_pos()
+        self.draw_ui_panel(game_frame, 
+                         (instruction_x - 20, instruction_y - 30), 
+                         (instruction_width + 40, 40), 
+                         color=(60, 60, 60), 
+                         alpha=0.7, 
+                         border_color=(150, 150, 150), 
+                         border_size=1,
+                         cached=True)
+        
+        return game_frame
+    
+    def draw_end_screen_animation(self, game_frame):
+        """Draw the pulsing panel border and the blinking restart instruction."""
+        panel_x, panel_y, panel_width, panel_height = self.end_screen_panel_rect()
+        border_color = (0, 200, 0) if self.game_won else (200, 0, 0)
+        
+        pulse = abs(math.sin(self.clock() * 2)) * 0.5 + 0.5
+        adjusted_border = tuple([int(c * pulse + c * (1-pulse) * 0.5) for c in border_color])
+        
+        cv2.rectangle(game_frame, 
+                     (panel_x, panel_y), 
+                     (panel_x + panel_width, panel_y + panel_height),
+                     adjusted_border, 4)
+        
+        cv2.rectangle(game_frame, 
+                     (panel_x + 10, panel_y + 10), 
+                     (panel_x + panel_width - 10, panel_y + panel_height - 10),
+                     adjusted_border, 1)
+        
+        blink_effect = 0.7 + 0.3 * math.sin(self.clock() * 4)
+        instruction_color = (int(255 * blink_effect), int(255 * blink_effect), int(255 * blink_effect))
+        
+        instruction_x, instruction_y, _ = self.end_screen_instruction_pos()
+        self.draw_pixelated_text(game_frame, 
+                               END_SCREEN_INSTRUCTION, 
+                               (instruction_x, instruction_y), 
+                               instruction_color, 1, 2)
+        
+        return game_frame
+    
+    def render_end_screen(self):
+        """Game-over frames after the first: restore the panel area from the cached end screen and animate it."""
+        self.profiler.push('render/background')
+        if self.frame_buffer is None or self.frame_buffer.shape != self.end_screen.shape:
+            self.frame_buffer = self.end_screen.copy()
+        else:
+            # The animated elements all sit inside the panel, border included
+            panel_x, panel_y, panel_width, panel_height = self.end_screen_panel_rect()
+            x1, y1 = max(0, panel_x - 4), max(0, panel_y - 4)
+            x2, y2 = panel_x + panel_width + 5, panel_y + panel_height + 5
+            self.frame_buffer[y1:y2, x1:x2] = self.end_screen[y1:y2, x1:x2]
+        
+        self.profiler.switch('render/hud')
+        self.draw_end_screen_animation(self.frame_buffer)
+        self.profiler.pop()
+        return self.frame_buffer
+    
     def render_game_only(self):
+        profile_depth = self.profiler.depth
         try:
-            game_frame = self.background.copy() if self.background is not None else np.zeros((720, 1280, 3), dtype=np.uint8)
-            
-            self.draw_ui_panel(game_frame, (0, self.height - 50), (self.width, 50), 
-                               color=(30, 80, 30), alpha=0.8, border_color=(40, 120, 40), border_size=2)
+            if self.game_over and self.end_screen is not None:
+                return self.render_end_screen()
+            
+            self.end_screen = None
+            self.profiler.push('render/background')
+            dirty_frame = self.dirty_rect_mode and not self.game_over
+            if dirty_frame:
+                game_frame = self.begin_dirty_frame()
+            else:
+                game_frame = self.static_layer.get().copy()
+                self.frame_buffer = None
             
+            self.profiler.switch('render/effects')
             if self.superpower_active:
                 self.draw_ui_panel(game_frame, (self.width // 2 - 260, 50), (520, 60), 
-                                  color=(0, 0, 100), alpha=0.7, border_color=(0, 0, 255), border_size=3)
+                                  color=(0, 0, 100), alpha=0.7, border_color=(0, 0, 255), border_size=3, cached=True)
                 
                 self.draw_pixelated_text(game_frame, "SUPERPOWER ACTIVATED!", 
                                        (self.width // 2 - 250, 100), (0, 140, 255), 1.5, 3)
             
             for bullet in self.bullets:
-                cv2.circle(game_frame, (int(bullet['x']), int(bullet['y'])), 
-                          bullet['radius'], bullet.get('color', (0, 255, 255)), -1)
-            
-            for particle in self.smoke_particles:
-                alpha = particle['life'] / particle['max_life']
-                size = int(particle['size'] * alpha)
-                alpha = particle['life'] / particle['max_life']
-                size = int(particle['size'] * alpha)
-                
-                cv2.circle(game_frame, 
-                          (int(particle['x']), int(particle['y'])), 
-                          size, 
-                          particle['color'], 
-                          -1)
+                bx, by, radius = int(bullet.x), int(bullet.y), bullet.radius
+                self.mark_dirty(bx - radius - 1, by - radius - 1, bx + radius + 2, by + radius + 2)
+                cv2.circle(game_frame, (bx, by), radius, bullet.color, -1)
+            
+            if self.frame_rects is not None:
+                self.mark_dirty_rects(self.smoke_particles.dirty_rects())
+            self.smoke_particles.draw(game_frame)
             
+            self.profiler.switch('render/sprites')
             for crop in self.crops:
                 if crop.is_destroyed():
                     continue
@@ -1021,55 +1421,20 @@ class GameEngine:
                 x1, x2 = int(crop.x), int(crop.x + crop.width)
                 
                 if crop.is_targeted:
-                    pulse_size = 5 + int(3 * math.sin(crop.target_pulse * 0.2))
-                    cv2.circle(game_frame,
-                              (x1 + crop.width // 2, y1 + crop.height // 2),
-                              crop.width // 2 + pulse_size,
-                              (0, 0, 255),
-                              2)
+                    ring = crop.target_rings[crop.target_pulse]
+                    rx = x1 + crop.width // 2 - ring.width // 2
+                    ry = y1 + crop.height // 2 - ring.height // 2
+                    self.mark_dirty(rx, ry, rx + ring.width, ry + ring.height)
+                    blit(game_frame, ring, rx, ry)
                 
-                if crop.img.shape[2] == 4:
-                    alpha_crop = crop.img[:, :, 3] / 255.0
-                    for c in range(0, 3):
-                        game_frame[y1:y2, x1:x2, c] = (
-                            (1 - alpha_crop) * game_frame[y1:y2, x1:x2, c] + 
-                            alpha_crop * crop.img[:, :, c]
-                        )
-                else:
-                    game_frame[y1:y2, x1:x2] = crop.img
-                
-                health_width = 60
-                health_height = 10
-                health_x = x1 + (crop.width - health_width) // 2
-                health_y = y1 - 18
-                
-                cv2.rectangle(game_frame,
-                             (health_x-2, health_y-2),
-                             (health_x + health_width+2, health_y + health_height+2),
-                             (20, 20, 20),
-                             -1)
-                cv2.rectangle(game_frame,
-                             (health_x, health_y),
-                             (health_x + health_width, health_y + health_height),
-                             (50, 50, 50),
-                             -1)
-                             
-                current_health_width = int((crop.health / crop.max_health) * health_width)
-                health_color = crop.get_health_color()
-                
-                for i in range(health_height):
-                    bar_color = list(health_color)
-                    brightness_factor = 1.3 - (i / health_height)
-                    bar_color = [min(255, int(c * brightness_factor)) for c in bar_color]
-                    
-                    cv2.line(game_frame,
-                            (health_x, health_y + i),
-                            (health_x + current_health_width, health_y + i),
-                            tuple(bar_color),
-                            1)
+                # Crops go over bullets, smoke and their targeting ring, so they are not baked into the static layer
+                self.mark_dirty(x1 - 10, y1 - 20, x2 + 10, y2 + 1)
+                blit(game_frame, crop.sprite, x1, y1)
+                self.draw_crop_health_bar(game_frame, crop)
                              
                 if crop.is_being_hit:
                     if crop.hit_timer % 3 < 2:
+                        self.mark_dirty(x1 - 2, y1 - 2, x2 + 3, y2 + 3)
                         cv2.rectangle(game_frame,
                                     (x1, y1),
                                     (x2, y2),
@@ -1081,6 +1446,10 @@ class GameEngine:
                     continue
                 
                 if len(enemy.trail_positions) >= 2:
+                    trail_xs = [p[0] for p in enemy.trail_positions]
+                    trail_ys = [p[1] for p in enemy.trail_positions]
+                    self.mark_dirty(min(trail_xs) - 3, min(trail_ys) - 3, max(trail_xs) + 4, max(trail_ys) + 4)
+                    
                     for i in range(len(enemy.trail_positions) - 1):
                         p1 = enemy.trail_positions[i]
                         p2 = enemy.trail_positions[i + 1]
@@ -1090,188 +1459,50 @@ class GameEngine:
                         
                         cv2.line(game_frame, p1, p2, (50, 100, 255), thickness)
                 
-                if enemy.is_being_hit:
-                    if enemy.hit_timer % 2 == 0:
-                        hit_img = enemy.img.copy()
-                        hit_img[:, :, 0:3] = 255
-                        img_to_draw = hit_img
-                    else:
-                        img_to_draw = enemy.img
-                elif enemy.is_dying:
-                    img_to_draw = enemy.img.copy()
-                    alpha_mult = 1.0 - (enemy.death_timer / enemy.death_duration)
-                    img_to_draw[:, :, 3] = (img_to_draw[:, :, 3] * alpha_mult).astype(np.uint8)
+                if enemy.is_being_hit and enemy.hit_timer % 2 == 0:
+                    sprite_to_draw = enemy.sprite.flash()
+                elif enemy.is_dying and not enemy.is_being_hit:
+                    fade_sprites = enemy.sprite.fade_frames(enemy.death_duration)
+                    sprite_to_draw = fade_sprites[min(int(enemy.death_timer), len(fade_sprites) - 1)]
                 else:
-                    img_to_draw = enemy.img
-                
-                y1, y2 = int(enemy.y), int(enemy.y + enemy.height)
-                x1, x2 = int(enemy.x), int(enemy.x + enemy.width)
-                
-                if x1 < 0: x1 = 0
-                if y1 < 0: y1 = 0
-                if x2 > game_frame.shape[1]: x2 = game_frame.shape[1]
-                if y2 > game_frame.shape[0]: y2 = game_frame.shape[0]
-                
-                if x1 >= x2 or y1 >= y2:
-                    continue
-                    
-                crop_width = x2 - x1
-                crop_height = y2 - y1
-                
-                crop_x1 = 0 if x1 >= 0 else -x1
-                crop_y1 = 0 if y1 >= 0 else -y1
-                crop_x2 = img_to_draw.shape[1] if x2 <= game_frame.shape[1] else img_to_draw.shape[1] - (x2 - game_frame.shape[1])
-                crop_y2 = img_to_draw.shape[0] if y2 <= game_frame.shape[0] else img_to_draw.shape[0] - (y2 - game_frame.shape[0])
-                
-                if crop_x1 >= crop_x2 or crop_y1 >= crop_y2:
-                    continue
-                
-                target_height = y2 - y1
-                target_width = x2 - x1
-                crop_height = crop_y2 - crop_y1
-                crop_width = crop_x2 - crop_x1
-                
-                if crop_height != target_height or crop_width != target_width:
-                    crop_y2 = min(crop_y2, crop_y1 + target_height)
-                    crop_x2 = min(crop_x2, crop_x1 + target_width)
-                    y2 = min(y2, y1 + (crop_y2 - crop_y1))
-                    x2 = min(x2, x1 + (crop_x2 - crop_x1))
-                
-                if crop_y2 <= crop_y1 or crop_x2 <= crop_x1 or y2 <= y1 or x2 <= x1:
-                    continue
+                    sprite_to_draw = enemy.sprite
                 
                 try:
-                    cropped_enemy = img_to_draw[crop_y1:crop_y2, crop_x1:crop_x2]
-                    
-                    if cropped_enemy.shape[0] == 0 or cropped_enemy.shape[1] == 0:
-                        continue
-                    
-                    if cropped_enemy.shape[2] == 4:
-                        alpha = cropped_enemy[:, :, 3] / 255.0
-                        for c in range(0, 3):
-                            game_frame[y1:y2, x1:x2, c] = (
-                                (1 - alpha) * game_frame[y1:y2, x1:x2, c] + 
-                                alpha * cropped_enemy[:, :, c]
-                            )
-                    else:
-                        game_frame[y1:y2, x1:x2] = cropped_enemy[:, :, :3]
+                    enemy_x, enemy_y = enemy.render_position(self.render_alpha)
+                    self.mark_dirty(enemy_x, enemy_y, enemy_x + enemy.width + 1, enemy_y + enemy.height + 1)
+                    blit(game_frame, sprite_to_draw, enemy_x, enemy_y)
                 except Exception as e:
                     print(f"Error rendering enemy: {e}")
                     continue
             
+            farmer_x, farmer_y = self.farmer.render_position(self.render_alpha)
+            farmer_center_x = farmer_x + self.farmer.width//2
+            farmer_center_y = farmer_y + self.farmer.height//2
             if self.farmer.is_attacking:
+                self.mark_dirty(farmer_center_x - 63, farmer_center_y - 63, farmer_center_x + 64, farmer_center_y + 64)
                 cv2.circle(game_frame, 
-                          (int(self.farmer.x + self.farmer.width//2), 
-                           int(self.farmer.y + self.farmer.height//2)), 
+                          (farmer_center_x, 
+                           farmer_center_y), 
                           60, (0, 255, 255), 2)
+            self.mark_dirty(farmer_x, farmer_y, farmer_x + self.farmer.width + 1, farmer_y + self.farmer.height + 1)
             self.draw_farmer(game_frame)
             
-            ui_box_height = 50
-            
-            self.draw_ui_panel(game_frame, 
-                              (0, 0), 
-                              (self.width, ui_box_height), 
-                              color=(40, 40, 60),
-                              alpha=0.85,
-                              border_color=(60, 60, 100),
-                              border_size=2)
-            
-            score_text = f"Score: {self.score}"
-            score_width = cv2.getTextSize(score_text, self.font, self.font_scale, self.font_thickness)[0][0]
-            score_panel_width = score_width + 30
-            
-            self.draw_ui_panel(game_frame, 
-                              (10, 8), 
-                              (score_panel_width, 35), 
-                              color=(60, 60, 100),
-                              alpha=0.7,
-                              border_color=(100, 100, 180),
-                              border_size=1)
-                              
-            self.draw_pixelated_text(game_frame, score_text, (25, 35), 
-                                   (255, 255, 255), 0.9, 2)
-            
-            minutes = int(self.remaining_time) // 60
-            seconds = int(self.remaining_time) % 60
-            time_color = (255, 255, 255)  
-            if self.remaining_time < 10:  
-                time_color = (255, 50, 50)
-            elif self.remaining_time < 30:  
-                time_color = (255, 200, 50)
-                
-            time_text = f"Time: {minutes:02}:{seconds:02}"
-            time_width = cv2.getTextSize(time_text, self.font, self.font_scale, self.font_thickness)[0][0]
-            
-            time_panel_color = (80, 50, 50) if self.remaining_time < 10 else (70, 70, 100)
-            time_border_color = (180, 50, 50) if self.remaining_time < 10 else (100, 100, 180)
-            
-            self.draw_ui_panel(game_frame, 
-                              (score_panel_width + 30, 8), 
-                              (time_width + 30, 35), 
-                              color=time_panel_color,
-                              alpha=0.7,
-                              border_color=time_border_color,
-                              border_size=1)
-            
-            self.draw_pixelated_text(game_frame, time_text, (score_panel_width + 45, 35), 
-                                    time_color, 0.9, 2)
-            
-            alive_crops = sum(1 for crop in self.crops if not crop.is_destroyed())
-            crop_text = f"Crops: {alive_crops}/{len(self.crops)}"
-            crop_width = cv2.getTextSize(crop_text, self.font, self.font_scale, self.font_thickness)[0][0]
-            
-            crop_panel_x = score_panel_width + time_width + 80
-            
-            self.draw_ui_panel(game_frame, 
-                              (crop_panel_x, 8), 
-                              (crop_width + 30, 35), 
-                              color=(50, 80, 50),
-                              alpha=0.7,
-                              border_color=(80, 160, 80),
-                              border_size=1)
-                              
-            self.draw_pixelated_text(game_frame, crop_text, (crop_panel_x + 15, 35), 
-                                   (180, 255, 180), 0.9, 2)
-            
-            cooldown_remaining = max(0, self.superpower_cooldown - (time.time() - self.last_superpower_time))
-            
-            if self.farmer.has_superpower:
-                time_left = int((self.farmer.superpower_duration - self.farmer.superpower_timer) / 30)
-                superpower_text = f"SUPERPOWER: {time_left}s"
-                color = (50, 50, 255)
-                panel_color = (30, 30, 150)
-                border_color = (80, 80, 255)
-            elif cooldown_remaining == 0:
-                superpower_text = "SUPERPOWER: READY!"
-                color = (50, 255, 50)
-                panel_color = (20, 120, 20)
-                border_color = (80, 255, 80)
-            else:
-                superpower_text = f"SUPERPOWER: {int(cooldown_remaining)}s"
-                color = (200, 150, 50)
-                panel_color = (100, 70, 20)
-                border_color = (200, 150, 50)
+            self.profiler.switch('render/hud')
+            hud_state = self.get_hud_state()
+            self.mark_dirty(0, 0, self.width, self.hud_height)
+            blit(game_frame, self.hud_layer.get(hud_state), 0, 0)
             
-            if cooldown_remaining == 0 and not self.farmer.has_superpower:
-                pulse = abs(math.sin(time.time() * 5)) * 0.5 + 0.5
+            if hud_state[-1]:
+                border_color = hud_state[-2]
+                pulse = abs(math.sin(self.clock() * 5)) * 0.5 + 0.5
                 border_color = tuple([int(c * pulse + c * (1-pulse) * 0.5) for c in border_color])
-            
-            superpower_width = cv2.getTextSize(superpower_text, self.font, self.font_scale, self.font_thickness)[0][0]
-            
-            self.draw_ui_panel(game_frame, 
-                              (self.width - superpower_width - 40, 8), 
-                              (superpower_width + 30, 35), 
-                              color=panel_color,
-                              alpha=0.7,
-                              border_color=border_color,
-                              border_size=2)
-                              
-            self.draw_pixelated_text(game_frame, superpower_text, (self.width - superpower_width - 25, 35), 
-                                   color, 0.9, 2)
+                
+                x, y, w, h = self.superpower_panel_rect
+                cv2.rectangle(game_frame, (x, y), (x + w, y + h), border_color, 2)
             
             notification_groups = {}
             for notification in self.notifications:
-                category = notification.get('category', 'default')
+                category = notification.category
                 if category not in notification_groups:
                     notification_groups[category] = []
                 notification_groups[category].append(notification)
@@ -1297,19 +1528,18 @@ class GameEngine:
                 
                 for notification in notifications:
                     fade = 1.0
-                    if notification['timer'] > notification['duration'] * 0.7:
-                        fade = 1.0 - ((notification['timer'] - notification['duration'] * 0.7) / (notification['duration'] * 0.3))
+                    if notification.timer > notification.duration * 0.7:
+                        fade = 1.0 - ((notification.timer - notification.duration * 0.7) / (notification.duration * 0.3))
                     
                     anim_offset = 0
-                    if notification['animation'] < 10:
-                        anim_offset = 50 - (notification['animation'] * 5)
+                    if notification.animation < 10:
+                        anim_offset = 50 - (notification.animation * 5)
                     
-                    color = notification['color']
+                    color = notification.color
                     color = tuple([int(c * fade) for c in color])
                     
-                    text = notification['text']
-                    text_size = cv2.getTextSize(text, self.font, 1, 2)[0]
-                    text_width, text_height = text_size
+                    text = notification.text
+                    text_width, text_height = text_size(text, self.font, 1, 2)[0]
                     
                     text_x = base_x - (text_width // 2) + anim_offset
                     
@@ -1328,101 +1558,37 @@ class GameEngine:
                                      border_color=color,
                                      border_size=2)
                     
+                    # Keyed on the base colour so every fade step reuses one cached label
                     self.draw_pixelated_text(game_frame, 
                                           text, 
                                           (text_x, notification_y), 
-                                          color, 
+                                          notification.color, 
                                           1, 
-                                          2)
+                                          2,
+                                          opacity=fade)
                     
                     notification_y += panel_height + 5
             
             if self.game_over:
-                overlay = game_frame.copy()
-                cv2.rectangle(overlay, (0, 0), (self.width, self.height), (0, 0, 0), -1)
-                cv2.addWeighted(overlay, 0.7, game_frame, 0.3, 0, game_frame)
-                
-                panel_width = 600
-                panel_height = 300
-                panel_x = (self.width - panel_width) // 2
-                panel_y = (self.height - panel_height) // 2
-                
-                if self.game_won:
-                    panel_color = (0, 70, 0)
-                    border_color = (0, 200, 0)
-                    title_color = (100, 255, 100)
-                else:
-                    panel_color = (70, 0, 0)
-                    border_color = (200, 0, 0)
-                    title_color = (255, 100, 100)
-                
-                pulse = abs(math.sin(time.time() * 2)) * 0.5 + 0.5
-                adjusted_border = tuple([int(c * pulse + c * (1-pulse) * 0.5) for c in border_color])
-                
-                self.draw_ui_panel(game_frame, 
-                                  (panel_x, panel_y), 
-                                  (panel_width, panel_height), 
-                                  color=panel_color, 
-                                  alpha=0.85,
-                                  border_color=adjusted_border, 
-                                  border_size=4)
-                
-                cv2.rectangle(game_frame, 
-                             (panel_x + 10, panel_y + 10), 
-                             (panel_x + panel_width - 10, panel_y + panel_height - 10),
-                             adjusted_border, 1)
-                
-                if self.game_won:
-                    self.draw_pixelated_text(game_frame, 
-                                           "VICTORY!", 
-                                           (panel_x + panel_width//2 - 120, panel_y + 80), 
-                                           title_color, 2, 5)
-                    
-                    self.draw_pixelated_text(game_frame, 
-                                           f"Final Score: {self.score}", 
-                                           (panel_x + panel_width//2 - 120, panel_y + 150), 
-                                           (255, 255, 255), 1, 2)
-                    
-                    surviving_crops = sum(1 for crop in self.crops if not crop.is_destroyed())
-                    self.draw_pixelated_text(game_frame, 
-                                           f"Crops Saved: {surviving_crops}/{len(self.crops)}", 
-                                           (panel_x + panel_width//2 - 140, panel_y + 190), 
-                                           (100, 255, 255), 1, 2)
-                else:
-                    self.draw_pixelated_text(game_frame, 
-                                           "GAME OVER!", 
-                                           (panel_x + panel_width//2 - 140, panel_y + 80), 
-                                           title_color, 2, 5)
-                    self.draw_pixelated_text(game_frame, 
-                                           f"Final Score: {self.score}", 
-                                           (panel_x + panel_width//2 - 120, panel_y + 150), 
-                                           (255, 255, 255), 1, 2)
-                instruction_text = "Press 'r' to Restart or 'q' to Quit"
-                blink_effect = 0.7 + 0.3 * math.sin(time.time() * 4)
-                instruction_color = (int(255 * blink_effect), int(255 * blink_effect), int(255 * blink_effect))
-    
-                instruction_width = cv2.getTextSize(instruction_text, self.font, 1, 2)[0][0]
-                instruction_x = panel_x + (panel_width - instruction_width) // 2
-                instruction_y = panel_y + panel_height - 40
-                
-                self.draw_ui_panel(game_frame, 
-                                 (instruction_x - 20, instruction_y - 30), 
-                                 (instruction_width + 40, 40), 
-                                 color=(60, 60, 60), 
-                                 alpha=0.7, 
-                                 border_color=(150, 150, 150), 
-                                 border_size=1)
-                                 
-                self.draw_pixelated_text(game_frame, 
-                                       instruction_text, 
-                                       (instruction_x, instruction_y), 
-                                       instruction_color, 1, 2)
+                self.draw_end_screen(game_frame)
+                # Nothing under the end screen moves any more, so later frames start from this image
+                self.end_screen = game_frame.copy()
+                self.end_screen.setflags(write=False)
+                self.draw_end_screen_animation(game_frame)
+            
+            self.profiler.switch('render/present')
+            if dirty_frame:
+                game_frame = self.end_dirty_frame(game_frame)
+            self.profiler.pop()
             
             return game_frame
             
         except Exception as e:
             print(f"Error in render_game_only: {e}")
             traceback.print_exc()
+            self.profiler.unwind(profile_depth)
+            self.frame_buffer = None
+            self.frame_rects = None
             error_frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
             cv2.putText(error_frame, "Rendering Error", (self.width // 2 - 100, self.height // 2), 
                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
@@ -0,0 +1,63 @@
+import math
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+THUMB_IP, THUMB_TIP = 3, 4
+INDEX_TIP = 8
+
+# Finger tips are landmarks 8, 12, 16, 20 and their PIP joints 6, 10, 14, 18;
+# the palm is the wrist plus the MCP joints 5, 9, 13, 17
+FINGER_TIPS = (8, 12, 16, 20)
+PALM = (WRIST, 5, 9, 13, 17)
+
+# Same pairs as mediapipe.solutions.hands.HAND_CONNECTIONS, for drawing without MediaPipe
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+def empty_landmarks():
+    landmarks = np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)
+    landmarks.setflags(write=False)
+    return landmarks
+
+def landmarks_to_array(multi_hand_landmarks):
+    """Convert MediaPipe hand landmark lists to a normalized (hands, 21, 3) float32 array."""
+    if not multi_hand_landmarks:
+        return np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)
+
+    flat = [v for hand in multi_hand_landmarks for lm in hand.landmark for v in (lm.x, lm.y, lm.z)]
+    # Python floats are doubles: building a float64 array and casting once is cheaper than per-item float32 conversion
+    return np.array(flat).astype(np.float32).reshape(-1, NUM_LANDMARKS, 3)
+
+def to_pixels(landmarks, width, height):
+    """Scale normalized landmarks to image pixels as a new read-only array.
+
+    z is scaled by the image width, which is the scale MediaPipe uses for depth.
+    """
+    pixels = landmarks * np.array([width, height, width], dtype=np.float32)
+    pixels.setflags(write=False)
+    return pixels
+
+def hand_metrics(landmarks):
+    """Finger counts, pinch distances, pinch centres and palm centres, one entry per hand.
+
+    `landmarks` is a (hands, 21, 3) pixel array. With one or two hands NumPy call
+    overhead would outweigh the arithmetic, so the metrics are computed per hand
+    on `landmarks.tolist()` and packed into one array at the end.
+    """
+    rows = []
+    for hand in landmarks.tolist():
+        (thumb_x, thumb_y, _), (index_x, index_y, _) = hand[THUMB_TIP], hand[INDEX_TIP]
+        fingers = (thumb_x < hand[THUMB_IP][0]) + sum(hand[tip][1] < hand[tip - 2][1] for tip in FINGER_TIPS)
+        rows.append((fingers,
+                     math.hypot(thumb_x - index_x, thumb_y - index_y),
+                     (thumb_x + index_x) * 0.5, (thumb_y + index_y) * 0.5,
+                     sum(hand[i][0] for i in PALM) * 0.2,
+                     sum(hand[i][1] for i in PALM) * 0.2))
+    metrics = np.array(rows, dtype=np.float32).reshape(-1, 6)
+    return metrics[:, 0].astype(np.int32), metrics[:, 1], metrics[:, 2:4], metrics[:, 4:6]
@@ -1,11 +1,24 @@
 import cv2
-import mediapipe as mp
-import math
+import numpy as np
 import time
 import traceback
+from collections import namedtuple
+from utils import gesture_math
+from utils.inference_worker import HandInferenceWorker
+
+# Everything the game needs from one camera frame, computed once by HandTracker.process.
+# landmarks is a read-only (hands, 21, 3) float32 array in image pixels; finger_counts,
+# pinch_distances and palm_centers cover every hand, the scalar fields the first hand.
+HandFrameResult = namedtuple('HandFrameResult', [
+    'hand_detected', 'landmarks', 'finger_counts', 'pinch_distances', 'palm_centers',
+    'fingers_up', 'is_pinching', 'pinch_distance', 'pinch_center', 'gesture',
+    'frame_id', 'age', 'fps'
+], defaults=(False, gesture_math.empty_landmarks(), (), (), (), 0, False, None, None, "None", None, 0.0, 0.0))
 
 class HandTracker:
-    def __init__(self, static_mode=False, max_hands=2, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+    def __init__(self, static_mode=False, max_hands=2, min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 async_inference=False, inference_width=None, roi_tracking=False, roi_scale=1.6, roi_input_size=256,
+                 mirror=False):
         print("Initializing HandTracker...")
         try:
             self.static_mode = static_mode
@@ -17,14 +30,48 @@ class HandTracker:
                   f"min_detection_confidence={min_detection_confidence}, "
                   f"min_tracking_confidence={min_tracking_confidence}")
             
+            # Imported here so replaying recorded input does not need MediaPipe installed
+            import mediapipe as mp
             self.mp_hands = mp.solutions.hands
-            self.hands = self.mp_hands.Hands(
-                static_image_mode=self.static_mode,
-                max_num_hands=self.max_hands,
-                min_detection_confidence=self.min_detection_confidence,
-                min_tracking_confidence=self.min_tracking_confidence
-            )
-            self.mp_draw = mp.solutions.drawing_utils
+            self.hands_options = {
+                'static_image_mode': self.static_mode,
+                'max_num_hands': self.max_hands,
+                'min_detection_confidence': self.min_detection_confidence,
+                'min_tracking_confidence': self.min_tracking_confidence
+            }
+            self.hand_connections = [tuple(pair) for pair in self.mp_hands.HAND_CONNECTIONS]
+            
+            self.hands = None
+            self.worker = None
+            self.results = None
+            self.hand_landmarks = gesture_math.empty_landmarks()
+            self.result_frame_id = None
+            self.result_age = 0.0
+            
+            # Inference runs on a downscaled frame (inference_width=None keeps capture
+            # resolution) or, with roi_tracking, on a square crop around the last hand
+            self.inference_width = inference_width
+            self.roi_tracking = roi_tracking
+            self.roi_scale = roi_scale
+            self.roi_input_size = roi_input_size
+            self.roi = None
+            # With mirror, frames are passed unflipped and only the small inference input is
+            # flipped; landmarks and the ROI are in mirrored (selfie view) coordinates
+            self.mirror = mirror
+            self.pending_rois = {}
+            self.mapped_frame_id = None
+            self.buffers = {}
+            
+            if async_inference:
+                try:
+                    self.worker = HandInferenceWorker(self.hands_options)
+                    print("Hand inference running in a separate worker process")
+                except Exception as e:
+                    print(f"Could not start hand inference worker, using synchronous inference: {e}")
+                    self.worker = None
+            
+            if self.worker is None:
+                self.hands = self.mp_hands.Hands(**self.hands_options)
             
             self.prev_time = 0
             self.curr_time = 0
@@ -40,172 +87,253 @@ class HandTracker:
             traceback.print_exc()
             raise
     
-    def check_superpower_gesture(self, lm_list):
-        """Check if all fingers are extended (superpower gesture)"""
+    def find_hands(self, img, draw=True):
         try:
-            return self.count_fingers_up(lm_list) == 5
-                
+            if img is None or img.size == 0:
+                print("Warning: Empty image received in find_hands")
+                return img  
+            
+            # Annotations are drawn straight onto the caller's frame
+            result = self.process(img)
+            if draw:
+                self.draw_overlay(img, result)
+            
+            return img
+            
         except Exception as e:
-            print(f"Error in check_superpower_gesture: {e}")
+            print(f"Error in find_hands: {e}")
             traceback.print_exc()
-            return False
+            return img  
     
-    def find_hands(self, img, draw=True):
+    def process(self, img):
+        """Run inference and gesture logic once for this frame and return a HandFrameResult."""
         try:
             # Start timing!!
             self.curr_time = time.time()
             fps = 1 / (self.curr_time - self.prev_time) if self.prev_time > 0 else 0
             self.prev_time = self.curr_time
             
-            img_copy = img.copy()
+            if img is None or img.size == 0:
+                print("Warning: Empty image received in process")
+                return HandFrameResult(fps=fps)
             
-            if img_copy is None or img_copy.size == 0:
-                print("Warning: Empty image received in find_hands")
-                return img  
-            img_rgb = cv2.cvtColor(img_copy, cv2.COLOR_BGR2RGB)
-    
-            self.results = self.hands.process(img_rgb)
+            self.process_frame(img)
             
-            cv2.putText(img_copy, f'FPS: {int(fps)}', (10, 70), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            h, w = img.shape[:2]
+            landmarks = gesture_math.to_pixels(self.hand_landmarks, w, h)
+            if len(landmarks) == 0:
+                return HandFrameResult(frame_id=self.result_frame_id, age=self.result_age, fps=fps)
             
-            if self.results.multi_hand_landmarks:
-                for hand_landmarks in self.results.multi_hand_landmarks:
-                    if draw:
-                        self.mp_draw.draw_landmarks(
-                            img_copy, 
-                            hand_landmarks, 
-                            self.mp_hands.HAND_CONNECTIONS,
-                            self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=3),
-                            self.mp_draw.DrawingSpec(color=(255, 0, 0), thickness=2) 
-                        )
-                
-                cv2.putText(img_copy, 'Hand Detected', (10, 110), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                
-                lm_list = self.find_position(img_copy)
-                if lm_list:
-                    fingers_up = self.count_fingers_up(lm_list)
-                    gesture = self.get_gesture_name(fingers_up, lm_list)
-                    cv2.putText(img_copy, f'Gesture: {gesture}', (10, 150), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            finger_counts, distances, centers, palm_centers = gesture_math.hand_metrics(landmarks)
             
-            return img_copy
+            fingers_up = int(finger_counts[0])
+            pinch_distance = float(distances[0])
+            is_pinching = self.update_pinch(pinch_distance)
+            pinch_center = (int(centers[0, 0]), int(centers[0, 1]))
+            
+            return HandFrameResult(
+                hand_detected=True,
+                landmarks=landmarks,
+                finger_counts=finger_counts,
+                pinch_distances=distances,
+                palm_centers=palm_centers,
+                fingers_up=fingers_up,
+                is_pinching=is_pinching,
+                pinch_distance=pinch_distance,
+                pinch_center=pinch_center,
+                gesture=self.classify_gesture(fingers_up, is_pinching),
+                frame_id=self.result_frame_id,
+                age=self.result_age,
+                fps=fps
+            )
             
         except Exception as e:
-            print(f"Error in find_hands: {e}")
+            print(f"Error in process: {e}")
             traceback.print_exc()
-            return img  
+            return HandFrameResult()
     
-    def find_position(self, img, hand_no=0):
+    def draw_overlay(self, img, result):
+        """Draw landmarks, status text and pinch feedback for `result` onto `img`."""
         try:
-            lm_list = []
+            cv2.putText(img, f'FPS: {int(result.fps)}', (10, 70), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
             
-            if not hasattr(self, 'results') or self.results is None:
-                return lm_list
-                
-            if self.results.multi_hand_landmarks:
-                if len(self.results.multi_hand_landmarks) > hand_no:
-                    hand = self.results.multi_hand_landmarks[hand_no]
-                    
-                    h, w, c = img.shape
-                    
-                    for id, lm in enumerate(hand.landmark):
-                        cx, cy = int(lm.x * w), int(lm.y * h)
-                        lm_list.append([id, cx, cy])
-            
-            return lm_list
+            if not result.hand_detected:
+                return img
+            
+            for hand in result.landmarks.astype(np.int32):
+                for start, end in self.hand_connections:
+                    cv2.line(img, (hand[start, 0], hand[start, 1]), (hand[end, 0], hand[end, 1]), (255, 0, 0), 2)
+                for x, y, _ in hand:
+                    cv2.circle(img, (x, y), 3, (0, 255, 0), 2)
+            
+            cv2.putText(img, 'Hand Detected', (10, 110), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            
+            cv2.putText(img, f'Gesture: {result.gesture}', (10, 150), 
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            
+            if result.fingers_up < 4:
+                self.draw_pinch(img, result)
+            
+            return img
             
         except Exception as e:
-            print(f"Error in find_position: {e}")
+            print(f"Error in draw_overlay: {e}")
             traceback.print_exc()
-            return []
+            return img
     
-    def get_distance(self, p1, p2, img=None, draw=False, r=15, t=3):
-        try:
-            x1, y1 = p1
-            x2, y2 = p2
+    def draw_pinch(self, img, result):
+        thumb_tip = tuple(int(v) for v in result.landmarks[0, gesture_math.THUMB_TIP, :2])
+        index_tip = tuple(int(v) for v in result.landmarks[0, gesture_math.INDEX_TIP, :2])
+        center_x, center_y = result.pinch_center
+        
+        cv2.line(img, thumb_tip, index_tip, (255, 0, 255), 3)
+        cv2.circle(img, thumb_tip, 15, (255, 0, 255), cv2.FILLED)
+        cv2.circle(img, index_tip, 15, (255, 0, 255), cv2.FILLED)
+        
+        color = (0, 0, 255) if result.is_pinching else (0, 255, 0)
+        cv2.line(img, thumb_tip, index_tip, color, 2)
+        
+        radius = max(5, min(20, int(result.pinch_distance / 2)))
+        cv2.circle(img, (center_x, center_y), radius, color, -1)
+        
+        if result.is_pinching:
+            cv2.putText(img, "PINCH: SHOOT", (center_x - 40, center_y - 20),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
             
-            length = math.hypot(x2 - x1, y2 - y1)
+            cv2.putText(img, f"Coords: ({center_x}, {center_y})", (center_x - 60, center_y + 20),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+    
+    def get_buffer(self, name, shape):
+        key = (name, shape)
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self.buffers[key] = buffer
+        return buffer
+    
+    def prepare_inference_input(self, img):
+        """Return (bgr_input, roi) where roi is the (x, y, size) crop in frame pixels or None.
+        
+        The full-resolution frame is only read once, by the resize into a
+        preallocated buffer; mirroring and colour conversion then run on the
+        small image.
+        """
+        h, w = img.shape[:2]
+        
+        if self.roi_tracking and self.roi is not None:
+            x, y, size = self.roi
+            if self.mirror:
+                # The ROI is in mirrored coordinates; crop the same pixels from the unflipped frame
+                x = w - x - size
+            src = img[y:y + size, x:x + size]
+            if size != self.roi_input_size:
+                target = (self.roi_input_size, self.roi_input_size, 3)
+                src = cv2.resize(src, target[1::-1], dst=self.get_buffer('roi', target),
+                                 interpolation=cv2.INTER_AREA)
+            return self.mirror_input(src, 'roi_mirror'), self.roi
+        
+        if self.inference_width is None or self.inference_width >= w:
+            return self.mirror_input(img, 'full_mirror'), None
+        
+        target = (int(round(h * self.inference_width / w)), self.inference_width, 3)
+        small = cv2.resize(img, target[1::-1], dst=self.get_buffer('full', target), interpolation=cv2.INTER_AREA)
+        return self.mirror_input(small, 'full_mirror'), None
+    
+    def mirror_input(self, img, name):
+        if not self.mirror:
+            return img
+        return cv2.flip(img, 1, dst=self.get_buffer(name, img.shape))
+    
+    def map_landmarks_to_frame(self, landmarks, roi, frame_shape):
+        """Map normalized landmarks from ROI coordinates to full-frame coordinates."""
+        if roi is None or len(landmarks) == 0:
+            return landmarks
+        
+        x, y, size = roi
+        h, w = frame_shape[:2]
+        scale = np.array([size / w, size / h, size / w], dtype=np.float32)
+        offset = np.array([x / w, y / h, 0], dtype=np.float32)
+        return landmarks * scale + offset
+    
+    def update_roi(self, landmarks, frame_shape):
+        if not self.roi_tracking:
+            return
+        if len(landmarks) == 0:
+            # Tracking lost: run full-frame detection on the next frame
+            self.roi = None
+            return
+        
+        h, w = frame_shape[:2]
+        min_x, min_y = landmarks[:, :, 0].min() * w, landmarks[:, :, 1].min() * h
+        max_x, max_y = landmarks[:, :, 0].max() * w, landmarks[:, :, 1].max() * h
+        
+        size = int(max(max_x - min_x, max_y - min_y) * self.roi_scale)
+        size = min(max(size, self.roi_input_size // 2), w, h)
+        center_x = (max_x + min_x) / 2
+        center_y = (max_y + min_y) / 2
+        
+        x = int(min(max(center_x - size / 2, 0), w - size))
+        y = int(min(max(center_y - size / 2, 0), h - size))
+        self.roi = (x, y, size)
+    
+    def process_frame(self, img):
+        if self.worker is not None and not self.worker.is_alive():
+            print("Hand inference worker died, falling back to synchronous inference")
+            self.close()
+            self.hands = self.mp_hands.Hands(**self.hands_options)
+        
+        inference_img, roi = self.prepare_inference_input(img)
+        
+        if self.worker is not None:
+            frame_id = self.worker.submit(inference_img)
+            if frame_id is not None:
+                self.pending_rois[frame_id] = roi
             
-            if draw and img is not None:
-                cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), t)
-                cv2.circle(img, (x1, y1), r, (255, 0, 255), cv2.FILLED)
-                cv2.circle(img, (x2, y2), r, (255, 0, 255), cv2.FILLED)
+            self.results = self.worker.latest
+            if self.results.frame_id != self.mapped_frame_id:
+                roi = self.pending_rois.pop(self.results.frame_id, None)
+                # Frames up to this one that the worker dropped will never get a result
+                for stale_id in [k for k in self.pending_rois if k < self.results.frame_id]:
+                    del self.pending_rois[stale_id]
+                self.hand_landmarks = self.map_landmarks_to_frame(self.results.landmarks, roi, img.shape)
+                self.mapped_frame_id = self.results.frame_id
+                self.update_roi(self.hand_landmarks, img.shape)
             
-            return length
-        except Exception as e:
-            print(f"Error in get_distance: {e}")
-            traceback.print_exc()
-            return 100 
-
-    def check_thumb_index_pinch(self, lm_list, img=None):
-        try:
-            if len(lm_list) >= 9:
-                thumb_tip = lm_list[4][1:3]  
-                index_tip = lm_list[8][1:3]  
-                
-                distance = self.get_distance(thumb_tip, index_tip, img, draw=True)
-                is_pinched = distance < self.pinch_threshold
-                
-                self.pinch_history.append(is_pinched)
-                self.pinch_history.pop(0)
-                
-                stable_pinch = sum(self.pinch_history) >= 2
-                
-                if img is not None:
-                    center_x = (thumb_tip[0] + index_tip[0]) // 2
-                    center_y = (thumb_tip[1] + index_tip[1]) // 2
-                    
-                    color = (0, 0, 255) if stable_pinch else (0, 255, 0)
-                    cv2.line(img, (thumb_tip[0], thumb_tip[1]), (index_tip[0], index_tip[1]), color, 2)
-                    
-                    radius = max(5, min(20, int(distance / 2)))
-                    cv2.circle(img, (center_x, center_y), radius, color, -1)
-                    
-                    if stable_pinch:
-                        cv2.putText(img, "PINCH: SHOOT", (center_x - 40, center_y - 20),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-                        
-                        cv2.putText(img, f"Coords: ({center_x}, {center_y})", (center_x - 60, center_y + 20),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
-                
-                return stable_pinch
-            return False
-        except Exception as e:
-            print(f"Error in check_thumb_index_pinch: {e}")
-            traceback.print_exc()
-            return False
+            self.result_frame_id = self.results.frame_id
+            self.result_age = self.results.age or 0.0
+        else:
+            img_rgb = cv2.cvtColor(inference_img, cv2.COLOR_BGR2RGB,
+                                   dst=self.get_buffer('rgb', inference_img.shape))
+            self.results = self.hands.process(img_rgb)
+            landmarks = gesture_math.landmarks_to_array(self.results.multi_hand_landmarks)
+            self.hand_landmarks = self.map_landmarks_to_frame(landmarks, roi, img.shape)
+            self.update_roi(self.hand_landmarks, img.shape)
+            self.result_frame_id = None
+            self.result_age = 0.0
+        
+        return self.results
     
-    def count_fingers_up(self, lm_list):
-        try:
-            if len(lm_list) >= 21:
-                fingers = []
-                
-                if lm_list[4][1] < lm_list[3][1]: 
-                    fingers.append(1)
-                else:
-                    fingers.append(0)
-            
-                for tip_id in [8, 12, 16, 20]: 
-                    if lm_list[tip_id][2] < lm_list[tip_id-2][2]:  
-                        fingers.append(1)
-                    else:
-                        fingers.append(0)
-                return sum(fingers)
-                
-            return 0
-        except Exception as e:
-            print(f"Error in count_fingers_up: {e}")
-            traceback.print_exc()
-            return 0
+    def close(self):
+        if self.worker is not None:
+            self.worker.close()
+            self.worker = None
+    
+    def update_pinch(self, distance):
+        is_pinched = distance < self.pinch_threshold
+        
+        self.pinch_history.append(is_pinched)
+        self.pinch_history.pop(0)
+        
+        return sum(self.pinch_history) >= 2
     
-    def get_gesture_name(self, fingers_up, lm_list):
+    def classify_gesture(self, fingers_up, is_pinching):
         try:
             if fingers_up == 0:
                 return "Fist"
                 
-            if self.check_thumb_index_pinch(lm_list, None):
+            if is_pinching:
                 return "Pinch (Shoot)"
             #All fingers up na superpower activated!!
             if fingers_up == 5:
@@ -220,6 +348,6 @@ class HandTracker:
             return f"{fingers_up} Fingers"
             
         except Exception as e:
-            print(f"Error in get_gesture_name: {e}")
+            print(f"Error in classify_gesture: {e}")
             traceback.print_exc()
             return "Unknown"
\ No newline at end of file
@@ -0,0 +1,150 @@
+"""Headless, deterministic game runs.
+
+A GameEngine built with `seed=` and a `ManualClock` draws every random
+number from its own RNG and never reads the wall clock, so stepping it
+with the same scripted input always gives the same game. `run_headless`
+steps it as fast as the CPU allows, without a camera, window or (unless
+asked) rendering:
+    python -m utils.headless --seed 7 --ticks 3000 --check
+"""
+import argparse
+import contextlib
+import hashlib
+import os
+import random
+import time
+from utils.game_engine import GameEngine
+
+class ManualClock:
+    """A clock that only moves when told to; pass it as GameEngine(clock=...)."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+        return self.now
+
+class ScriptedInput:
+    """Player input as a list of (tick, action, *args) events.
+
+    Actions are 'shoot' (camera x, y, as from the pinch gesture), 'move'
+    (farmer x, y, as from the open hand) and 'superpower'. Events for a tick
+    are applied just before that tick is stepped, in list order.
+    """
+
+    def __init__(self, events=()):
+        self.events = {}
+        for tick, action, *args in events:
+            self.events.setdefault(tick, []).append((action, args))
+
+    def apply(self, engine, tick):
+        for action, args in self.events.get(tick, ()):
+            if action == 'shoot':
+                engine.shoot(*args)
+            elif action == 'move':
+                engine.farmer.set_position(*args)
+                engine.last_farmer_pos = tuple(args)
+            elif action == 'superpower':
+                engine.use_superpower()
+            else:
+                raise ValueError(f"Unknown scripted action: {action}")
+
+def random_script(seed, ticks, shoot_every=4, move_every=45, superpower_every=900):
+    """A reproducible stream of plausible player input for `ticks` ticks."""
+    rng = random.Random(seed)
+    events = []
+    for tick in range(ticks):
+        if tick % shoot_every == 0:
+            events.append((tick, 'shoot', rng.randint(0, 639), rng.randint(0, 479)))
+        if tick % move_every == 0:
+            events.append((tick, 'move', rng.randint(0, 1160), rng.randint(0, 600)))
+        if tick % superpower_every == superpower_every - 1:
+            events.append((tick, 'superpower'))
+    return ScriptedInput(events)
+
+def game_state(engine):
+    """Everything that should match between two runs of the same seed and input.
+
+    Particle positions and velocities are compared as raw bytes, so any
+    difference in the float arithmetic shows up.
+    """
+    particles = engine.smoke_particles
+    n = particles.count
+    return (engine.ticks, engine.score, round(engine.remaining_time, 9), engine.game_over, engine.game_won,
+            tuple((enemy.x, enemy.y, enemy.is_dying, enemy.movement_pattern) for enemy in engine.enemies),
+            tuple((bullet.x, bullet.y, bullet.life) for bullet in engine.bullets),
+            tuple(crop.health for crop in engine.crops),
+            (engine.farmer.x, engine.farmer.y, engine.farmer.has_superpower),
+            tuple(array[:n].tobytes() for array in (particles.x, particles.y, particles.vel_x, particles.vel_y)))
+
+def run_headless(engine, ticks, inputs=None, render_every=0, quiet=True, digest=False):
+    """Step `engine` for up to `ticks` ticks (fewer if the game ends) and return run stats.
+
+    `inputs` is a ScriptedInput or None. With `render_every` > 0 every n-th
+    tick is also rendered, for profiling the renderer; the frames are
+    discarded. With `digest` the stats also get 'frame_digest', a hash over
+    every rendered frame in order. `quiet` silences the engine's per-event prints.
+    """
+    frame_hash = hashlib.blake2b(digest_size=16) if digest else None
+    clock = engine.clock if isinstance(engine.clock, ManualClock) else None
+    frames = 0
+    start = time.perf_counter()
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+        for tick in range(ticks):
+            if engine.game_over:
+                break
+            if inputs is not None:
+                inputs.apply(engine, engine.ticks)
+            engine.step()
+            if clock is not None:
+                clock.advance(engine.tick_dt)
+            if render_every and engine.ticks % render_every == 0:
+                frame = engine.render_game_only()
+                if frame_hash is not None:
+                    frame_hash.update(frame.tobytes())
+                frames += 1
+    seconds = time.perf_counter() - start
+
+    return {'ticks': engine.ticks, 'frames': frames, 'seconds': seconds,
+            'ticks_per_second': engine.ticks / seconds if seconds > 0 else float('inf'),
+            'sim_seconds': engine.sim_time,
+            'frame_digest': frame_hash.hexdigest() if frame_hash is not None else None}
+
+def make_engine(seed, assets_path='assets', **kwargs):
+    return GameEngine(assets_path=assets_path, clock=ManualClock(), seed=seed, **kwargs)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the game headless from scripted input.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ticks', type=int, default=3000)
+    parser.add_argument('--duration', type=int, default=90, help="game length in seconds")
+    parser.add_argument('--render-every', type=int, default=0)
+    parser.add_argument('--check', action='store_true',
+                        help="run twice and verify both runs match, rendered frames included")
+    args = parser.parse_args()
+
+    runs = 2 if args.check else 1
+    states = []
+    for _ in range(runs):
+        with open(os.devnull, 'w') as sink, contextlib.redirect_stdout(sink):
+            engine = make_engine(args.seed, game_duration=args.duration)
+        stats = run_headless(engine, args.ticks, random_script(args.seed, args.ticks),
+                             render_every=args.render_every, digest=args.check)
+        states.append((game_state(engine), stats['frame_digest']))
+        print(f"seed {args.seed}: {stats['ticks']} ticks ({stats['sim_seconds']:.1f} s of game) "
+              f"in {stats['seconds']:.2f} s, {stats['ticks_per_second']:.0f} ticks/s, "
+              f"score {engine.score}, game over {engine.game_over}")
+
+    if args.check:
+        if states[0] != states[1]:
+            raise SystemExit("Runs with the same seed and input diverged")
+        print("Both runs match")
+
+if __name__ == "__main__":
+    main()
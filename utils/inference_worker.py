@@ -0,0 +1,195 @@
+import cv2
+import numpy as np
+import multiprocessing as mp_proc
+import queue
+import time
+import traceback
+from multiprocessing import shared_memory
+from utils import gesture_math
+
+class AsyncHandResult:
+    """Latest landmarks from the worker as a normalized (hands, 21, 3) float32 array.
+
+    `frame_id` is the id of the frame the landmarks were computed on and `age`
+    is the time in seconds since that frame was submitted.
+    """
+
+    def __init__(self, frame_id=-1, landmarks=None, handedness=None,
+                 submit_time=None, inference_ms=0.0):
+        self.frame_id = frame_id
+        self.landmarks = landmarks if landmarks is not None else gesture_math.empty_landmarks()
+        self.handedness = handedness or []
+        self.submit_time = submit_time
+        self.inference_ms = inference_ms
+
+    @property
+    def age(self):
+        if self.submit_time is None:
+            return None
+        return time.perf_counter() - self.submit_time
+
+def worker_main(request_queue, result_queue, hands_options):
+    attached = {}
+    try:
+        import mediapipe as mp
+        hands = mp.solutions.hands.Hands(**hands_options)
+        result_queue.put(('ready', None))
+
+        while True:
+            request = request_queue.get()
+            if request is None:
+                break
+
+            frame_id, slot, shm_name, slot_bytes, shape = request
+            shm = attached.get(shm_name)
+            if shm is None:
+                for old in attached.values():
+                    old.close()
+                attached = {shm_name: shared_memory.SharedMemory(name=shm_name)}
+                shm = attached[shm_name]
+
+            start = time.perf_counter()
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+            results = hands.process(frame)
+            del frame
+            inference_ms = (time.perf_counter() - start) * 1000
+
+            landmarks = gesture_math.landmarks_to_array(results.multi_hand_landmarks)
+            handedness = []
+            if results.multi_handedness:
+                handedness = [hand.classification[0].label for hand in results.multi_handedness]
+
+            result_queue.put(('result', (frame_id, slot, landmarks, handedness, inference_ms)))
+    except Exception as e:
+        print(f"Error in hand inference worker: {e}")
+        traceback.print_exc()
+        result_queue.put(('error', str(e)))
+    finally:
+        for shm in attached.values():
+            shm.close()
+
+class HandInferenceWorker:
+    """Runs MediaPipe Hands in a separate process.
+
+    Frames are converted to RGB straight into a shared-memory double buffer,
+    so only a tiny (frame_id, slot, shape) message crosses the process boundary
+    and the landmarks come back as a small float32 array.
+    Frames may change size (full frame vs. hand ROI) as long as they fit a slot. At
+    most one frame is in flight: while the worker is busy, newer frames are
+    skipped rather than queued, and `poll()` always returns the most recent
+    finished result.
+    """
+
+    def __init__(self, hands_options, num_slots=2, start_timeout=30.0):
+        self.hands_options = dict(hands_options)
+        self.num_slots = max(2, int(num_slots))
+
+        self.shm = None
+        self.slot_bytes = 0
+        self.next_slot = 0
+
+        self.next_frame_id = 0
+        self.in_flight = None
+        self.submit_times = {}
+        self.latest = AsyncHandResult()
+        self.frames_submitted = 0
+        self.frames_skipped = 0
+
+        context = mp_proc.get_context('spawn')
+        self.request_queue = context.Queue()
+        self.result_queue = context.Queue()
+        self.process = context.Process(target=worker_main,
+                                       args=(self.request_queue, self.result_queue, self.hands_options),
+                                       name="HandInferenceWorker", daemon=True)
+        self.process.start()
+
+        deadline = time.perf_counter() + start_timeout
+        while True:
+            try:
+                kind, payload = self.result_queue.get(timeout=0.5)
+                break
+            except queue.Empty:
+                if not self.process.is_alive() or time.perf_counter() > deadline:
+                    self.close()
+                    raise RuntimeError("Hand inference worker did not start")
+        if kind != 'ready':
+            self.close()
+            raise RuntimeError(f"Hand inference worker failed to start: {payload}")
+
+    def allocate(self, slot_bytes):
+        self.release_buffers()
+        self.slot_bytes = int(slot_bytes)
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * self.num_slots)
+
+    def release_buffers(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def submit(self, img_bgr):
+        """Queue a BGR frame for inference. Returns its frame id, or None if the worker is busy."""
+        self.poll()
+
+        if self.in_flight is not None:
+            self.frames_skipped += 1
+            return None
+
+        shape = tuple(img_bgr.shape)
+        if self.shm is None or img_bgr.size > self.slot_bytes:
+            self.allocate(img_bgr.size)
+
+        slot = self.next_slot
+        self.next_slot = (self.next_slot + 1) % self.num_slots
+        frame = np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+        cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB, dst=frame)
+        del frame
+
+        frame_id = self.next_frame_id
+        self.next_frame_id += 1
+        self.submit_times[frame_id] = time.perf_counter()
+        self.in_flight = frame_id
+        self.frames_submitted += 1
+
+        self.request_queue.put((frame_id, slot, self.shm.name, self.slot_bytes, shape))
+        return frame_id
+
+    def poll(self):
+        """Collect finished results without blocking and return the latest one."""
+        while True:
+            try:
+                kind, payload = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == 'error':
+                print(f"Hand inference worker stopped: {payload}")
+                self.in_flight = None
+                continue
+            if kind != 'result':
+                continue
+
+            frame_id, slot, landmarks, handedness, inference_ms = payload
+            self.latest = AsyncHandResult(frame_id, landmarks, handedness,
+                                          self.submit_times.pop(frame_id, None), inference_ms)
+            for stale_id in [k for k in self.submit_times if k < frame_id]:
+                del self.submit_times[stale_id]
+            if self.in_flight == frame_id:
+                self.in_flight = None
+
+        return self.latest
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def close(self):
+        try:
+            if self.process.is_alive():
+                self.request_queue.put(None)
+                self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+        except Exception as e:
+            print(f"Error stopping hand inference worker: {e}")
+        finally:
+            self.release_buffers()
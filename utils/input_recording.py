@@ -0,0 +1,147 @@
+import numpy as np
+import struct
+import traceback
+from utils import gesture_math
+from utils.hand_tracker import HandTracker, HandFrameResult
+
+# File layout, all little-endian:
+#   header: magic, version, frame width, frame height, engine seed
+#   per frame: FRAME fields, the gesture name (utf-8), then hands * 21 * 3 float32 landmarks in pixels
+MAGIC = b'VHIN'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHQ')
+# now, key, flags, hands, fingers_up, pinch_center x/y, pinch_distance, frame_id, age, fps, gesture length
+FRAME = struct.Struct('<dBBBBhhfqffB')
+
+HAND_DETECTED, IS_PINCHING, HAS_PINCH = 1, 2, 4
+NO_FRAME_ID = -1
+
+class InputRecorder:
+    """Writes what the main loop saw each frame: its clock, the key pressed and the HandFrameResult."""
+
+    def __init__(self, path, frame_width, frame_height, seed):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, frame_width, frame_height, seed))
+        self.frames = 0
+
+    def write(self, now, key, hand):
+        flags = ((HAND_DETECTED if hand.hand_detected else 0) | (IS_PINCHING if hand.is_pinching else 0) |
+                 (HAS_PINCH if hand.pinch_center is not None else 0))
+        center_x, center_y = hand.pinch_center if hand.pinch_center is not None else (0, 0)
+        gesture = hand.gesture.encode('utf-8')[:255]
+        landmarks = np.ascontiguousarray(hand.landmarks, dtype=np.float32)
+
+        self.file.write(FRAME.pack(
+            now, key & 0xFF, flags, len(landmarks), hand.fingers_up, center_x, center_y,
+            hand.pinch_distance if hand.pinch_distance is not None else 0.0,
+            hand.frame_id if hand.frame_id is not None else NO_FRAME_ID,
+            hand.age, hand.fps, len(gesture)))
+        self.file.write(gesture)
+        self.file.write(landmarks.tobytes())
+        self.frames += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class InputReplay:
+    """Plays a recording back in place of the camera.
+
+    Used like ThreadedCapture: every `read()` moves to the next recorded
+    frame and returns a blank frame of the recorded size with the recorded
+    clock value as its timestamp. The frame's hand result and key are in
+    `hand` and `key` until the next read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        magic, version, self.width, self.height, self.seed = HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            self.file.close()
+            raise ValueError(f"{path} is not a version {VERSION} input recording")
+
+        self.frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        self.frames = 0
+        self.now = None
+        self.key = 0xFF
+        self.hand = HandFrameResult()
+
+    def isOpened(self):
+        return self.file is not None
+
+    def read_record(self):
+        data = self.file.read(FRAME.size)
+        if len(data) < FRAME.size:
+            return False
+
+        (now, key, flags, hands, fingers_up, center_x, center_y, pinch_distance,
+         frame_id, age, fps, gesture_length) = FRAME.unpack(data)
+        gesture = self.file.read(gesture_length).decode('utf-8')
+        size = hands * gesture_math.NUM_LANDMARKS * 3 * 4
+        data = self.file.read(size)
+        if len(data) < size:
+            return False
+        landmarks = np.frombuffer(data, dtype=np.float32).reshape(hands, gesture_math.NUM_LANDMARKS, 3)
+
+        self.now, self.key = now, key
+        frame_id = None if frame_id == NO_FRAME_ID else frame_id
+        if not flags & HAND_DETECTED:
+            self.hand = HandFrameResult(frame_id=frame_id, age=age, fps=fps)
+            return True
+
+        finger_counts, distances, _, palm_centers = gesture_math.hand_metrics(landmarks)
+        self.hand = HandFrameResult(
+            hand_detected=True,
+            landmarks=landmarks,
+            finger_counts=finger_counts,
+            pinch_distances=distances,
+            palm_centers=palm_centers,
+            fingers_up=fingers_up,
+            is_pinching=bool(flags & IS_PINCHING),
+            pinch_distance=pinch_distance,
+            pinch_center=(center_x, center_y) if flags & HAS_PINCH else None,
+            gesture=gesture,
+            frame_id=frame_id,
+            age=age,
+            fps=fps
+        )
+        return True
+
+    def read(self, timeout=None):
+        """Return (success, frame, recorded_time) for the next recorded frame."""
+        try:
+            if self.file is None or not self.read_record():
+                return False, None, None
+        except Exception as e:
+            print(f"Error reading input recording: {e}")
+            traceback.print_exc()
+            return False, None, None
+
+        self.frames += 1
+        return True, self.frame, self.now
+
+    def stats(self):
+        return {'captured': self.frames, 'delivered': self.frames, 'dropped': 0,
+                'mean_age_ms': 0.0, 'max_age_ms': 0.0}
+
+    def release(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class ReplayHandTracker(HandTracker):
+    """HandTracker that returns the recorded result for the current replay frame instead of running inference."""
+
+    def __init__(self, replay):
+        self.replay = replay
+        self.hand_connections = list(gesture_math.HAND_CONNECTIONS)
+        self.worker = None
+
+    def process(self, img):
+        return self.replay.hand
+
+    def close(self):
+        pass
@@ -0,0 +1,119 @@
+import cv2
+import numpy as np
+import random
+
+class ParticleSystem:
+    """Fixed-capacity smoke particles stored in NumPy arrays.
+
+    `capacity` is the particle budget: when an emit would exceed it, the
+    oldest particles are dropped to make room, so a big explosion costs at
+    most `capacity` particles per tick and per frame. Rows are kept oldest
+    first, which is also draw order.
+    """
+
+    def __init__(self, capacity=512, damping=0.95, rng=None):
+        self.capacity = max(1, int(capacity))
+        self.damping = damping
+        # Seeded from `random` so random.seed() still makes a whole game reproducible
+        self.rng = rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+        self.count = 0
+        self.dropped = 0
+
+        self.x = np.zeros(self.capacity, dtype=np.float64)
+        self.y = np.zeros(self.capacity, dtype=np.float64)
+        self.vel_x = np.zeros(self.capacity, dtype=np.float64)
+        self.vel_y = np.zeros(self.capacity, dtype=np.float64)
+        self.size = np.zeros(self.capacity, dtype=np.int32)
+        self.life = np.zeros(self.capacity, dtype=np.int32)
+        self.max_life = np.ones(self.capacity, dtype=np.int32)
+        self.color = np.zeros((self.capacity, 3), dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    def arrays(self):
+        return (self.x, self.y, self.vel_x, self.vel_y, self.size, self.life, self.max_life, self.color)
+
+    def clear(self):
+        self.count = 0
+
+    def keep(self, mask):
+        """Compact the live particles down to `mask`, preserving order."""
+        n = self.count
+        kept = int(mask.sum())
+        if kept != n:
+            for array in self.arrays():
+                array[:kept] = array[:n][mask]
+        self.count = kept
+
+    def emit(self, x, y, count=10):
+        count = min(int(count), self.capacity)
+        if count <= 0:
+            return
+
+        overflow = self.count + count - self.capacity
+        if overflow > 0:
+            keep = np.ones(self.count, dtype=np.bool_)
+            keep[:overflow] = False
+            self.keep(keep)
+            self.dropped += overflow
+
+        start, end = self.count, self.count + count
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.size[start:end] = self.rng.integers(5, 16, count)
+        life = self.rng.integers(20, 41, count)
+        self.life[start:end] = life
+        self.max_life[start:end] = life
+        self.color[start:end] = self.rng.integers(150, 201, (count, 3))
+        self.vel_x[start:end] = self.rng.uniform(-2, 2, count)
+        self.vel_y[start:end] = self.rng.uniform(-2, 2, count)
+        self.count = end
+
+    def update(self):
+        """One tick: age, expire, move and damp every particle."""
+        n = self.count
+        if n == 0:
+            return
+
+        self.life[:n] -= 1
+        self.keep(self.life[:n] > 0)
+
+        n = self.count
+        self.x[:n] += self.vel_x[:n]
+        self.y[:n] += self.vel_y[:n]
+        self.vel_x[:n] *= self.damping
+        self.vel_y[:n] *= self.damping
+
+    def radii(self):
+        """Current draw radius of every particle; particles shrink as they fade."""
+        n = self.count
+        return (self.size[:n] * (self.life[:n] / self.max_life[:n])).astype(np.int32)
+
+    def dirty_rects(self):
+        """(n, 4) array of x1, y1, x2, y2 boxes covering each particle as drawn."""
+        n = self.count
+        radius = self.radii()
+        px, py = self.x[:n].astype(np.int32), self.y[:n].astype(np.int32)
+        return np.stack([px - radius - 1, py - radius - 1, px + radius + 2, py + radius + 2], axis=1)
+
+    def draw(self, img):
+        """Draw all particles oldest first.
+
+        Positions, radii and colours are converted and culled for the whole
+        batch at once; the fill is one cv2.circle call per visible particle,
+        which measured faster than scattering pre-rasterised disc stamps with
+        NumPy indexing.
+        """
+        n = self.count
+        if n == 0:
+            return
+
+        h, w = img.shape[:2]
+        radius = self.radii()
+        px, py = self.x[:n].astype(np.int32), self.y[:n].astype(np.int32)
+        visible = (px + radius >= 0) & (px - radius < w) & (py + radius >= 0) & (py - radius < h)
+
+        for x, y, r, color in zip(px[visible].tolist(), py[visible].tolist(), radius[visible].tolist(),
+                                  self.color[:n][visible].tolist()):
+            cv2.circle(img, (x, y), r, color, -1)
@@ -0,0 +1,207 @@
+import cv2
+import json
+import numpy as np
+import time
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_STAGE = _NullStage()
+
+class _Stage:
+    __slots__ = ('profiler', 'name')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.push(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.pop()
+        return False
+
+class FrameProfiler:
+    """Per-stage frame timings kept in ring buffers.
+
+    Stages are opened with `push(name)` / `pop()`, `switch(name)` (pop then
+    push) or `with profiler.stage(name):`, and may nest. Between
+    `begin_frame()` and `end_frame()` each stage's time is summed; the last
+    `capacity` frames are kept one row per frame, which is what `summary`,
+    `histogram`, `draw` and `export_csv` read. Every individual stage run is
+    also kept, up to `event_capacity`, for `export_chrome_trace`.
+
+    A disabled profiler returns from every call straight away, so the
+    instrumentation can stay in the code.
+    """
+
+    def __init__(self, enabled=True, capacity=600, event_capacity=65536, frame_budget_ms=1000 / 30):
+        self.enabled = enabled
+        self.show_overlay = False
+        self.capacity = capacity
+        self.event_capacity = event_capacity
+        self.frame_budget_ms = frame_budget_ms
+        self.origin_ns = time.perf_counter_ns()
+
+        self.names = []
+        self.ids = {}
+        self.stages = {}
+        self.stack = []
+
+        self.frame_ms = np.zeros((capacity, 8), dtype=np.float32)
+        self.frame_total_ms = np.zeros(capacity, dtype=np.float32)
+        self.frames = 0
+        self.current = [0] * 8
+        self.frame_start = None
+
+        # Plain lists: a NumPy scalar store costs more than the rest of pop() together
+        self.event_stage = [0] * event_capacity
+        self.event_start = [0] * event_capacity
+        self.event_duration = [0] * event_capacity
+        self.events = 0
+
+    @property
+    def depth(self):
+        return len(self.stack)
+
+    def stage_id(self, name):
+        stage = self.ids.get(name)
+        if stage is None:
+            stage = len(self.names)
+            self.ids[name] = stage
+            self.names.append(name)
+            if stage >= self.frame_ms.shape[1]:
+                self.frame_ms = np.pad(self.frame_ms, ((0, 0), (0, self.frame_ms.shape[1])))
+                self.current.extend([0] * (self.frame_ms.shape[1] - len(self.current)))
+        return stage
+
+    def stage(self, name):
+        if not self.enabled:
+            return NULL_STAGE
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = _Stage(self, name)
+        return stage
+
+    def push(self, name):
+        if not self.enabled:
+            return
+        self.stack.append((self.stage_id(name), time.perf_counter_ns()))
+
+    def pop(self):
+        if not self.enabled or not self.stack:
+            return
+        now = time.perf_counter_ns()
+        stage, start = self.stack.pop()
+        duration = now - start
+        self.current[stage] += duration
+
+        i = self.events % self.event_capacity
+        self.event_stage[i] = stage
+        self.event_start[i] = start - self.origin_ns
+        self.event_duration[i] = duration
+        self.events += 1
+
+    def switch(self, name):
+        if not self.enabled:
+            return
+        self.pop()
+        self.push(name)
+
+    def unwind(self, depth):
+        """Close stages until only `depth` are open, e.g. after an exception skipped their pop()."""
+        if not self.enabled:
+            return
+        while len(self.stack) > depth:
+            self.pop()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        self.unwind(0)
+        row = self.frames % self.capacity
+        self.frame_ms[row] = self.current[:self.frame_ms.shape[1]]
+        self.frame_ms[row] *= 1e-6
+        self.frame_total_ms[row] = (time.perf_counter_ns() - self.frame_start) * 1e-6
+        self.frames += 1
+        for stage in range(len(self.current)):
+            self.current[stage] = 0
+        self.frame_start = None
+
+    def window(self):
+        """(stage times, frame totals) in ms for the retained frames, oldest first."""
+        n = min(self.frames, self.capacity)
+        order = (np.arange(n) + self.frames - n) % self.capacity
+        return self.frame_ms[order, :len(self.names)], self.frame_total_ms[order]
+
+    def summary(self):
+        """Mean, p50, p95 and max ms per stage (and 'frame' for the whole frame) over the window."""
+        stage_ms, total_ms = self.window()
+        if len(total_ms) == 0:
+            return {}
+        columns = [('frame', total_ms)] + [(name, stage_ms[:, i]) for i, name in enumerate(self.names)]
+        stats = {}
+        for name, values in columns:
+            p50, p95 = np.percentile(values, (50, 95))
+            stats[name] = {'mean_ms': float(values.mean()), 'p50_ms': float(p50),
+                           'p95_ms': float(p95), 'max_ms': float(values.max())}
+        return stats
+
+    def histogram(self, name, bins=20, value_range=None):
+        stage_ms, total_ms = self.window()
+        values = total_ms if name == 'frame' else stage_ms[:, self.ids[name]]
+        return np.histogram(values, bins=bins, range=value_range)
+
+    def draw(self, img, x=10, y=190, bar_width=160):
+        """Draw a per-stage breakdown (mean / p95 ms and a bar against the frame budget)."""
+        stats = self.summary()
+        if not stats:
+            return img
+
+        line_height = 18
+        height = line_height * len(stats) + 10
+        panel = img[y - 14:y - 14 + height, x - 5:x + 330 + bar_width]
+        panel //= 3
+
+        for k, (name, stat) in enumerate(stats.items()):
+            line_y = y + k * line_height
+            over_budget = name == 'frame' and stat['mean_ms'] > self.frame_budget_ms
+            color = (0, 0, 255) if over_budget else (255, 255, 255)
+            cv2.putText(img, f"{name[:20]:<20} {stat['mean_ms']:6.2f} {stat['p95_ms']:6.2f}",
+                        (x, line_y), cv2.FONT_HERSHEY_PLAIN, 1, color, 1)
+            length = int(min(1.0, stat['mean_ms'] / self.frame_budget_ms) * bar_width)
+            cv2.rectangle(img, (x + 320, line_y - 10), (x + 320 + length, line_y - 2), (0, 200, 255), -1)
+        return img
+
+    def export_csv(self, path):
+        stage_ms, total_ms = self.window()
+        first = self.frames - len(total_ms)
+        with open(path, 'w') as f:
+            f.write(','.join(['frame', 'frame_ms'] + self.names) + '\n')
+            for k in range(len(total_ms)):
+                values = [f"{total_ms[k]:.4f}"] + [f"{v:.4f}" for v in stage_ms[k]]
+                f.write(','.join([str(first + k)] + values) + '\n')
+
+    def export_chrome_trace(self, path):
+        """Write the retained stage runs as Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+        n = min(self.events, self.event_capacity)
+        split = self.events % self.event_capacity if self.events > self.event_capacity else 0
+        ordered = lambda values: values[split:n] + values[:split]
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'main loop'}}]
+        for stage, start, duration in zip(ordered(self.event_stage), ordered(self.event_start),
+                                          ordered(self.event_duration)):
+            events.append({'name': self.names[stage], 'ph': 'X', 'pid': 1, 'tid': 1,
+                           'ts': start / 1000, 'dur': duration / 1000})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,51 @@
+class Bullet:
+    __slots__ = ('x', 'y', 'radius', 'life', 'color', 'is_superpower')
+
+    def reset(self, x, y, radius, life, color, is_superpower=False):
+        self.x, self.y = x, y
+        self.radius = radius
+        self.life = life
+        self.color = color
+        self.is_superpower = is_superpower
+        return self
+
+class Notification:
+    __slots__ = ('text', 'color', 'timer', 'duration', 'category', 'animation')
+
+    def reset(self, text, color, duration=90, category="default"):
+        self.text = text
+        self.color = color
+        self.timer = 0
+        self.duration = duration
+        self.category = category
+        self.animation = 0
+        return self
+
+class RecordPool:
+    """Free list for short-lived records.
+
+    `acquire(*args)` hands out a released record, or a new one when the free
+    list is empty, and initialises it with `reset(*args)`. Released records
+    must not be used by the caller afterwards. At most `max_free` records
+    are kept around.
+    """
+
+    def __init__(self, record_type, max_free=256):
+        self.record_type = record_type
+        self.max_free = max_free
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        if self.free:
+            record = self.free.pop()
+            self.reused += 1
+        else:
+            record = self.record_type()
+            self.created += 1
+        return record.reset(*args)
+
+    def release(self, record):
+        if len(self.free) < self.max_free:
+            self.free.append(record)
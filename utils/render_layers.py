@@ -0,0 +1,114 @@
+import cv2
+import numpy as np
+from collections import OrderedDict
+from utils.compositor import Sprite, clip_rect
+
+class CachedLayer:
+    """A pre-rendered image that is rebuilt only when its key changes.
+
+    `build(key)` must return the new image. The key has to capture everything
+    the layer shows: callers pass a new key when its content should change,
+    and the same key gets the same image back.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self.image = None
+        self.key = None
+        self.rebuilds = 0
+
+    def get(self, key=None):
+        if self.image is None or key != self.key:
+            self.image = self.build(key)
+            self.key = key
+            self.rebuilds += 1
+        return self.image
+
+def render_overlay(draw, width, height):
+    """Capture translucent drawing as a premultiplied `Sprite`.
+
+    `draw(canvas)` is run once over black and once over white. Anything that
+    blends linearly with what is underneath (panels, text, lines) then gives
+    the premultiplied colour directly from the black pass and the per-channel
+    inverse alpha from the difference of the two passes.
+    """
+    over_black = np.zeros((height, width, 3), dtype=np.uint8)
+    over_white = np.full((height, width, 3), 255, dtype=np.uint8)
+    draw(over_black)
+    draw(over_white)
+
+    inv_alpha = over_white - np.minimum(over_black, over_white)
+    return Sprite.from_premultiplied(over_black, inv_alpha)
+
+def blend_rect(img, x1, y1, x2, y2, color, alpha):
+    """Blend a filled `color` rectangle with corners (x1, y1), (x2, y2) into `img` at `alpha`, in place.
+
+    Gives the pixels of a filled cv2.rectangle on a copy of the frame followed
+    by cv2.addWeighted, but only the rectangle itself is read and written.
+    """
+    rect = clip_rect(img.shape, x1, y1, int(x2) - int(x1) + 1, int(y2) - int(y1) + 1)
+    if rect is None:
+        return
+    x1, y1, x2, y2 = rect[:4]
+
+    roi = img[y1:y2, x1:x2]
+    fill = np.empty_like(roi)
+    fill[:] = color
+    cv2.addWeighted(fill, alpha, roi, 1 - alpha, 0, roi)
+
+class PanelCache:
+    """LRU cache of translucent UI panels pre-rendered as premultiplied sprites.
+
+    A panel is keyed by its size, fill colour, alpha and border. The sprite
+    extends `border_size` beyond the panel on every side so the border fits;
+    blit it at (x - border_size, y - border_size).
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max(1, int(max_entries))
+        self.panels = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, width, height, color, alpha, border_color=None, border_size=2):
+        key = (int(width), int(height), tuple(color), alpha,
+               tuple(border_color) if border_color else None, border_size)
+
+        sprite = self.panels.get(key)
+        if sprite is not None:
+            self.panels.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = self.render(*key)
+        self.panels[key] = sprite
+        while len(self.panels) > self.max_entries:
+            self.panels.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def render(self, width, height, color, alpha, border_color, border_size):
+        x, y = border_size, border_size
+
+        def draw(canvas):
+            blend_rect(canvas, x, y, x + width, y + height, color, alpha)
+            if border_color:
+                cv2.rectangle(canvas, (x, y), (x + width, y + height), border_color, border_size)
+
+        return render_overlay(draw, width + 2 * border_size + 1, height + 2 * border_size + 1)
+
+    def clear(self):
+        self.panels.clear()
+
+    def stats(self):
+        return {
+            'panels': len(self.panels),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+panel_cache = PanelCache(max_entries=64)
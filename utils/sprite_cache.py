@@ -0,0 +1,111 @@
+import cv2
+import numpy as np
+import traceback
+from collections import OrderedDict
+from utils.compositor import Sprite
+
+class SpriteCache:
+    """Process-wide cache of decoded, pre-resized BGRA sprites keyed by (path, size).
+
+    Each asset is decoded from disk once. Resized variants are stored read-only and
+    shared by every entity that asks for the same (path, size), so spawning an enemy
+    no longer costs a cv2.imread + cv2.resize. Sizes can be snapped to buckets of
+    `size_step` pixels to keep the number of variants small, and the least recently
+    used variants are evicted once `max_entries` is reached. Every variant is kept
+    as a premultiplied `Sprite` so it can be blitted without per-frame conversion.
+    """
+
+    def __init__(self, max_entries=64, size_step=1):
+        self.max_entries = max(1, int(max_entries))
+        self.size_step = max(1, int(size_step))
+
+        self.sources = {}
+        self.variants = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, size):
+        width, height = size
+        if self.size_step > 1:
+            width = max(self.size_step, int(round(width / self.size_step)) * self.size_step)
+            height = max(self.size_step, int(round(height / self.size_step)) * self.size_step)
+        return int(width), int(height)
+
+    def load_source(self, img_path, fallback=None):
+        if img_path in self.sources:
+            return self.sources[img_path]
+
+        img = cv2.imread(img_path, cv2.IMREAD_UNCHANGED) if img_path else None
+
+        if img is None:
+            if fallback is None:
+                self.sources[img_path] = None
+                return None
+            img = fallback()
+            print(f"Created fallback sprite as {img_path} was not found")
+        elif img.ndim == 2:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA)
+        elif img.shape[2] == 3:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+
+        img.setflags(write=False)
+        self.sources[img_path] = img
+        return img
+
+    def get(self, img_path, size, fallback=None):
+        """Return a shared read-only BGRA image of `size` (width, height), or None."""
+        sprite = self.get_sprite(img_path, size, fallback)
+        return sprite.img if sprite is not None else None
+
+    def get_sprite(self, img_path, size, fallback=None):
+        """Return the shared premultiplied `Sprite` of `size` (width, height), or None."""
+        if isinstance(size, (int, np.integer)):
+            size = (size, size)
+        key = (img_path, self.quantize(size))
+
+        sprite = self.variants.get(key)
+        if sprite is not None:
+            self.variants.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        try:
+            source = self.load_source(img_path, fallback)
+            if source is None:
+                return None
+
+            if (source.shape[1], source.shape[0]) == key[1]:
+                img = source
+            else:
+                img = cv2.resize(source, key[1])
+                img.setflags(write=False)
+            sprite = Sprite(img)
+        except Exception as e:
+            print(f"Error loading sprite {img_path}: {e}")
+            traceback.print_exc()
+            return None
+
+        self.variants[key] = sprite
+        while len(self.variants) > self.max_entries:
+            self.variants.popitem(last=False)
+            self.evictions += 1
+
+        return sprite
+
+    def clear(self):
+        self.sources.clear()
+        self.variants.clear()
+
+    def stats(self):
+        return {
+            'sources': len(self.sources),
+            'variants': len(self.variants),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+sprite_cache = SpriteCache(max_entries=64, size_step=4)
@@ -0,0 +1,90 @@
+import cv2
+from collections import OrderedDict
+from functools import lru_cache
+from utils.render_layers import render_overlay
+
+OUTLINE_OFFSETS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+# Opacity levels a fading label is quantized to
+FADE_STEPS = 16
+
+@lru_cache(maxsize=1024)
+def text_size(text, font, font_scale, thickness):
+    """Memoized cv2.getTextSize: ((width, height), baseline)."""
+    return cv2.getTextSize(text, font, font_scale, thickness)
+
+class TextSprite:
+    """An outlined label rasterized once; `left`/`top` locate the sprite relative to the text origin."""
+
+    __slots__ = ('sprite', 'left', 'top', 'width', 'height')
+
+    def __init__(self, sprite, left, top):
+        self.sprite = sprite
+        self.left, self.top = left, top
+        self.width, self.height = sprite.width, sprite.height
+
+class TextCache:
+    """LRU cache of outlined text labels keyed by (text, font, scale, thickness, colour).
+
+    A label is a drop shadow, a four-way black outline and the coloured fill,
+    the same six cv2.putText calls the HUD used to make every frame. It is
+    drawn once into a premultiplied sprite and blitted afterwards, so each
+    frame pays for one blend instead of six glyph rasterizations. Anti-aliased
+    edges may differ from the direct calls by a rounding step. Labels that
+    fade out keep their base colour as the key and are drawn from the
+    sprite's `fade_frames`, so a fade does not fill the cache.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max(1, int(max_entries))
+        self.labels = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text, font, font_scale, thickness, color):
+        key = (text, font, font_scale, thickness, tuple(int(c) for c in color))
+
+        label = self.labels.get(key)
+        if label is not None:
+            self.labels.move_to_end(key)
+            self.hits += 1
+            return label
+
+        self.misses += 1
+        label = self.rasterize(*key)
+        self.labels[key] = label
+        while len(self.labels) > self.max_entries:
+            self.labels.popitem(last=False)
+            self.evictions += 1
+        return label
+
+    def rasterize(self, text, font, font_scale, thickness, color):
+        shadow_offset = int(2 * font_scale)
+        (text_width, text_height), baseline = text_size(text, font, font_scale, thickness + 1)
+        pad = thickness + 2
+        left, top = pad, text_height + pad
+        width = left + text_width + shadow_offset + pad
+        height = top + baseline + shadow_offset + pad
+
+        def draw(canvas):
+            cv2.putText(canvas, text, (left + shadow_offset, top + shadow_offset), font, font_scale, (0, 0, 0),
+                        thickness + 1)
+            for dx, dy in OUTLINE_OFFSETS:
+                cv2.putText(canvas, text, (left + dx, top + dy), font, font_scale, (0, 0, 0), thickness)
+            cv2.putText(canvas, text, (left, top), font, font_scale, color, thickness)
+
+        return TextSprite(render_overlay(draw, width, height), left, top)
+
+    def clear(self):
+        self.labels.clear()
+
+    def stats(self):
+        return {
+            'labels': len(self.labels),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+text_cache = TextCache(max_entries=256)